@@ -1,20 +1,18 @@
 // ======= Initialize App ======= 
+// Shared by every page: footer year, navigation, mobile menu, back to top
+// and card animations. Page-specific features live in their own modules
+// (form-validation.js, lazy-images.js, background-video.js), which
+// create-pages.py adds only to the pages whose markup uses them.
 (function() {
   'use strict';
 
-  // Wait for DOM and feather icons to be ready
+  // Wait for DOM to be ready
   function init() {
-    if (typeof feather !== 'undefined') {
-      feather.replace();
-    }
-    
     initializeYear();
     initializeNavigation();
     initializeMobileMenu();
     initializeBackToTop();
     initializeAnimations();
-    initializeLazyLoading();
-    initializeFormValidation();
   }
 
   // Set current year in footer
@@ -48,16 +46,13 @@
 
     menuBtn.addEventListener('click', () => {
       const isHidden = mobileMenu.classList.toggle('hidden');
-      const icon = menuBtn.querySelector('i');
+      const icon = menuBtn.querySelector('use');
       
       // Update ARIA attributes
       menuBtn.setAttribute('aria-expanded', !isHidden);
       
       if (icon) {
-        icon.setAttribute('data-feather', isHidden ? 'menu' : 'x');
-        if (typeof feather !== 'undefined') {
-          feather.replace();
-        }
+        icon.setAttribute('href', isHidden ? 'icons.svg#menu' : 'icons.svg#x');
       }
     });
 
@@ -68,12 +63,9 @@
         mobileMenu.classList.add('hidden');
         menuBtn.setAttribute('aria-expanded', 'false');
         
-        const icon = menuBtn.querySelector('i');
+        const icon = menuBtn.querySelector('use');
         if (icon) {
-          icon.setAttribute('data-feather', 'menu');
-          if (typeof feather !== 'undefined') {
-            feather.replace();
-          }
+          icon.setAttribute('href', 'icons.svg#menu');
         }
       });
     });
@@ -135,116 +127,10 @@
     });
   }
 
-  // Lazy load images
-  function initializeLazyLoading() {
-    if (!('IntersectionObserver' in window)) {
-      // Fallback for older browsers
-      document.querySelectorAll('img[data-src]').forEach(img => {
-        img.src = img.dataset.src;
-        if (img.dataset.srcset) {
-          img.srcset = img.dataset.srcset;
-        }
-      });
-      return;
-    }
-
-    const imageObserver = new IntersectionObserver((entries) => {
-      entries.forEach(entry => {
-        if (entry.isIntersecting) {
-          const img = entry.target;
-          
-          // Load the image
-          if (img.dataset.src) {
-            img.src = img.dataset.src;
-          }
-          if (img.dataset.srcset) {
-            img.srcset = img.dataset.srcset;
-          }
-          
-          // Remove loading class and add loaded class
-          img.classList.remove('lazy-loading');
-          img.classList.add('lazy-loaded');
-          
-          imageObserver.unobserve(img);
-        }
-      });
-    }, {
-      rootMargin: '50px 0px',
-      threshold: 0.01
-    });
-
-    // Observe all images with data-src
-    document.querySelectorAll('img[data-src]').forEach(img => {
-      img.classList.add('lazy-loading');
-      imageObserver.observe(img);
-    });
-  }
-
-  // Form validation
-  function initializeFormValidation() {
-    const forms = document.querySelectorAll('form');
-    
-    forms.forEach(form => {
-      form.addEventListener('submit', (e) => {
-        const inputs = form.querySelectorAll('input[required], textarea[required]');
-        let isValid = true;
-
-        inputs.forEach(input => {
-          if (!input.value.trim()) {
-            isValid = false;
-            input.classList.add('border-red-500');
-            
-            // Remove error class on input
-            input.addEventListener('input', () => {
-              input.classList.remove('border-red-500');
-            }, { once: true });
-          }
-        });
-
-        if (!isValid) {
-          e.preventDefault();
-          
-          // Show error message
-          const errorMsg = document.createElement('div');
-          errorMsg.className = 'text-red-400 text-sm mt-2';
-          errorMsg.textContent = 'Please fill in all required fields.';
-          errorMsg.setAttribute('role', 'alert');
-          
-          const existingError = form.querySelector('[role="alert"]');
-          if (existingError) {
-            existingError.remove();
-          }
-          
-          form.appendChild(errorMsg);
-          
-          // Remove error message after 5 seconds
-          setTimeout(() => errorMsg.remove(), 5000);
-        }
-      });
-    });
-  }
-
   // Initialize when DOM is ready
   if (document.readyState === 'loading') {
     document.addEventListener('DOMContentLoaded', init);
   } else {
     init();
   }
-
-  // Re-initialize feather icons if they load late
-  window.addEventListener('load', () => {
-    if (typeof feather !== 'undefined') {
-      feather.replace();
-    }
-    
-    // Handle video background on contact page
-    const drillRigVideo = document.getElementById('drillRigVideo');
-    if (drillRigVideo) {
-      // Try to play video, fallback to image if it fails
-      drillRigVideo.play().catch(() => {
-        // If video fails to play, hide it and show poster image
-        drillRigVideo.style.display = 'none';
-      });
-    }
-  });
 })();
@@ -0,0 +1,18 @@
+// Background Video
+// Plays #drillRigVideo once the page has loaded, hiding it if playback fails
+
+(function() {
+  'use strict';
+
+  // Try to play the video after everything else has loaded
+  window.addEventListener('load', () => {
+    const drillRigVideo = document.getElementById('drillRigVideo');
+    if (drillRigVideo) {
+      // Try to play video, fallback to image if it fails
+      drillRigVideo.play().catch(() => {
+        // If video fails to play, hide it and show poster image
+        drillRigVideo.style.display = 'none';
+      });
+    }
+  });
+})();
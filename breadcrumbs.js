@@ -50,7 +50,7 @@
       
       return `
         <li><a href="${crumb.url}" class="hover:text-white transition">${crumb.name}</a></li>
-        <li aria-hidden="true"><i data-feather="chevron-right" class="w-4 h-4"></i></li>
+        <li aria-hidden="true"><svg class="feather feather-chevron-right w-4 h-4" width="24" height="24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"><use href="icons.svg#chevron-right"/></svg></li>
       `;
     }).join('');
 
@@ -87,11 +87,6 @@
     if (header) {
       const breadcrumbHTML = createBreadcrumbHTML(breadcrumbs);
       header.insertAdjacentHTML('afterend', breadcrumbHTML);
-      
-      // Replace feather icons
-      if (typeof feather !== 'undefined') {
-        feather.replace();
-      }
     }
 
     // Insert JSON-LD schema
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Build pipeline
+Runs every build step as one DAG of stages. Each stage declares the files
+it reads and writes; a stage runs after the stages whose outputs it reads,
+stages that do not depend on each other run at the same time, and a stage
+whose inputs hash the same as on its last successful run is skipped.
+
+    python build.py            # build a complete dist/
+    python build.py --list     # show the stages and what they wait for
+    python build.py --force    # run every stage
+    python build.py --report build-report.json   # also record timings (see build_report.py)
+"""
+
+import argparse
+import collections
+import fnmatch
+import glob
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import build_report
+
+STATE_FILE = '.build-state.json'
+STATE_VERSION = 1
+
+PYTHON = sys.executable
+
+# Files served from dist/ as they are
+STATIC_FILES = ('robots.txt', 'sitemap.xml', 'CNAME', '.htaccess', 'images/**/*')
+
+# Scripts that take --report FILE; their stages are added to the build report
+REPORTING_SCRIPTS = ('optimize-images.py', 'create-pages.py', 'minify.py')
+
+Stage = collections.namedtuple('Stage', 'name command inputs outputs')
+
+def copy_static():
+    """Copy STATIC_FILES into dist/, skipping copies that are already current"""
+    copied = total = 0
+    for path in matching_files(STATIC_FILES):
+        total += 1
+        target = os.path.join('dist', path)
+        if os.path.exists(target) and file_hash(target) == file_hash(path):
+            continue
+        os.makedirs(os.path.dirname(target) or '.', exist_ok=True)
+        shutil.copy2(path, target)
+        copied += 1
+    return f"Copied {copied} of {total} static files to dist/\n"
+
+STAGES = [
+    Stage('images', [PYTHON, 'optimize-images.py', '--strict'],
+          inputs=('optimize-images.py', 'image_index.py', 'build_report.py', 'images/*'),
+          outputs=('images/optimized/*', 'IMAGE_OPTIMIZATION.md')),
+    Stage('pages', [PYTHON, 'create-pages.py', '-j', '0'],
+          inputs=('create-pages.py', 'critical_css.py', 'css_purge.py', 'css_minify.py',
+                  'js_minify.py', 'image_index.py', 'build_report.py', 'content/**/*', 'icons/*',
+                  'styles.css', '*.js', 'index.html', '404.html', 'images/**/*'),
+          outputs=('*.html', 'icons.svg', '.build-manifest.json', '.critical-css.json',
+                   '.image-index.json')),
+    Stage('tailwind', [PYTHON, 'extract-tailwind.py'],
+          inputs=('extract-tailwind.py', 'styles.css', '*.html', '*.js'),
+          outputs=('tailwind.css',)),
+    Stage('purge', [PYTHON, 'css_purge.py'],
+          inputs=('css_purge.py', 'css_minify.py', 'js_minify.py', 'styles.css', '*.html', '*.js'),
+          outputs=('styles.purged.css',)),
+    Stage('static', copy_static,
+          inputs=STATIC_FILES,
+          outputs=tuple(os.path.join('dist', pattern) for pattern in STATIC_FILES)),
+    Stage('minify', [PYTHON, 'minify.py'],
+          inputs=('minify.py', 'css_minify.py', 'js_minify.py', 'css_purge.py', 'source_map.py',
+                  'build_report.py', '*.css', '*.js', '*.html', 'icons.svg')
+                 + tuple(os.path.join('dist', pattern) for pattern in STATIC_FILES),
+          outputs=('dist/*.html', 'dist/*.css', 'dist/*.js', 'dist/*.map', 'dist/asset-manifest.json',
+                   'dist/**/*.gz', 'dist/**/*.br', 'dist/.compress-cache.json', '.minify-cache.json')),
+]
+
+def is_pattern(path):
+    """Whether a declared input or output is a glob rather than a file name"""
+    return any(ch in path for ch in '*?[')
+
+def matching_files(patterns):
+    """Sorted files matched by any of the patterns"""
+    paths = set()
+    for pattern in patterns:
+        paths.update(path for path in glob.glob(pattern, recursive=True) if os.path.isfile(path))
+    return sorted(paths)
+
+def segments_overlap(first, second):
+    """Whether two lists of path segments, either of which may hold patterns, can match"""
+    if not first or not second:
+        return all(segment == '**' for segment in first + second)
+    if first[0] == '**':
+        return segments_overlap(first[1:], second) or segments_overlap(first, second[1:])
+    if second[0] == '**':
+        return segments_overlap(first, second[1:]) or segments_overlap(first[1:], second)
+    return ((fnmatch.fnmatchcase(first[0], second[0]) or fnmatch.fnmatchcase(second[0], first[0]))
+            and segments_overlap(first[1:], second[1:]))
+
+def overlaps(first, second):
+    """Whether two declared paths or patterns can name the same file
+
+    As in glob, `*` matches within one directory and `**` across any number.
+    """
+    return segments_overlap(first.split('/'), second.split('/'))
+
+def dependencies(stages):
+    """Map each stage name to the stages whose outputs it reads"""
+    graph = {}
+    for stage in stages:
+        graph[stage.name] = [other.name for other in stages if other is not stage
+                             and any(overlaps(i, o) for i in stage.inputs for o in other.outputs)]
+    return graph
+
+def check_acyclic(graph):
+    """Raise ValueError if the stages depend on each other in a cycle"""
+    done = set()
+    visiting = []
+
+    def visit(name):
+        if name in visiting:
+            cycle = visiting[visiting.index(name):] + [name]
+            raise ValueError(f"stage dependency cycle: {' -> '.join(cycle)}")
+        if name in done:
+            return
+        visiting.append(name)
+        for dependency in graph[name]:
+            visit(dependency)
+        visiting.pop()
+        done.add(name)
+
+    for name in graph:
+        visit(name)
+
+def file_hash(path):
+    """SHA-256 of a file's content"""
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def inputs_hash(stage):
+    """Hash of a stage's command and input files
+
+    Files the stage writes itself are left out (create-pages.py reads the
+    pages it writes), unless the stage names them explicitly.
+    """
+    digest = hashlib.sha256(repr(stage.command if isinstance(stage.command, list)
+                                 else stage.command.__name__).encode('utf-8'))
+    for path in matching_files(stage.inputs):
+        if path not in stage.inputs and any(overlaps(path, output) for output in stage.outputs):
+            continue
+        digest.update(b'\0' + path.encode('utf-8') + b'\0' + file_hash(path).encode('ascii'))
+    return digest.hexdigest()
+
+def outputs_exist(stage):
+    """Whether every output the stage names explicitly (not by pattern) exists"""
+    return all(os.path.exists(path) for path in stage.outputs if not is_pattern(path))
+
+def stage_bytes(patterns):
+    """Total size of the files matched by a stage's inputs or outputs"""
+    return sum(os.path.getsize(path) for path in matching_files(patterns))
+
+def load_state(path=STATE_FILE):
+    """Input hashes of each stage's last successful run"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if state.get('version') != STATE_VERSION:
+        return {}
+    return state.get('stages', {})
+
+def save_state(stages, path=STATE_FILE):
+    """Record the input hashes for the next build"""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': STATE_VERSION, 'stages': stages}, f, indent=2, sort_keys=True)
+        f.write('\n')
+    os.replace(tmp_path, path)
+
+def run_stage(stage, report_path=None):
+    """Run a stage; returns (exit status, output, build_report metrics)
+
+    With `report_path`, scripts in REPORTING_SCRIPTS write their own
+    report there.
+    """
+    start = time.perf_counter()
+    if isinstance(stage.command, list):
+        command = stage.command
+        if report_path and os.path.basename(command[1]) in REPORTING_SCRIPTS:
+            command = command + ['--report', report_path]
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                   text=True)
+        with process.stdout:
+            output = process.stdout.read()
+        # wait4() rather than wait() for the CPU time and peak RSS of this child alone
+        _pid, wait_status, usage = os.wait4(process.pid, 0)
+        status = process.returncode = os.waitstatus_to_exitcode(wait_status)
+        cpu, peak_rss_kb = usage.ru_utime + usage.ru_stime, usage.ru_maxrss
+    else:
+        cpu = time.thread_time()
+        try:
+            status, output = 0, stage.command()
+        except OSError as error:
+            status, output = 1, f"{error}\n"
+        cpu, peak_rss_kb = time.thread_time() - cpu, build_report.peak_rss_kb()
+    metrics = {'wall_seconds': time.perf_counter() - start, 'cpu_seconds': cpu,
+               'peak_rss_kb': peak_rss_kb, 'bytes_in': stage_bytes(stage.inputs),
+               'bytes_out': stage_bytes(stage.outputs), 'cached': False}
+    return status, output, metrics
+
+def build(stages, force=False, verbose=False, report_dir=None):
+    """Run the stages in dependency order, concurrently where possible; returns the failed stages
+
+    With `report_dir`, each stage's metrics go to the 'build' stage of
+    build_report, along with the stages of the scripts it runs.
+    """
+    graph = dependencies(stages)
+    check_acyclic(graph)
+    by_name = {stage.name: stage for stage in stages}
+    state = load_state()
+    finished = set()
+    failed = []
+    pending = [stage.name for stage in stages]
+    running = {}
+
+    with ThreadPoolExecutor(max_workers=len(stages)) as executor:
+        while pending or running:
+            for name in list(pending):
+                blocked = [dependency for dependency in graph[name] if dependency in failed]
+                if blocked:
+                    pending.remove(name)
+                    failed.append(name)
+                    print(f"✗ {name}: not run because {', '.join(blocked)} failed")
+                    continue
+                if not all(dependency in finished for dependency in graph[name]):
+                    continue
+                pending.remove(name)
+                stage = by_name[name]
+                digest = inputs_hash(stage)
+                if not force and state.get(name) == digest and outputs_exist(stage):
+                    finished.add(name)
+                    print(f"✓ {name}: unchanged, skipped")
+                    if report_dir:
+                        build_report.record_file('build', name, build_report.cached(
+                            stage_bytes(stage.inputs), stage_bytes(stage.outputs)))
+                    continue
+                report_path = os.path.join(report_dir, name + '.json') if report_dir else None
+                running[executor.submit(run_stage, stage, report_path)] = (name, digest)
+            if not running:
+                continue
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name, digest = running.pop(future)
+                status, output, metrics = future.result()
+                elapsed = metrics['wall_seconds']
+                if report_dir:
+                    build_report.record_file('build', name, metrics)
+                    if status == 0 and os.path.exists(os.path.join(report_dir, name + '.json')):
+                        build_report.merge_report(os.path.join(report_dir, name + '.json'))
+                if status == 0:
+                    finished.add(name)
+                    state[name] = digest
+                    save_state(state)
+                    print(f"✓ {name} ({elapsed:.1f}s)")
+                else:
+                    failed.append(name)
+                    state.pop(name, None)
+                    print(f"✗ {name} failed with exit status {status} ({elapsed:.1f}s)")
+                if verbose or status != 0:
+                    for line in output.rstrip().splitlines():
+                        print(f"  | {line}")
+    return failed
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description='Build dist/ by running every stage that needs it')
+    parser.add_argument('--force', action='store_true', help='run every stage, even if unchanged')
+    parser.add_argument('-v', '--verbose', action='store_true', help='show the output of each stage')
+    parser.add_argument('--list', action='store_true', help='list the stages and their dependencies')
+    parser.add_argument('--report', metavar='FILE',
+                        help='write per-stage and per-file timing, memory and byte counts as JSON '
+                             '(see build_report.py)')
+    args = parser.parse_args()
+
+    if args.list:
+        for name, needs in dependencies(STAGES).items():
+            print(f"{name}: after {', '.join(needs) or 'nothing'}")
+        return
+
+    print("=" * 60)
+    print("Build")
+    print("=" * 60)
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory() as report_dir, build_report.stage('build'):
+        failed = build(STAGES, force=args.force, verbose=args.verbose,
+                       report_dir=report_dir if args.report else None)
+    if args.report:
+        build_report.write_report(args.report)
+    print()
+    if failed:
+        print(f"✗ Build failed: {', '.join(failed)} ({time.perf_counter() - start:.1f}s)")
+        sys.exit(1)
+    print(f"✓ Build complete: dist/ is ready ({time.perf_counter() - start:.1f}s)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Build instrumentation
+Records wall time, CPU time, peak RSS, bytes read and written and cache
+hits for each stage of a build script and for each file it handles, and
+writes them as a JSON report. create-pages.py, minify.py,
+optimize-images.py and build.py take --report FILE; build.py records its
+own stages as the entries of a 'build' stage (skipped ones as cached) and
+adds the stages of the scripts it runs.
+
+Comparing two reports flags every stage or file whose time, memory or
+output grew by more than the threshold (and by more than the metric's
+noise floor), or whose cache hit rate dropped, and exits non-zero.
+
+    python build.py --report build-report.json
+    python build_report.py build-report.json                         # summary
+    python build_report.py build-report.json --compare previous.json   # regressions
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+
+REPORT_VERSION = 1
+
+# Metrics compared between reports, with the smallest growth that counts
+# as a regression rather than noise
+NOISE_FLOORS = {'wall_seconds': 0.05, 'cpu_seconds': 0.05, 'peak_rss_kb': 4096, 'bytes_out': 1024}
+DEFAULT_THRESHOLD = 10  # percent
+CACHE_HIT_RATE_DROP = 0.1
+
+_stages = {}
+
+def peak_rss_kb():
+    """Peak resident set size of this process or any finished child so far, in KB
+
+    None where the resource module is unavailable (Windows).
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    scale = 1024 if sys.platform == 'darwin' else 1  # macOS reports bytes
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return max(own, children) // scale
+
+def cpu_seconds():
+    """CPU time used by this process and its finished children"""
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+def start():
+    """Snapshot to measure one file's work from, for finish()"""
+    return time.perf_counter(), time.process_time()
+
+def finish(started, bytes_in=0, bytes_out=0):
+    """Metrics of the work since start(), for record_file()
+
+    Runs in worker processes too; the peak RSS is that of the process
+    that handled the file, up to and including it.
+    """
+    wall, cpu = started
+    return {'wall_seconds': time.perf_counter() - wall, 'cpu_seconds': time.process_time() - cpu,
+            'peak_rss_kb': peak_rss_kb(), 'bytes_in': bytes_in, 'bytes_out': bytes_out,
+            'cached': False}
+
+def cached(bytes_in=0, bytes_out=0):
+    """Metrics of a file served from a cache, for record_file()"""
+    return {'wall_seconds': 0.0, 'cpu_seconds': 0.0, 'peak_rss_kb': 0, 'bytes_in': bytes_in,
+            'bytes_out': bytes_out, 'cached': True}
+
+def record_file(stage_name, path, metrics):
+    """Add one file's metrics to a stage"""
+    _stages.setdefault(stage_name, {'files': {}})['files'][str(path)] = metrics
+
+@contextlib.contextmanager
+def stage(name):
+    """Measure the wall time, CPU time and peak RSS of the code in the block"""
+    entry = _stages.setdefault(name, {'files': {}})
+    wall = time.perf_counter()
+    cpu = cpu_seconds()
+    try:
+        yield entry
+    finally:
+        entry['wall_seconds'] = time.perf_counter() - wall
+        entry['cpu_seconds'] = cpu_seconds() - cpu
+        entry['peak_rss_kb'] = peak_rss_kb()
+
+def summarize(entry):
+    """A stage entry with its totals, cache hit rate and throughput filled in from its files"""
+    files = entry.get('files', {})
+    summary = dict(entry)
+    if files:
+        summary['bytes_in'] = sum(f['bytes_in'] for f in files.values())
+        summary['bytes_out'] = sum(f['bytes_out'] for f in files.values())
+        summary['cache_hits'] = sum(f['cached'] for f in files.values())
+        summary['cache_hit_rate'] = summary['cache_hits'] / len(files)
+    wall = summary.get('wall_seconds')
+    if wall and summary.get('bytes_in'):
+        summary['throughput_bytes_per_second'] = summary['bytes_in'] / wall
+    return summary
+
+def report(stages=None):
+    """The report for the given stage entries (default: those recorded in this process)"""
+    stages = _stages if stages is None else stages
+    return {
+        'version': REPORT_VERSION,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'command': [os.path.basename(sys.argv[0])] + sys.argv[1:],
+        'stages': {name: summarize(entry) for name, entry in stages.items()},
+    }
+
+def write_report(path, stages=None):
+    """Write the JSON report to path"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report(stages), f, indent=2, sort_keys=True)
+        f.write('\n')
+
+def merge_report(path):
+    """Add the stages of a report another script wrote to this process's report"""
+    _stages.update(load_report(path)['stages'])
+
+def load_report(path):
+    """Read a report written by write_report()"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if data.get('version') != REPORT_VERSION:
+        raise ValueError(f"{path}: unsupported report version {data.get('version')!r}")
+    return data
+
+def metric_regressions(name, old, new, threshold):
+    """Lines describing the metrics of one stage or file that regressed"""
+    lines = []
+    for metric, floor in NOISE_FLOORS.items():
+        before, after = old.get(metric), new.get(metric)
+        if before is None or after is None or after - before <= floor:
+            continue
+        if before and (after - before) / before * 100 <= threshold:
+            continue
+        growth = f"+{(after - before) / before * 100:.0f}%" if before else "new"
+        lines.append(f"{name}: {metric} {format_metric(metric, before)} -> "
+                     f"{format_metric(metric, after)} ({growth})")
+    before, after = old.get('cache_hit_rate'), new.get('cache_hit_rate')
+    if before is not None and after is not None and before - after > CACHE_HIT_RATE_DROP:
+        lines.append(f"{name}: cache_hit_rate {before:.0%} -> {after:.0%}")
+    return lines
+
+def compare(old, new, threshold=DEFAULT_THRESHOLD):
+    """Regressions from report `old` to report `new`, one line each"""
+    lines = []
+    for name, entry in new['stages'].items():
+        previous = old['stages'].get(name)
+        if previous is None:
+            continue
+        lines.extend(metric_regressions(name, previous, entry, threshold))
+        for path, metrics in entry.get('files', {}).items():
+            before = previous.get('files', {}).get(path)
+            # A file served from cache in either run says nothing about its cost
+            if before and not before['cached'] and not metrics['cached']:
+                lines.extend(metric_regressions(f"{name} {path}", before, metrics, threshold))
+    return lines
+
+def format_metric(metric, value):
+    """A metric value with its unit"""
+    if metric.endswith('_seconds'):
+        return f"{value:.2f}s"
+    if metric == 'peak_rss_kb':
+        return f"{value / 1024:.1f} MB"
+    return f"{value:,} bytes"
+
+def print_summary(data):
+    """One line per stage of a report"""
+    for name, entry in data['stages'].items():
+        parts = [f"{entry.get('wall_seconds', 0):.2f}s wall", f"{entry.get('cpu_seconds', 0):.2f}s CPU"]
+        if entry.get('peak_rss_kb') is not None:
+            parts.append(f"{entry['peak_rss_kb'] / 1024:.1f} MB peak")
+        if 'bytes_in' in entry:
+            parts.append(f"{entry['bytes_in']:,} -> {entry['bytes_out']:,} bytes")
+        if 'cache_hit_rate' in entry:
+            parts.append(f"{entry['cache_hit_rate']:.0%} cached")
+        print(f"  {name}: {', '.join(parts)}")
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description='Summarize a build report or compare it with an earlier one')
+    parser.add_argument('report', help='report written with --report')
+    parser.add_argument('--compare', metavar='PREVIOUS', help='earlier report to check for regressions')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='growth in percent that counts as a regression (default: %(default)s)')
+    args = parser.parse_args()
+
+    data = load_report(args.report)
+    print("=" * 60)
+    print(f"Build report: {args.report} ({data['created']})")
+    print("=" * 60)
+    print_summary(data)
+    if not args.compare:
+        return
+
+    print()
+    regressions = compare(load_report(args.compare), data, args.threshold)
+    if not regressions:
+        print(f"✓ No regressions against {args.compare}")
+        return
+    print(f"✗ {len(regressions)} regression(s) against {args.compare}:")
+    for line in regressions:
+        print(f"  {line}")
+    sys.exit(1)
+
+if __name__ == '__main__':
+    main()
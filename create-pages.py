@@ -1,8 +1,39 @@
 #!/usr/bin/env python3
 """
 Script to generate all website pages from templates
+
+Run it to write every changed page to disk, or load it as a library to
+render pages in memory (the hyphenated filename needs importlib):
+
+    spec = importlib.util.spec_from_file_location('create_pages', 'create-pages.py')
+    pages = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(pages)
+    html = pages.render_page('about.html')
+
+Importing is cheap and has no side effects: the page table is only built
+on first use, and the build helpers (critical_css, image_index,
+build_report) are imported by the functions that need them.
 """
 
+import argparse
+import ast
+import collections
+import contextlib
+import functools
+import glob
+import hashlib
+import importlib.util
+import itertools
+import json
+import os
+import re
+import shutil
+import string
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
 # Common head section
 HEAD = '''<!DOCTYPE html>
 <html lang="en">
@@ -19,20 +50,16 @@ HEAD = '''<!DOCTYPE html>
   <link rel="icon" type="image/svg+xml" href="data:image/svg+xml,<svg xmlns='http://www.w3.org/2000/svg' viewBox='0 0 24 24'><path fill='%2322d3ee' d='M3 12L12 3l9 9-9 9-9-9Z'/><path fill='%2360a5fa' d='M12 7v10M7 12h10'/></svg>" />
   
   <!-- ======= Preload Critical Resources ======= -->
-  <link rel="preconnect" href="https://cdn.tailwindcss.com">
   <link rel="preconnect" href="https://fonts.googleapis.com">
   <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
-  <link rel="dns-prefetch" href="https://unpkg.com">
-  
-  <!-- ======= Tailwind (CDN) ======= -->
-  <script src="https://cdn.tailwindcss.com"></script>
   
-  <!-- ======= Fonts / Icons ======= -->
+  <!-- ======= Fonts ======= -->
   <link href="https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;800&display=swap" rel="stylesheet">
-  <script src="https://unpkg.com/feather-icons"></script>
   
   <!-- ======= Custom Styles ======= -->
-  <link rel="stylesheet" href="styles.css">
+  {stylesheet}
+  <!-- Tailwind utilities (generated by extract-tailwind.py) -->
+  <link rel="stylesheet" href="tailwind.css">
   
   <!-- ======= Open Graph ======= -->
   <meta property="og:title" content="{title} | Zic0n Engineering" />
@@ -73,7 +100,10 @@ def get_breadcrumbs(page_file):
         'faqs.html': [('Home', 'index.html'), ('FAQs', 'faqs.html')],
         'contact.html': [('Home', 'index.html'), ('Contact', 'contact.html')],
     }
-    crumbs = breadcrumbs.get(page_file, [])
+    return breadcrumb_html(breadcrumbs.get(page_file, []))
+
+def breadcrumb_html(crumbs):
+    """Render a list of (label, href) pairs as breadcrumb navigation"""
     if not crumbs:
         return ''
     
@@ -160,8 +190,7 @@ FOOTER = '''  <footer class="border-t border-white/10 py-10">
   </button>
 
   <!-- ======= Custom JavaScript ======= -->
-  <script src="app.js"></script>
-  
+{scripts}  
   <!-- ======= JSON-LD Structured Data ======= -->
   <script type="application/ld+json">
   {{
@@ -191,12 +220,111 @@ FOOTER = '''  <footer class="border-t border-white/10 py-10">
 </html>
 '''
 
+# Collection templates. Item fields are inserted as HTML, like the PAGES content.
+PROJECT_CARD = '''        <div class="card rounded-2xl overflow-hidden hover:scale-[1.02] transition-transform">
+          <div class="aspect-video overflow-hidden bg-gradient-to-br from-cyan-400/10 to-blue-400/10">
+            <img src="{image}" alt="{image_alt}" class="w-full h-full object-cover" loading="lazy" onerror="this.onerror=null; this.src='{fallback_image}'">
+          </div>
+          <div class="p-6">
+            <div class="flex items-center gap-2 mb-2">
+{tags}            </div>
+            <h2 class="text-xl font-semibold mb-2"><a href="{url}" class="hover:text-cyan-300 transition">{title}</a></h2>
+            <p class="text-sm text-slate-300/90 mb-4">{summary}</p>
+            <ul class="text-xs text-slate-400 space-y-1">
+{highlights}            </ul>
+          </div>
+        </div>
+'''
+
+PROJECT_DETAIL = '''  <main id="main-content">
+  <section class="section py-20">
+    <div class="max-w-4xl mx-auto px-6">
+      <div class="flex items-center gap-2 mb-4">
+{tags}      </div>
+      <h1 class="text-4xl sm:text-5xl font-bold mb-4">{title}</h1>
+      <p class="text-slate-300/90 text-lg mb-8">{summary}</p>
+      <div class="aspect-video rounded-2xl overflow-hidden bg-gradient-to-br from-cyan-400/10 to-blue-400/10 mb-10">
+        <img src="{image}" alt="{image_alt}" class="w-full h-full object-cover" onerror="this.onerror=null; this.src='{fallback_image}'">
+      </div>
+      <h2 class="text-2xl font-semibold mb-4">Scope of Work</h2>
+      <ul class="grid sm:grid-cols-2 gap-3 text-slate-300/90 mb-12">
+{highlights}      </ul>
+      <div class="flex flex-wrap gap-4">
+        <a href="{listing}" class="inline-flex items-center gap-2 px-6 py-3 rounded-lg border border-white/15 hover:bg-white/5 transition">
+          <i data-feather="arrow-left"></i> All Projects
+        </a>
+        <a href="contact.html" class="inline-flex items-center gap-2 px-6 py-3 rounded-lg bg-cyan-500 text-black font-semibold hover:bg-cyan-400 transition">
+          Discuss a Similar Project <i data-feather="arrow-right"></i>
+        </a>
+      </div>
+    </div>
+  </section>
+  </main>
+'''
+
+PUBLICATION_CARD = '''            <div class="card rounded-xl overflow-hidden hover:border-cyan-400/30 transition">
+              <div class="aspect-video overflow-hidden">
+                <img src="{image}" alt="{image_alt}" class="w-full h-full object-cover opacity-50" loading="lazy" onerror="this.onerror=null; this.src='{fallback_image}'">
+              </div>
+              <div class="p-6">
+                <div class="flex items-start justify-between gap-4">
+                  <div class="flex-1">
+                    <div class="flex items-center gap-2 mb-2">
+                      <span class="text-xs px-2 py-1 bg-cyan-400/20 text-cyan-300 rounded">{citations} Citations</span>
+                      <span class="text-xs text-slate-400">{year}</span>
+                    </div>
+                    <h3 class="font-semibold text-lg mb-2"><a href="{url}" class="hover:text-cyan-300 transition">{title}</a></h3>
+                    <p class="text-sm text-slate-300/90 mb-3">
+                      {summary}
+                    </p>
+                    <div class="flex flex-wrap gap-2">
+{tags}                    </div>
+                  </div>
+                </div>
+              </div>
+            </div>
+'''
+
+PUBLICATION_DETAIL = '''  <main id="main-content">
+  <section class="section py-20">
+    <div class="max-w-4xl mx-auto px-6">
+      <div class="flex items-center gap-2 mb-4">
+        <span class="text-xs px-2 py-1 bg-cyan-400/20 text-cyan-300 rounded">{citations} Citations</span>
+        <span class="text-xs text-slate-400">{year}</span>
+      </div>
+      <h1 class="text-3xl sm:text-4xl font-bold mb-6">{title}</h1>
+      <div class="aspect-video rounded-2xl overflow-hidden mb-8">
+        <img src="{image}" alt="{image_alt}" class="w-full h-full object-cover opacity-50" onerror="this.onerror=null; this.src='{fallback_image}'">
+      </div>
+      <p class="text-slate-300/90 text-lg leading-relaxed mb-6">{summary}</p>
+      <div class="flex flex-wrap gap-2 mb-12">
+{tags}      </div>
+      <div class="flex flex-wrap gap-4">
+        <a href="{listing}" class="inline-flex items-center gap-2 px-6 py-3 rounded-lg border border-white/15 hover:bg-white/5 transition">
+          <i data-feather="arrow-left"></i> All Publications
+        </a>
+        <a href="https://scholar.google.com/citations?user=ckcFqa0AAAAJ&hl=en" target="_blank" rel="noopener noreferrer" class="inline-flex items-center gap-2 px-6 py-3 rounded-lg bg-cyan-500 text-black font-semibold hover:bg-cyan-400 transition">
+          <i data-feather="external-link"></i> Research Profile
+        </a>
+      </div>
+    </div>
+  </section>
+  </main>
+'''
+
+PAGINATION = '''      <nav aria-label="Pagination" class="mt-12 flex items-center justify-center gap-2 text-sm">
+{links}      </nav>
+'''
+
 # Page content templates
-PAGES = {
-    'about.html': {
-        'title': 'About Us',
-        'description': 'Learn about Zic0n Engineering, a partner-led civil engineering practice providing geotechnical, transportation, pavements & materials expertise.',
-        'content': '''  <main id="main-content">
+@functools.lru_cache(maxsize=None)
+def get_pages():
+    """Build the page table on first use"""
+    return {
+        'about.html': {
+            'title': 'About Us',
+            'description': 'Learn about Zic0n Engineering, a partner-led civil engineering practice providing geotechnical, transportation, pavements & materials expertise.',
+            'content': '''  <main id="main-content">
   <section class="section py-20">
     <div class="max-w-7xl mx-auto px-6">
       <div class="grid md:grid-cols-3 gap-10">
@@ -257,11 +385,11 @@ PAGES = {
   </section>
   </main>
 '''
-    },
-    'services.html': {
-        'title': 'Services',
-        'description': 'Comprehensive civil engineering services including geotechnical, transportation, pavement design, materials testing, and data analytics.',
-        'content': '''  <main id="main-content">
+        },
+        'services.html': {
+            'title': 'Services',
+            'description': 'Comprehensive civil engineering services including geotechnical, transportation, pavement design, materials testing, and data analytics.',
+            'content': '''  <main id="main-content">
   <section class="section py-20">
     <div class="max-w-7xl mx-auto px-6">
       <div class="text-center max-w-3xl mx-auto mb-16">
@@ -310,7 +438,7 @@ PAGES = {
         </div>
         <div class="card rounded-2xl p-6">
           <div class="h-12 w-12 rounded-lg bg-cyan-400/20 grid place-items-center mb-4">
-            <i data-feather="flask" class="text-cyan-400"></i>
+            <i data-feather="thermometer" class="text-cyan-400"></i>
           </div>
           <h2 class="text-xl font-semibold mb-2">Materials Testing</h2>
           <p class="text-slate-300/90 text-sm mb-4">Asphalt binder and mixture testing, QA/QC programs, and performance verification.</p>
@@ -357,11 +485,11 @@ PAGES = {
   </section>
   </main>
 '''
-    },
-    'markets.html': {
-        'title': 'Markets',
-        'description': 'Zic0n Engineering serves energy, DOT, water, and industrial markets across the United States.',
-        'content': '''  <main id="main-content">
+        },
+        'markets.html': {
+            'title': 'Markets',
+            'description': 'Zic0n Engineering serves energy, DOT, water, and industrial markets across the United States.',
+            'content': '''  <main id="main-content">
   <section class="section py-20">
     <div class="max-w-7xl mx-auto px-6">
       <div class="text-center max-w-3xl mx-auto mb-16">
@@ -410,7 +538,7 @@ PAGES = {
         </div>
         <div class="card rounded-2xl p-8">
           <div class="h-16 w-16 rounded-xl bg-cyan-400/20 grid place-items-center mb-6">
-            <i data-feather="building" class="text-cyan-400 w-8 h-8"></i>
+            <i data-feather="tool" class="text-cyan-400 w-8 h-8"></i>
           </div>
           <h2 class="text-2xl font-semibold mb-4">Industrial</h2>
           <p class="text-slate-300/90 mb-4">Commercial and industrial facilities requiring geotechnical, structural, and materials engineering services.</p>
@@ -437,11 +565,11 @@ PAGES = {
   </section>
   </main>
 '''
-    },
-    'capabilities.html': {
-        'title': 'Capabilities',
-        'description': 'Technical capabilities and expertise in geotechnical, transportation, pavement engineering, materials testing, and data analytics.',
-        'content': '''  <main id="main-content">
+        },
+        'capabilities.html': {
+            'title': 'Capabilities',
+            'description': 'Technical capabilities and expertise in geotechnical, transportation, pavement engineering, materials testing, and data analytics.',
+            'content': '''  <main id="main-content">
   <section class="section py-20">
     <div class="max-w-7xl mx-auto px-6">
       <div class="text-center max-w-3xl mx-auto mb-16">
@@ -570,11 +698,12 @@ PAGES = {
   </section>
   </main>
 '''
-    },
-    'projects.html': {
-        'title': 'Projects',
-        'description': 'Featured engineering projects showcasing Zic0n\'s expertise in geotechnical, transportation, and pavement engineering.',
-        'content': '''  <main id="main-content">
+        },
+        'projects.html': {
+            'title': 'Projects',
+            'collection': 'projects',
+            'description': 'Featured engineering projects showcasing Zic0n\'s expertise in geotechnical, transportation, and pavement engineering.',
+            'content': '''  <main id="main-content">
   <section class="section py-20">
     <div class="max-w-7xl mx-auto px-6">
       <div class="text-center max-w-3xl mx-auto mb-16">
@@ -582,122 +711,8 @@ PAGES = {
         <p class="text-slate-300/90 text-lg">Featured projects demonstrating our engineering expertise across diverse applications.</p>
       </div>
       <div class="grid md:grid-cols-2 lg:grid-cols-3 gap-8">
-        <div class="card rounded-2xl overflow-hidden hover:scale-[1.02] transition-transform">
-          <div class="aspect-video overflow-hidden bg-gradient-to-br from-cyan-400/10 to-blue-400/10">
-            <img src="images/solar and BESS design.webp" alt="Solar energy infrastructure project" class="w-full h-full object-cover" loading="lazy" onerror="this.onerror=null; this.src='https://images.unsplash.com/photo-1509391366360-2e959784a276?w=800&h=600&fit=crop&q=80'">
-          </div>
-          <div class="p-6">
-            <div class="flex items-center gap-2 mb-2">
-              <span class="badge text-xs">Energy</span>
-              <span class="badge text-xs">Geotechnical</span>
-            </div>
-            <h2 class="text-xl font-semibold mb-2">Solar & BESS Foundation Design</h2>
-            <p class="text-sm text-slate-300/90 mb-4">Comprehensive geotechnical investigation and foundation design for large-scale solar and battery energy storage systems.</p>
-            <ul class="text-xs text-slate-400 space-y-1">
-              <li>• Site characterization & testing</li>
-              <li>• Foundation system design</li>
-              <li>• Slope stability analysis</li>
-              <li>• Construction support</li>
-            </ul>
-          </div>
-        </div>
-        <div class="card rounded-2xl overflow-hidden hover:scale-[1.02] transition-transform">
-          <div class="aspect-video overflow-hidden bg-gradient-to-br from-cyan-400/10 to-blue-400/10">
-            <img src="images/road rehabilitation.jpg" alt="Highway infrastructure and roadway rehabilitation" class="w-full h-full object-cover" loading="lazy" onerror="this.onerror=null; this.src='https://images.unsplash.com/photo-1558618047-3c8c76ca7d13?w=800&h=600&fit=crop&q=80'">
-          </div>
-          <div class="p-6">
-            <div class="flex items-center gap-2 mb-2">
-              <span class="badge text-xs">Transportation</span>
-              <span class="badge text-xs">Roadway</span>
-            </div>
-            <h2 class="text-xl font-semibold mb-2">Highway Rehabilitation Project</h2>
-            <p class="text-sm text-slate-300/90 mb-4">Complete roadway design including geometrics, drainage, pavement design, and cost estimation for major highway project.</p>
-            <ul class="text-xs text-slate-400 space-y-1">
-              <li>• Roadway geometrics & alignments</li>
-              <li>• Drainage system design</li>
-              <li>• Pavement rehabilitation strategy</li>
-              <li>• Construction documents</li>
-            </ul>
-          </div>
-        </div>
-        <div class="card rounded-2xl overflow-hidden hover:scale-[1.02] transition-transform">
-          <div class="aspect-video overflow-hidden bg-gradient-to-br from-cyan-400/10 to-blue-400/10">
-            <img src="images/pavement performance study.jpg" alt="Asphalt paving and pavement construction" class="w-full h-full object-cover" loading="lazy" onerror="this.onerror=null; this.src='https://images.unsplash.com/photo-1589939705384-5185137a7f0f?w=800&h=600&fit=crop&q=80'">
-          </div>
-          <div class="p-6">
-            <div class="flex items-center gap-2 mb-2">
-              <span class="badge text-xs">Pavement</span>
-              <span class="badge text-xs">Materials</span>
-            </div>
-            <h2 class="text-xl font-semibold mb-2">Pavement Performance Study</h2>
-            <p class="text-sm text-slate-300/90 mb-4">Machine learning-based pavement deterioration prediction and optimization for transportation agency.</p>
-            <ul class="text-xs text-slate-400 space-y-1">
-              <li>• Performance data analysis</li>
-              <li>• Machine learning modeling</li>
-              <li>• Maintenance planning</li>
-              <li>• Life cycle optimization</li>
-            </ul>
-          </div>
-        </div>
-        <div class="card rounded-2xl overflow-hidden hover:scale-[1.02] transition-transform">
-          <div class="aspect-video overflow-hidden bg-gradient-to-br from-cyan-400/10 to-blue-400/10">
-            <img src="images/deep foundation design.jpg" alt="Deep foundation construction with drilling rigs and piles" class="w-full h-full object-cover" loading="lazy" onerror="this.onerror=null; this.src='https://images.unsplash.com/photo-1583195764036-6dc248ac07d9?w=800&h=600&fit=crop&q=80'">
-          </div>
-          <div class="p-6">
-            <div class="flex items-center gap-2 mb-2">
-              <span class="badge text-xs">Geotechnical</span>
-              <span class="badge text-xs">Foundation</span>
-            </div>
-            <h2 class="text-xl font-semibold mb-2">Deep Foundation Design</h2>
-            <p class="text-sm text-slate-300/90 mb-4">Drilled shaft and driven pile foundation design for industrial facility on challenging soil conditions.</p>
-            <ul class="text-xs text-slate-400 space-y-1">
-              <li>• Comprehensive site investigation</li>
-              <li>• Deep foundation design</li>
-              <li>• Load testing program</li>
-              <li>• Construction observation</li>
-            </ul>
-          </div>
-        </div>
-        <div class="card rounded-2xl overflow-hidden hover:scale-[1.02] transition-transform">
-          <div class="aspect-video overflow-hidden bg-gradient-to-br from-cyan-400/10 to-blue-400/10">
-            <img src="images/levee assessment.webp" alt="Water infrastructure and civil engineering project" class="w-full h-full object-cover" loading="lazy" onerror="this.onerror=null; this.src='https://images.unsplash.com/photo-1558618047-3c8c76ca7d13?w=800&h=600&fit=crop&q=80'">
-          </div>
-          <div class="p-6">
-            <div class="flex items-center gap-2 mb-2">
-              <span class="badge text-xs">Water</span>
-              <span class="badge text-xs">Geotechnical</span>
-            </div>
-            <h2 class="text-xl font-semibold mb-2">Levee Assessment & Design</h2>
-            <p class="text-sm text-slate-300/90 mb-4">Geotechnical evaluation and seepage analysis for levee system improvements and flood protection.</p>
-            <ul class="text-xs text-slate-400 space-y-1">
-              <li>• Levee condition assessment</li>
-              <li>• Seepage analysis</li>
-              <li>• Stability evaluation</li>
-              <li>• Improvement recommendations</li>
-            </ul>
-          </div>
-        </div>
-        <div class="card rounded-2xl overflow-hidden hover:scale-[1.02] transition-transform">
-          <div class="aspect-video overflow-hidden bg-gradient-to-br from-cyan-400/10 to-blue-400/10">
-            <img src="images/asphalt material research.jpg" alt="Materials testing and laboratory analysis" class="w-full h-full object-cover" loading="lazy" onerror="this.onerror=null; this.src='https://images.unsplash.com/photo-1589939705384-5185137a7f0f?w=800&h=600&fit=crop&q=80'">
-          </div>
-          <div class="p-6">
-            <div class="flex items-center gap-2 mb-2">
-              <span class="badge text-xs">Materials</span>
-              <span class="badge text-xs">Testing</span>
-            </div>
-            <h2 class="text-xl font-semibold mb-2">Asphalt Materials Research</h2>
-            <p class="text-sm text-slate-300/90 mb-4">Laboratory testing and performance evaluation program for innovative asphalt binder and mixture technologies.</p>
-            <ul class="text-xs text-slate-400 space-y-1">
-              <li>• Advanced binder testing</li>
-              <li>• Mixture design optimization</li>
-              <li>• Performance verification</li>
-              <li>• Quality control programs</li>
-            </ul>
-          </div>
-        </div>
-      </div>
-      <div class="mt-12 text-center">
+{cards}      </div>
+{pagination}      <div class="mt-12 text-center">
         <p class="text-slate-300/90 mb-6">Interested in learning more about our project experience?</p>
         <a href="contact.html" class="inline-flex items-center gap-2 px-6 py-3 rounded-lg bg-cyan-500 text-black font-semibold hover:bg-cyan-400 transition">
           Contact Us <i data-feather="arrow-right"></i>
@@ -707,11 +722,11 @@ PAGES = {
   </section>
   </main>
 '''
-    },
-    'approach.html': {
-        'title': 'Approach',
-        'description': 'Zic0n Engineering\'s methodology: research-backed solutions, data-driven decisions, and client-focused delivery.',
-        'content': '''  <main id="main-content">
+        },
+        'approach.html': {
+            'title': 'Approach',
+            'description': 'Zic0n Engineering\'s methodology: research-backed solutions, data-driven decisions, and client-focused delivery.',
+            'content': '''  <main id="main-content">
   <section class="section py-20">
     <div class="max-w-7xl mx-auto px-6">
       <div class="text-center max-w-3xl mx-auto mb-16">
@@ -760,7 +775,7 @@ PAGES = {
         </div>
         <div class="card rounded-2xl p-8">
           <div class="h-16 w-16 rounded-xl bg-cyan-400/20 grid place-items-center mb-6">
-            <i data-feather="leaf" class="text-cyan-400 w-8 h-8"></i>
+            <i data-feather="refresh-cw" class="text-cyan-400 w-8 h-8"></i>
           </div>
           <h2 class="text-2xl font-semibold mb-4">Sustainability</h2>
           <p class="text-slate-300/90 mb-4">We integrate life cycle assessment, environmental considerations, and sustainable practices into our engineering solutions.</p>
@@ -786,11 +801,11 @@ PAGES = {
   </section>
   </main>
 '''
-    },
-    'leadership.html': {
-        'title': 'Leadership',
-        'description': 'Meet the leadership team at Zic0n Engineering: Ph.D. P.E.s with expertise in geotechnical and transportation engineering.',
-        'content': '''  <main id="main-content">
+        },
+        'leadership.html': {
+            'title': 'Leadership',
+            'description': 'Meet the leadership team at Zic0n Engineering: Ph.D. P.E.s with expertise in geotechnical and transportation engineering.',
+            'content': '''  <main id="main-content">
   <section class="section py-20">
     <div class="max-w-7xl mx-auto px-6">
       <div class="text-center max-w-3xl mx-auto mb-16">
@@ -846,11 +861,11 @@ PAGES = {
   </section>
   </main>
 '''
-    },
-    'faqs.html': {
-        'title': 'FAQs',
-        'description': 'Frequently asked questions about Zic0n Engineering\'s services, expertise, and project delivery.',
-        'content': '''  <main id="main-content">
+        },
+        'faqs.html': {
+            'title': 'FAQs',
+            'description': 'Frequently asked questions about Zic0n Engineering\'s services, expertise, and project delivery.',
+            'content': '''  <main id="main-content">
   <section class="section py-20">
     <div class="max-w-4xl mx-auto px-6">
       <div class="text-center max-w-3xl mx-auto mb-16">
@@ -941,13 +956,25 @@ PAGES = {
   </section>
   </main>
 '''
-    },
-    'contact.html': {
-        'title': 'Contact',
-        'description': 'Contact Zic0n Engineering for engineering consultation, project inquiries, or to discuss your infrastructure needs.',
-        'content': '''  <main id="main-content">
-  <section class="section py-20">
-    <div class="max-w-7xl mx-auto px-6">
+        },
+        'contact.html': {
+            'title': 'Contact',
+            'description': 'Contact Zic0n Engineering for engineering consultation, project inquiries, or to discuss your infrastructure needs.',
+            'content': '''  <main id="main-content">
+  <section class="section py-20 relative overflow-hidden">
+    <!-- Video Background -->
+    <div class="absolute inset-0 z-0">
+      <video autoplay loop muted playsinline class="w-full h-full object-cover opacity-25" poster="images/drill rig.jpg" id="drillRigVideo">
+        <!-- Try local video first, then fallback to online sources -->
+        <source src="images/drilling-rig-video.mp4" type="video/mp4">
+        <source src="https://videos.pexels.com/video-files/3045163/3045163-uhd_2560_1440_25fps.mp4" type="video/mp4">
+        <source src="https://videos.pexels.com/video-files/3045163/3045163-hd_1920_1080_25fps.mp4" type="video/mp4">
+        <!-- Fallback image if video doesn't load -->
+        <img src="images/drill rig.jpg" alt="Drilling rig background" class="w-full h-full object-cover">
+      </video>
+      <div class="absolute inset-0 bg-[#0b1220]/75"></div>
+    </div>
+    <div class="max-w-7xl mx-auto px-6 relative z-10">
       <div class="text-center max-w-3xl mx-auto mb-16">
         <h1 class="text-4xl sm:text-5xl font-bold mb-4">Contact Us</h1>
         <p class="text-slate-300/90 text-lg">Get in touch to discuss your engineering project needs. We're here to help.</p>
@@ -955,24 +982,43 @@ PAGES = {
       <div class="grid md:grid-cols-2 gap-12">
         <div class="card rounded-2xl p-8">
           <h2 class="text-2xl font-semibold mb-6">Send Us a Message</h2>
-          <form action="mailto:info@zic0n.com" method="post" enctype="text/plain" class="space-y-6">
+          <form id="contactForm" class="space-y-6" netlify-honeypot="bot-field" data-netlify="true" name="contact">
+            <!-- Honeypot field for spam protection -->
+            <input type="hidden" name="form-name" value="contact">
+            <div class="hidden">
+              <label>Don't fill this out if you're human: <input name="bot-field" /></label>
+            </div>
+            
+            <div>
+              <label for="name" class="block text-sm font-medium text-slate-300 mb-2">Name <span class="text-red-400">*</span></label>
+              <input type="text" id="name" name="name" required class="w-full px-4 py-3 rounded-lg bg-white/5 border border-white/10 focus:outline-none focus:ring-2 focus:ring-cyan-500 text-white transition" placeholder="Your name" autocomplete="name">
+            </div>
             <div>
-              <label for="name" class="block text-sm font-medium text-slate-300 mb-2">Name</label>
-              <input type="text" id="name" name="name" required class="w-full px-4 py-3 rounded-lg bg-white/5 border border-white/10 focus:outline-none focus:ring-2 focus:ring-cyan-500 text-white" placeholder="Your name">
+              <label for="email" class="block text-sm font-medium text-slate-300 mb-2">Email <span class="text-red-400">*</span></label>
+              <input type="email" id="email" name="email" required class="w-full px-4 py-3 rounded-lg bg-white/5 border border-white/10 focus:outline-none focus:ring-2 focus:ring-cyan-500 text-white transition" placeholder="your.email@example.com" autocomplete="email">
             </div>
             <div>
-              <label for="email" class="block text-sm font-medium text-slate-300 mb-2">Email</label>
-              <input type="email" id="email" name="email" required class="w-full px-4 py-3 rounded-lg bg-white/5 border border-white/10 focus:outline-none focus:ring-2 focus:ring-cyan-500 text-white" placeholder="your.email@example.com">
+              <label for="phone" class="block text-sm font-medium text-slate-300 mb-2">Phone (optional)</label>
+              <input type="tel" id="phone" name="phone" class="w-full px-4 py-3 rounded-lg bg-white/5 border border-white/10 focus:outline-none focus:ring-2 focus:ring-cyan-500 text-white transition" placeholder="(555) 123-4567" autocomplete="tel">
             </div>
             <div>
-              <label for="subject" class="block text-sm font-medium text-slate-300 mb-2">Subject</label>
-              <input type="text" id="subject" name="subject" required class="w-full px-4 py-3 rounded-lg bg-white/5 border border-white/10 focus:outline-none focus:ring-2 focus:ring-cyan-500 text-white" placeholder="Project inquiry">
+              <label for="subject" class="block text-sm font-medium text-slate-300 mb-2">Subject <span class="text-red-400">*</span></label>
+              <select id="subject" name="subject" required class="w-full px-4 py-3 rounded-lg bg-white/5 border border-white/10 focus:outline-none focus:ring-2 focus:ring-cyan-500 text-white transition">
+                <option value="">Select a topic...</option>
+                <option value="general">General Inquiry</option>
+                <option value="project">Project Consultation</option>
+                <option value="geotechnical">Geotechnical Services</option>
+                <option value="transportation">Transportation Design</option>
+                <option value="pavement">Pavement Engineering</option>
+                <option value="materials">Materials Testing</option>
+                <option value="other">Other</option>
+              </select>
             </div>
             <div>
-              <label for="message" class="block text-sm font-medium text-slate-300 mb-2">Message</label>
-              <textarea id="message" name="message" rows="6" required class="w-full px-4 py-3 rounded-lg bg-white/5 border border-white/10 focus:outline-none focus:ring-2 focus:ring-cyan-500 text-white resize-none" placeholder="Tell us about your project..."></textarea>
+              <label for="message" class="block text-sm font-medium text-slate-300 mb-2">Message <span class="text-red-400">*</span></label>
+              <textarea id="message" name="message" rows="6" required class="w-full px-4 py-3 rounded-lg bg-white/5 border border-white/10 focus:outline-none focus:ring-2 focus:ring-cyan-500 text-white resize-none transition" placeholder="Tell us about your project..."></textarea>
             </div>
-            <button type="submit" class="w-full px-6 py-3 rounded-lg bg-cyan-500 text-black font-semibold hover:bg-cyan-400 transition">
+            <button type="submit" class="w-full px-6 py-3 rounded-lg bg-cyan-500 text-black font-semibold hover:bg-cyan-400 transition transform hover:scale-105 disabled:opacity-50 disabled:cursor-not-allowed">
               Send Message
             </button>
           </form>
@@ -1026,11 +1072,12 @@ PAGES = {
   </section>
   </main>
 '''
-    },
-    'newsletter.html': {
-        'title': 'Newsletter',
-        'description': 'Stay updated with the latest news, insights, and publications from Zic0n Engineering.',
-        'content': '''  <main id="main-content">
+        },
+        'newsletter.html': {
+            'title': 'Newsletter',
+            'collection': 'publications',
+            'description': 'Stay updated with the latest news, insights, and publications from Zic0n Engineering.',
+            'content': '''  <main id="main-content">
     <section class="relative py-20">
       <div class="absolute inset-0 bg-[radial-gradient(70%_60%_at_50%_-20%,rgba(34,211,238,0.20),transparent_60%)]"></div>
       <div class="max-w-7xl mx-auto px-6 py-12 relative">
@@ -1156,79 +1203,8 @@ PAGES = {
         <div class="mb-12">
           <h2 class="text-3xl font-bold mb-8">Featured Publications</h2>
           <div class="space-y-4">
-            <div class="card rounded-xl overflow-hidden hover:border-cyan-400/30 transition">
-              <div class="aspect-video overflow-hidden">
-                <img src="images/pavement performance study.jpg" alt="Pavement engineering and road infrastructure" class="w-full h-full object-cover opacity-50" loading="lazy" onerror="this.onerror=null; this.src='https://images.unsplash.com/photo-1589939705384-5185137a7f0f?w=1200&h=675&fit=crop&q=80'">
-              </div>
-              <div class="p-6">
-                <div class="flex items-start justify-between gap-4">
-                  <div class="flex-1">
-                    <div class="flex items-center gap-2 mb-2">
-                      <span class="text-xs px-2 py-1 bg-cyan-400/20 text-cyan-300 rounded">88 Citations</span>
-                      <span class="text-xs text-slate-400">2019</span>
-                    </div>
-                    <h3 class="font-semibold text-lg mb-2">Parametric Study of Pavement Deterioration Using Machine Learning Algorithms</h3>
-                    <p class="text-sm text-slate-300/90 mb-3">
-                      A comprehensive study leveraging machine learning to predict and model pavement deterioration patterns, providing valuable insights for infrastructure maintenance planning.
-                    </p>
-                    <div class="flex flex-wrap gap-2">
-                      <span class="text-xs px-2 py-1 bg-white/5 rounded">Machine Learning</span>
-                      <span class="text-xs px-2 py-1 bg-white/5 rounded">Pavement Performance</span>
-                    </div>
-                  </div>
-                </div>
-              </div>
-            </div>
-
-            <div class="card rounded-xl overflow-hidden hover:border-cyan-400/30 transition">
-              <div class="aspect-video overflow-hidden">
-                <img src="images/pavement performance study.jpg" alt="Data analytics and machine learning for infrastructure" class="w-full h-full object-cover opacity-50" loading="lazy" onerror="this.onerror=null; this.src='https://images.unsplash.com/photo-1551288049-bebda4e38f71?w=1200&h=675&fit=crop&q=80'">
-              </div>
-              <div class="p-6">
-                <div class="flex items-start justify-between gap-4">
-                  <div class="flex-1">
-                    <div class="flex items-center gap-2 mb-2">
-                      <span class="text-xs px-2 py-1 bg-cyan-400/20 text-cyan-300 rounded">81 Citations</span>
-                      <span class="text-xs text-slate-400">2021</span>
-                    </div>
-                    <h3 class="font-semibold text-lg mb-2">Machine Learning Approach to Predict International Roughness Index Using Long-Term Pavement Performance Data</h3>
-                    <p class="text-sm text-slate-300/90 mb-3">
-                      Advanced machine learning techniques applied to long-term pavement performance data to accurately predict International Roughness Index, enabling proactive maintenance strategies.
-                    </p>
-                    <div class="flex flex-wrap gap-2">
-                      <span class="text-xs px-2 py-1 bg-white/5 rounded">Data Analytics</span>
-                      <span class="text-xs px-2 py-1 bg-white/5 rounded">Predictive Modeling</span>
-                    </div>
-                  </div>
-                </div>
-              </div>
-            </div>
-
-            <div class="card rounded-xl overflow-hidden hover:border-cyan-400/30 transition">
-              <div class="aspect-video overflow-hidden">
-                <img src="images/geotechnical and geo structural.jpg" alt="Geotechnical engineering drilling and foundation work" class="w-full h-full object-cover opacity-50" loading="lazy" onerror="this.onerror=null; this.src='https://images.unsplash.com/photo-1583195764036-6dc248ac07d9?w=1200&h=675&fit=crop&q=80'">
-              </div>
-              <div class="p-6">
-                <div class="flex items-start justify-between gap-4">
-                  <div class="flex-1">
-                    <div class="flex items-center gap-2 mb-2">
-                      <span class="text-xs px-2 py-1 bg-cyan-400/20 text-cyan-300 rounded">41 Citations</span>
-                      <span class="text-xs text-slate-400">2019</span>
-                    </div>
-                    <h3 class="font-semibold text-lg mb-2">Feasibility of Using Electrokinetics and Nanomaterials to Stabilize and Improve Collapsible Soils</h3>
-                    <p class="text-sm text-slate-300/90 mb-3">
-                      Innovative research exploring the combination of electrokinetic techniques and nanomaterials for stabilizing collapsible soils, opening new possibilities for problematic soil treatment.
-                    </p>
-                    <div class="flex flex-wrap gap-2">
-                      <span class="text-xs px-2 py-1 bg-white/5 rounded">Soil Improvement</span>
-                      <span class="text-xs px-2 py-1 bg-white/5 rounded">Electrokinetics</span>
-                    </div>
-                  </div>
-                </div>
-              </div>
-            </div>
-          </div>
-        </div>
+{cards}          </div>
+{pagination}        </div>
 
         <div class="card rounded-2xl p-8 text-center bg-gradient-to-br from-cyan-400/10 to-blue-400/10">
           <i data-feather="mail" class="w-16 h-16 text-cyan-400 mx-auto mb-4"></i>
@@ -1249,23 +1225,925 @@ PAGES = {
     </section>
   </main>
 '''
+        }
     }
+
+# Collections rendered from per-item JSON files in content/<name>/. Items
+# are read one at a time in filename order, so generation streams with at
+# most one listing page of cards in memory.
+COLLECTIONS = {
+    'projects': {
+        'source': 'content/projects',
+        'listing': 'projects.html',
+        'label': 'Projects',
+        'detail_prefix': 'project-',
+        'per_page': 12,
+        'card': PROJECT_CARD,
+        'card_separator': '',
+        'detail': PROJECT_DETAIL,
+        'rows': {
+            'card': {
+                'tags': '              <span class="badge text-xs">{}</span>\n',
+                'highlights': '              <li>• {}</li>\n',
+            },
+            'detail': {
+                'tags': '        <span class="badge text-xs">{}</span>\n',
+                'highlights': '        <li class="flex items-start gap-3"><i data-feather="check-circle" class="text-cyan-400 mt-0.5"></i> {}</li>\n',
+            },
+        },
+        'required': ('title', 'summary', 'image', 'image_alt', 'fallback_image', 'tags', 'highlights'),
+    },
+    'publications': {
+        'source': 'content/publications',
+        'listing': 'newsletter.html',
+        'label': 'Newsletter',
+        'detail_prefix': 'publication-',
+        'per_page': 10,
+        'card': PUBLICATION_CARD,
+        'card_separator': '\n',
+        'detail': PUBLICATION_DETAIL,
+        'rows': {
+            'card': {
+                'tags': '                      <span class="text-xs px-2 py-1 bg-white/5 rounded">{}</span>\n',
+            },
+            'detail': {
+                'tags': '        <span class="text-xs px-2 py-1 bg-white/5 rounded">{}</span>\n',
+            },
+        },
+        'required': ('title', 'summary', 'year', 'citations', 'image', 'image_alt', 'fallback_image', 'tags'),
+    },
 }
 
-# Generate pages
-from datetime import datetime
+def collection_files(name):
+    """List a collection's item files in display order"""
+    source = COLLECTIONS[name]['source']
+    try:
+        return sorted(entry.path for entry in os.scandir(source)
+                      if entry.is_file() and entry.name.endswith('.json'))
+    except FileNotFoundError:
+        return []
 
-current_date = datetime.now().strftime('%Y-%m-%d')
+def item_slug(path):
+    """Derive an item slug from its file name, dropping the ordering prefix"""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    prefix, separator, rest = stem.partition('-')
+    return rest if separator and prefix.isdigit() else stem
 
-for page_file, page_data in PAGES.items():
-    breadcrumbs = get_breadcrumbs(page_file)
-    content = HEAD.format(
-        title=page_data['title'],
-        description=page_data['description'],
-        page=page_file
-    ) + HEADER + (breadcrumbs if breadcrumbs else '') + page_data['content'] + FOOTER
-    
-    with open(page_file, 'w', encoding='utf-8') as f:
-        f.write(content)
-    print(f'Created {page_file}')
+def iter_collection(name):
+    """Yield (slug, item) for each item file, loading one file at a time"""
+    collection = COLLECTIONS[name]
+    for path in collection_files(name):
+        with open(path, 'r', encoding='utf-8') as f:
+            item = json.load(f)
+        missing = [key for key in collection['required'] if key not in item]
+        if missing:
+            raise ValueError(f'{path}: missing {", ".join(missing)}')
+        yield item_slug(path), item
+
+def listing_file(name, number):
+    """File name of a collection's listing page (1-based)"""
+    listing = COLLECTIONS[name]['listing']
+    if number == 1:
+        return listing
+    stem, ext = os.path.splitext(listing)
+    return f'{stem}-{number}{ext}'
+
+def detail_file(name, slug):
+    """File name of an item's detail page"""
+    return f"{COLLECTIONS[name]['detail_prefix']}{slug}.html"
+
+def fill_item(name, template, rows, slug, item):
+    """Render an item through a card or detail template"""
+    fields = dict(item)
+    for key, row in rows.items():
+        fields[key] = ''.join(row.format(value) for value in item[key])
+    fields['url'] = detail_file(name, slug)
+    fields['listing'] = COLLECTIONS[name]['listing']
+    return template.format(**fields)
+
+def pagination_html(name, number, page_count):
+    """Render previous/next and numbered links for a listing page"""
+    if page_count < 2:
+        return ''
+    link = '        <a href="{href}" class="px-3 py-2 rounded-lg border border-white/10 hover:bg-white/5 transition">{label}</a>\n'
+    current = '        <span aria-current="page" class="px-3 py-2 rounded-lg bg-cyan-500 text-black font-semibold">{label}</span>\n'
+    links = []
+    if number > 1:
+        links.append(link.format(href=listing_file(name, number - 1), label='Previous'))
+    for other in range(1, page_count + 1):
+        template = current if other == number else link
+        links.append(template.format(href=listing_file(name, other), label=other))
+    if number < page_count:
+        links.append(link.format(href=listing_file(name, number + 1), label='Next'))
+    return PAGINATION.format(links=''.join(links))
+
+def iter_listing_pages(name, page_data):
+    """Yield (page_file, page_data) for each page of a collection listing"""
+    collection = COLLECTIONS[name]
+    per_page = collection['per_page']
+    page_count = max(1, -(-len(collection_files(name)) // per_page))
+    layout = compile_template(page_data['content'])
+    items = iter_collection(name)
+    for number in range(1, page_count + 1):
+        cards = [fill_item(name, collection['card'], collection['rows']['card'], slug, item)
+                 for slug, item in itertools.islice(items, per_page)]
+        slots = {
+            'cards': collection['card_separator'].join(cards),
+            'pagination': pagination_html(name, number, page_count),
+        }
+        content = ''.join(part.decode('utf-8') if isinstance(part, bytes) else slots[part]
+                          for part in layout)
+        listing = dict(page_data, content=content)
+        del listing['collection']
+        page_file = listing_file(name, number)
+        if number > 1:
+            listing['title'] = f"{page_data['title']} (Page {number})"
+            listing['crumbs'] = [('Home', 'index.html'),
+                                 (collection['label'], collection['listing']),
+                                 (f'Page {number}', page_file)]
+        yield page_file, listing
+
+def iter_detail_pages(name):
+    """Yield (page_file, page_data) for each item's detail page"""
+    collection = COLLECTIONS[name]
+    for slug, item in iter_collection(name):
+        page_file = detail_file(name, slug)
+        yield page_file, {
+            'title': item['title'],
+            'description': item['summary'],
+            'content': fill_item(name, collection['detail'], collection['rows']['detail'], slug, item),
+            'crumbs': [('Home', 'index.html'),
+                       (collection['label'], collection['listing']),
+                       (item['title'], page_file)],
+        }
+
+def iter_pages():
+    """Yield (page_file, page_data) for every page, expanding collections lazily"""
+    for page_file, page_data in get_pages().items():
+        name = page_data.get('collection')
+        if name:
+            yield from iter_listing_pages(name, page_data)
+        else:
+            yield page_file, page_data
+    for name in COLLECTIONS:
+        yield from iter_detail_pages(name)
+
+def page_breadcrumbs(page_file, page_data):
+    """Breadcrumbs for a page, from its own trail or the fixed table"""
+    if 'crumbs' in page_data:
+        return breadcrumb_html(page_data['crumbs'])
+    return get_breadcrumbs(page_file)
+
+# Icons are inlined at build time as <svg><use> references into one sprite,
+# so pages no longer load the feather-icons runtime
+ICONS_FILE = os.path.join('icons', 'feather-icons.json')
+SPRITE_FILE = 'icons.svg'
+ICON_TAG = re.compile(r'<i data-feather="([\w-]+)"([^>]*)></i>')
+ICON_REFERENCE = re.compile(r'icons\.svg#([\w-]+)')
+ICON_PLACEHOLDER = re.compile(r'data-feather="([\w-]+)"')
+ICON_ATTRIBUTES = ('width="24" height="24" fill="none" stroke="currentColor" stroke-width="2" '
+                   'stroke-linecap="round" stroke-linejoin="round"')
+
+@functools.lru_cache(maxsize=None)
+def load_icons(path=ICONS_FILE):
+    """Load the feather icon bodies, keyed by icon name"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def icon_svg(name, attributes=''):
+    """Markup for an icon that references its symbol in the sprite"""
+    classes = f'feather feather-{name}'
+    match = re.search(r'\sclass="([^"]*)"', attributes)
+    if match:
+        classes += ' ' + match.group(1)
+        attributes = attributes[:match.start()] + attributes[match.end():]
+    return (f'<svg class="{classes}" {ICON_ATTRIBUTES}{attributes}>'
+            f'<use href="{SPRITE_FILE}#{name}"/></svg>')
+
+def inline_icons(html):
+    """Replace <i data-feather="..."> placeholders with sprite references
+
+    Unknown names are left as they are, the same as feather.replace() did.
+    """
+    icons = load_icons()
+
+    def replace(match):
+        if match.group(1) not in icons:
+            return match.group(0)
+        return icon_svg(match.group(1), match.group(2))
+
+    return ICON_TAG.sub(replace, html)
+
+def sprite_svg(names):
+    """Build the sprite document with one <symbol> per icon"""
+    icons = load_icons()
+    symbols = ''.join(f'  <symbol id="{name}" viewBox="0 0 24 24">{icons[name]}</symbol>\n'
+                      for name in sorted(names))
+    return f'<svg xmlns="http://www.w3.org/2000/svg">\n{symbols}</svg>\n'
+
+def write_sprite():
+    """Collect the icons referenced by the pages and scripts and rewrite the sprite if needed"""
+    used = set()
+    unknown = set()
+    for path in sorted(glob.glob('*.html') + glob.glob('*.js')):
+        with open(path, 'r', encoding='utf-8') as f:
+            text = f.read()
+        used.update(ICON_REFERENCE.findall(text))
+        unknown.update(ICON_PLACEHOLDER.findall(text))
+
+    icons = load_icons()
+    unknown |= used - icons.keys()
+    if unknown:
+        print(f'⚠ Not feather icons, left as placeholders: {", ".join(sorted(unknown))}')
+
+    content = sprite_svg(used & icons.keys()).encode('utf-8')
+    try:
+        with open(SPRITE_FILE, 'rb') as f:
+            if f.read() == content:
+                return False
+    except FileNotFoundError:
+        pass
+    write_atomic(SPRITE_FILE, [content])
+    print(f'Created {SPRITE_FILE} ({len(used & icons.keys())} icons)')
+    return True
+
+# Local <img> tags are rewritten into <picture> elements that offer the
+# responsive variants listed by optimize-images.py, when it has been run
+IMAGE_MANIFEST = os.path.join('images', 'optimized', 'manifest.json')
+IMAGE_FORMATS = (('avif', 'image/avif'), ('webp', 'image/webp'))
+VOID_ELEMENTS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link',
+                 'meta', 'source', 'track', 'wbr'}
+MARKUP_TAG = re.compile(r'''<(/?)([a-zA-Z][\w-]*)((?:[^>"']|"[^"]*"|'[^']*')*)>''')
+TAG_ATTRIBUTE = re.compile(r'''([\w-]+)="([^"]*)"''')
+# An open element while scanning markup; `part` indexes its tag in the output parts, if kept
+OpenElement = collections.namedtuple('OpenElement', 'name classes part')
+
+# Tailwind breakpoints and max-w-* widths (px), for inferring `sizes`
+SCREENS = {'sm': 640, 'md': 768, 'lg': 1024, 'xl': 1280, '2xl': 1536}
+MAX_WIDTHS = {'xs': 320, 'sm': 384, 'md': 448, 'lg': 512, 'xl': 576, '2xl': 672, '3xl': 768,
+              '4xl': 896, '5xl': 1024, '6xl': 1152, '7xl': 1280}
+
+@functools.lru_cache(maxsize=4)
+def read_image_manifest(path, mtime_ns, size):
+    """Parse the image manifest; cached per file version"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def load_image_manifest(path=IMAGE_MANIFEST):
+    """Responsive image variants keyed by source path, or {} if none were built"""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return {}
+    return read_image_manifest(path, st.st_mtime_ns, st.st_size)
+
+def image_sizes(ancestors):
+    """Infer a sizes attribute from the grid and max-width containers around an image
+
+    `ancestors` holds the class lists of the enclosing elements, outermost
+    first. The innermost grid sets the columns per breakpoint and the
+    innermost max-w-* container caps the slot width.
+    """
+    columns = None
+    cap = None
+    for classes in reversed(ancestors):
+        for name in classes:
+            match = re.fullmatch(r'max-w-(\w+)', name)
+            if cap is None and match and match.group(1) in MAX_WIDTHS:
+                cap = MAX_WIDTHS[match.group(1)]
+        if columns is None:
+            grid = {}
+            for name in classes:
+                match = re.fullmatch(r'(?:(\w+):)?grid-cols-(\d+)', name)
+                if match and (match.group(1) or '') in SCREENS.keys() | {''}:
+                    grid[SCREENS.get(match.group(1), 0)] = int(match.group(2))
+            if grid:
+                columns = {0: 1, **grid}
+    columns = columns or {0: 1}
+
+    def columns_at(width):
+        return columns[max(bp for bp in columns if bp <= width)]
+
+    conditions = [(bp, f'{round(100 / count)}vw') for bp, count in columns.items()
+                  if bp and (cap is None or bp < cap)]
+    if cap:
+        conditions.append((cap, f'{round(cap / columns_at(cap))}px'))
+
+    # Keep only breakpoints where the slot width actually changes
+    current = f'{round(100 / columns[0])}vw'
+    kept = []
+    for bp, value in sorted(conditions):
+        if value != current:
+            kept.append(f'(min-width: {bp}px) {value}')
+            current = value
+    return ', '.join(kept[::-1] + [f'{round(100 / columns[0])}vw'])
+
+def sized_img(img_tag, dimensions):
+    """Add intrinsic width/height attributes to an <img> that has neither"""
+    attributes = dict(TAG_ATTRIBUTE.findall(img_tag))
+    if not dimensions or 'width' in attributes or 'height' in attributes:
+        return img_tag
+    return img_tag[:-1].rstrip('/ ') + f' width="{dimensions[0]}" height="{dimensions[1]}">'
+
+def with_placeholder(tag, placeholder):
+    """Paint an image placeholder as the background of a container tag"""
+    style = (f'background-image:url({placeholder});'
+             'background-size:cover;background-position:center')
+    match = re.search(r'\sstyle="([^"]*)"', tag)
+    if match:
+        existing = match.group(1).rstrip().rstrip(';')
+        return tag[:match.start(1)] + (existing + ';' if existing else '') + style + tag[match.end(1):]
+    return tag[:-1] + f' style="{style}">'
+
+def picture_html(img_tag, entry, sizes, indent):
+    """Wrap an <img> in a <picture> offering its AVIF/WebP variants"""
+    lines = ['<picture>']
+    for fmt, mime in IMAGE_FORMATS:
+        variants = entry['variants'].get(fmt)
+        if variants:
+            srcset = ', '.join(f'{v["file"]} {v["width"]}w' for v in variants)
+            lines.append(f'{indent}  <source type="{mime}" srcset="{srcset}" sizes="{sizes}">')
+    lines.append(f'{indent}  {img_tag}')
+    lines.append(f'{indent}</picture>')
+    return '\n'.join(lines)
+
+def responsive_images(html):
+    """Size local <img> tags and rewrite those with generated variants into <picture> elements
+
+    Intrinsic sizes come from the header-only image index, so no image is
+    decoded. The low-quality placeholder of an image, when built, becomes
+    the background of its aspect-video container so the first frame shows
+    a preview instead of a blank box.
+    """
+    import image_index
+    if '<img' not in html:
+        return html
+    manifest = load_image_manifest()
+
+    stack = []
+    parts = []
+    painted = set()
+    position = 0
+    for match in MARKUP_TAG.finditer(html):
+        closing, name, attributes = match.group(1), match.group(2).lower(), match.group(3)
+        if closing:
+            # Pop back to the matching element, tolerating unclosed children
+            for i in range(len(stack) - 1, -1, -1):
+                if stack[i].name == name:
+                    del stack[i:]
+                    break
+        elif name == 'img':
+            src = dict(TAG_ATTRIBUTE.findall(attributes)).get('src', '')
+            if not src.startswith(image_index.IMAGE_DIR + '/'):
+                continue
+            img_tag = sized_img(match.group(0), image_index.image_dimensions(src))
+            entry = manifest.get(src) or {}
+            in_picture = any(element.name == 'picture' for element in stack)
+            if entry.get('variants') and not in_picture:
+                line_start = html.rfind('\n', 0, match.start()) + 1
+                indent = html[line_start:match.start()]
+                indent = indent if not indent.strip() else ''
+                sizes = image_sizes([element.classes for element in stack])
+                img_tag = picture_html(img_tag, entry, sizes, indent)
+            container = next((element for element in reversed(stack)
+                              if 'aspect-video' in element.classes), None)
+            if entry.get('placeholder') and container and container.part not in painted:
+                parts[container.part] = with_placeholder(parts[container.part], entry['placeholder'])
+                painted.add(container.part)
+            parts.append(html[position:match.start()])
+            parts.append(img_tag)
+            position = match.end()
+        elif name not in VOID_ELEMENTS and not attributes.rstrip().endswith('/'):
+            classes = dict(TAG_ATTRIBUTE.findall(attributes)).get('class', '').split()
+            part = None
+            if 'aspect-video' in classes:
+                # Keep container tags as separate parts so a placeholder can be added later
+                parts.append(html[position:match.start()])
+                parts.append(match.group(0))
+                part = len(parts) - 1
+                position = match.end()
+            stack.append(OpenElement(name, classes, part))
+    parts.append(html[position:])
+    return ''.join(parts)
+
+# styles.css rules the top of the page needs are inlined (see critical_css.py)
+# and the full stylesheet is loaded without blocking rendering
+STYLESHEET_LINKS = '''<style>{css}</style>
+  <link rel="preload" href="styles.css" as="style" onload="this.onload=null;this.rel='stylesheet'">
+  <noscript><link rel="stylesheet" href="styles.css"></noscript>'''
+
+def stylesheet_html(page_file, breadcrumbs, content):
+    """Inline critical CSS for the header, breadcrumbs and first section, plus the async stylesheet"""
+    import critical_css
+    fragment = HEAD + HEADER + breadcrumbs + critical_css.first_section(content)
+    return STYLESHEET_LINKS.format(css=critical_css.critical_css(page_file, fragment))
+
+# Build manifest used to skip pages whose inputs have not changed
+MANIFEST_FILE = '.build-manifest.json'
+MANIFEST_VERSION = 1
+
+def generator_source():
+    """This script's source without the page table
+
+    Each page's content is part of its own hash, so editing one page's
+    copy must not change the hash every page shares.
+    """
+    with open(os.path.abspath(__file__), 'r', encoding='utf-8') as f:
+        source = f.read()
+    lines = source.splitlines(keepends=True)
+    for node in ast.parse(source).body:
+        if isinstance(node, ast.FunctionDef) and node.name == 'get_pages':
+            first = min([node.lineno] + [decorator.lineno for decorator in node.decorator_list])
+            del lines[first - 1:node.end_lineno]
+            break
+    return ''.join(lines)
+
+def shared_inputs_hash():
+    """Hash the generator code, its icon set, the stylesheet and the image data shared by every page"""
+    import critical_css
+    import image_index
+    digest = hashlib.sha256()
+    digest.update(generator_source().encode('utf-8'))
+    digest.update(b'\0')
+    for template in (HEAD, HEADER, FOOTER):
+        digest.update(template.encode('utf-8'))
+        digest.update(b'\0')
+    digest.update(json.dumps(load_icons(), sort_keys=True).encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(critical_css.read_stylesheet()[1].encode('ascii'))
+    digest.update(b'\0')
+    digest.update(json.dumps(load_image_manifest(), sort_keys=True).encode('utf-8'))
+    digest.update(b'\0')
+    dimensions = {path: (entry['width'], entry['height'])
+                  for path, entry in image_index.build_index().items()}
+    digest.update(json.dumps(dimensions, sort_keys=True).encode('utf-8'))
+    return digest.hexdigest()
+
+def page_inputs_hash(page_file, page_data, shared_hash):
+    """Hash everything a single page is rendered from"""
+    digest = hashlib.sha256()
+    digest.update(shared_hash.encode('ascii'))
+    digest.update(page_file.encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(page_breadcrumbs(page_file, page_data).encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(json.dumps(page_data, sort_keys=True).encode('utf-8'))
+    return digest.hexdigest()
+
+def load_manifest(path=MANIFEST_FILE):
+    """Load page hashes from the previous build"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get('version') != MANIFEST_VERSION:
+        return {}
+    return manifest.get('pages', {})
+
+def save_manifest(page_hashes, path=MANIFEST_FILE):
+    """Record page hashes for the next build"""
+    manifest = {'version': MANIFEST_VERSION, 'pages': page_hashes}
+    data = json.dumps(manifest, indent=2, sort_keys=True) + '\n'
+    write_atomic(path, [data.encode('utf-8')])
+
+def write_atomic(path, chunks):
+    """Write byte chunks to path through a temp file and rename
+
+    The chunks go out in a single writev() where available, and the rename
+    means readers (and a crashed build) only ever see the old or new file.
+    The data is fsynced before the rename, and the directory after it, so a
+    power loss cannot persist the rename without the contents.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(path) + '.')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            if hasattr(os, 'writev'):
+                remaining = [chunk for chunk in chunks if chunk]
+                while remaining:
+                    written = os.writev(fd, remaining)
+                    # Drop fully written chunks and trim a partially written one
+                    while remaining and written >= len(remaining[0]):
+                        written -= len(remaining.pop(0))
+                    if written:
+                        remaining[0] = memoryview(remaining[0])[written:]
+            else:
+                f.writelines(chunks)
+                f.flush()
+            os.fsync(fd)
+        os.chmod(tmp_path, file_mode(path))
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    fsync_directory(directory)
+
+def fsync_directory(directory):
+    """Flush a directory entry change (a rename) to disk where the OS allows it"""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return  # e.g. Windows, where directories cannot be opened
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+def file_matches(path, chunks):
+    """Whether path already holds exactly these bytes, comparing sizes first"""
+    try:
+        if os.path.getsize(path) != sum(len(chunk) for chunk in chunks):
+            return False
+        with open(path, 'rb') as f:
+            return f.read() == b''.join(chunks)
+    except FileNotFoundError:
+        return False
+
+def file_mode(path):
+    """Permissions for a rewritten file: keep the old ones, else honour the umask"""
+    try:
+        return os.stat(path).st_mode & 0o777
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+def __getattr__(name):
+    """Keep PAGES available as a module attribute without building it on import"""
+    if name == 'PAGES':
+        return get_pages()
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+# Scripts a page loads after app.js, each only where the page content
+# matches its pattern; minify.py bundles each distinct list into one file
+PAGE_SCRIPTS = (
+    ('form-validation.js', re.compile(r'<form\b', re.IGNORECASE)),
+    ('contact-form.js', re.compile(r'\bid="contactForm"')),
+    ('newsletter.js', re.compile(r'\bclass="[^"]*\bnewsletter-form\b')),
+    ('lazy-images.js', re.compile(r'<img\b[^>]*\bdata-src=', re.IGNORECASE)),
+    ('background-video.js', re.compile(r'\bid="drillRigVideo"')),
+)
+
+def script_tags(content):
+    """Script tags for app.js and the modules the page content uses"""
+    scripts = ['app.js'] + [name for name, pattern in PAGE_SCRIPTS if pattern.search(content)]
+    return ''.join(f'  <script src="{name}"></script>\n' for name in scripts)
+
+def compile_template(template):
+    """Split a str.format template into static byte segments and slot names"""
+    segments = []
+    for literal, field, _spec, _conversion in string.Formatter().parse(template):
+        if literal:
+            segments.append(literal.encode('utf-8'))
+        if field is not None:
+            segments.append(field)
+    return segments
+
+@functools.lru_cache(maxsize=None)
+def page_layout():
+    """Compile the full page once into static byte segments and slot names
+
+    HEAD is the only format template; HEADER and FOOTER are emitted verbatim
+    apart from FOOTER's {scripts} slot, and adjacent static parts are
+    merged, so a page is six slots between a handful of prebuilt byte
+    strings.
+    """
+    footer_start, footer_end = inline_icons(FOOTER).split('{scripts}')
+    parts = compile_template(HEAD) + [
+        inline_icons(HEADER).encode('utf-8'), 'breadcrumbs', 'content',
+        footer_start.encode('utf-8'), 'scripts', footer_end.encode('utf-8')
+    ]
+    layout = []
+    for part in parts:
+        if isinstance(part, bytes) and layout and isinstance(layout[-1], bytes):
+            layout[-1] += part
+        else:
+            layout.append(part)
+    return tuple(layout)
+
+def render_chunks(page_file, page_data):
+    """Render a page to a list of byte chunks ready for writev()"""
+    breadcrumbs = inline_icons(page_breadcrumbs(page_file, page_data))
+    content = responsive_images(inline_icons(page_data['content']))
+    slots = {
+        'title': page_data['title'],
+        'description': page_data['description'],
+        'page': page_file,
+        'stylesheet': stylesheet_html(page_file, breadcrumbs, content),
+        'breadcrumbs': breadcrumbs,
+        'content': content,
+        'scripts': script_tags(content),
+    }
+    return [part if isinstance(part, bytes) else slots[part].encode('utf-8')
+            for part in page_layout()]
+
+def render_page(page_file):
+    """Render a page by name to UTF-8 bytes without touching disk"""
+    for name, page_data in iter_pages():
+        if name == page_file:
+            return b''.join(render_chunks(page_file, page_data))
+    raise KeyError(page_file)
+
+def render_all():
+    """Render every page to a dict of name -> UTF-8 bytes"""
+    return {page_file: b''.join(render_chunks(page_file, page_data))
+            for page_file, page_data in iter_pages()}
+
+def render_timed(page):
+    """Render a (page_file, page_data) pair and return its chunks, build_report metrics and critical CSS cache entry"""
+    import build_report
+    import critical_css
+    page_file, page_data = page
+    started = build_report.start()
+    chunks = render_chunks(page_file, page_data)
+    metrics = build_report.finish(started, bytes_in=len(page_data['content'].encode('utf-8')),
+                                  bytes_out=sum(len(chunk) for chunk in chunks))
+    return page_file, chunks, metrics, critical_css.cache_entry(page_file)
+
+def current_page_hashes():
+    """Hash the inputs of every page as they are now"""
+    shared_hash = shared_inputs_hash()
+    return {page_file: page_inputs_hash(page_file, page_data, shared_hash)
+            for page_file, page_data in iter_pages()}
+
+def imap_bounded(executor, fn, items, window):
+    """Like executor.map(), but with at most `window` tasks in flight
+
+    Results are yielded in submission order while `items` is consumed
+    lazily, so a long stream of pages never sits in memory at once.
+    """
+    pending = collections.deque()
+    for item in items:
+        pending.append(executor.submit(fn, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+def generate(jobs=1, only=None):
+    """Render every changed page, optionally across worker processes"""
+    import build_report
+    import critical_css
+    previous_hashes = load_manifest()
+    shared_hash = shared_inputs_hash()
+    page_hashes = {}
+
+    def stale_pages():
+        for page_file, page_data in iter_pages():
+            page_hash = page_inputs_hash(page_file, page_data, shared_hash)
+            if only and page_file not in only:
+                # Keep the previous record so the page is still rebuilt next time
+                if page_file in previous_hashes:
+                    page_hashes[page_file] = previous_hashes[page_file]
+                continue
+            page_hashes[page_file] = page_hash
+            if previous_hashes.get(page_file) == page_hash and os.path.exists(page_file):
+                print(f'Unchanged {page_file}')
+                build_report.record_file('pages', page_file, build_report.cached(
+                    len(page_data['content'].encode('utf-8')), os.path.getsize(page_file)))
+            else:
+                yield page_file, page_data
+
+    start = time.perf_counter()
+    rendered = written = 0
+    critical_entries = {}
+    with ProcessPoolExecutor(max_workers=jobs) if jobs > 1 else contextlib.nullcontext() as executor:
+        if executor:
+            # Results come back in submission order, so files are written in
+            # page order no matter which worker finishes first
+            results = imap_bounded(executor, render_timed, stale_pages(), jobs * 4)
+        else:
+            results = map(render_timed, stale_pages())
+
+        for page_file, chunks, metrics, critical_entry in results:
+            critical_entries[page_file] = critical_entry
+            rendered += 1
+            build_report.record_file('pages', page_file, metrics)
+            # A shared input can change without changing this page's output;
+            # leave the file (and its mtime) alone then
+            if file_matches(page_file, chunks):
+                print(f'Unchanged output {page_file} ({metrics["wall_seconds"] * 1000:.2f} ms)')
+                continue
+            write_atomic(page_file, chunks)
+            written += 1
+            print(f'Created {page_file} ({metrics["wall_seconds"] * 1000:.2f} ms)')
+
+    if not only:
+        # Pages that are no longer generated, e.g. a deleted collection item
+        for page_file in sorted(previous_hashes.keys() - page_hashes.keys()):
+            if os.path.exists(page_file):
+                os.remove(page_file)
+                print(f'Removed {page_file}')
+
+    write_sprite()
+    save_manifest(page_hashes)
+    critical_css.save_cache(critical_entries, page_hashes)
+    print(f'Rendered {rendered} of {len(page_hashes)} pages ({written} written) in '
+          f'{(time.perf_counter() - start) * 1000:.1f} ms')
+
+# Files that trigger a rebuild check in --watch mode, besides this script
+WATCH_FILES = ('styles.css', '*.js', 'content/*/*.json', IMAGE_MANIFEST)
+
+def watched_files():
+    """List the generator and the assets watched for changes"""
+    paths = [os.path.abspath(__file__)]
+    for pattern in WATCH_FILES:
+        paths.extend(sorted(glob.glob(pattern)))
+    return paths
+
+def file_signatures(paths):
+    """Map each path to its (mtime_ns, size), or None if it is missing"""
+    signatures = {}
+    for path in paths:
+        try:
+            st = os.stat(path)
+            signatures[path] = (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            signatures[path] = None
+    return signatures
+
+def load_generator(path):
+    """Execute a fresh copy of the generator from disk"""
+    spec = importlib.util.spec_from_file_location('create_pages_live', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def watch(interval=0.05):
+    """Poll the generator and assets, re-rendering only pages whose inputs changed
+
+    The running generator keeps its page table and compiled layout in
+    memory; an edit to this script swaps in a freshly executed copy, and a
+    copy that fails to load is reported and ignored until the next save.
+    A rebuild that fails, e.g. on a half-saved content file, is reported
+    the same way and retried on the next change.
+    """
+    import critical_css
+    generate()
+    generator = sys.modules[__name__]
+    page_hashes = generator.current_page_hashes()
+    signatures = file_signatures(watched_files())
+    failed = None  # signatures a rebuild last failed on
+    print(f'Watching {len(signatures)} files for changes (Ctrl+C to stop)')
+
+    try:
+        while True:
+            time.sleep(interval)
+            latest = file_signatures(watched_files())
+            if latest == failed:
+                continue
+            changed = [path for path in latest if latest[path] != signatures.get(path)]
+            if not changed:
+                continue
+            start = time.perf_counter()
+
+            if os.path.abspath(__file__) in changed:
+                try:
+                    generator = load_generator(os.path.abspath(__file__))
+                except Exception as exc:
+                    print(f'✗ Keeping previous templates, reload failed: {exc!r}')
+                    signatures = latest
+                    continue
+
+            try:
+                new_hashes = generator.current_page_hashes()
+                stale = [page_file for page_file, page_hash in new_hashes.items()
+                         if page_hashes.get(page_file) != page_hash]
+                stale_set = set(stale)
+                for page_file, page_data in generator.iter_pages():
+                    if page_file in stale_set:
+                        chunks = generator.render_chunks(page_file, page_data)
+                        if not generator.file_matches(page_file, chunks):
+                            generator.write_atomic(page_file, chunks)
+                if stale:
+                    generator.save_manifest(new_hashes)
+                    critical_css.save_cache({}, new_hashes)
+                generator.write_sprite()
+            except Exception as exc:
+                # e.g. a half-saved content file; keep the previous state so
+                # the pages are retried on the next change
+                print(f'✗ Rebuild failed, retrying on the next change: {exc!r}')
+                failed = latest
+                continue
+            page_hashes = new_hashes
+            signatures = latest
+
+            elapsed = (time.perf_counter() - start) * 1000
+            # Measured from the newest save, so polling delay is included
+            saved_at = max((latest[path][0] for path in changed if latest[path]), default=0)
+            since_save = (time.time_ns() - saved_at) / 1e6 if saved_at else elapsed
+            names = ', '.join(os.path.basename(path) for path in changed)
+            if stale:
+                rebuilt = ', '.join(stale) if len(stale) <= 5 else f'{len(stale)} pages'
+                print(f'{names} changed: rebuilt {rebuilt} in {elapsed:.1f} ms '
+                      f'({since_save:.1f} ms after save)')
+            else:
+                print(f'{names} changed: no pages affected ({elapsed:.1f} ms)')
+    except KeyboardInterrupt:
+        print('\nStopped watching')
+
+def benchmark(count=5000):
+    """Compare format-and-concatenate rendering with precompiled segments
+
+    Renders and writes a synthetic corpus of `count` pages (the real pages
+    repeated under new names) through both paths and checks the output is
+    byte-identical.
+    """
+    pages = list(iter_pages())
+    corpus = [(f'bench-{i:05d}-{pages[i % len(pages)][0]}', pages[i % len(pages)][1])
+              for i in range(count)]
+
+    def legacy_render(page_file, page_data):
+        # Content and breadcrumbs are processed once, as in render_chunks(),
+        # so only the templating differs between the two paths
+        breadcrumbs = inline_icons(page_breadcrumbs(page_file, page_data))
+        content = responsive_images(inline_icons(page_data['content']))
+        return HEAD.format(
+            title=page_data['title'],
+            description=page_data['description'],
+            page=page_file,
+            stylesheet=stylesheet_html(page_file, breadcrumbs, content)
+        ) + inline_icons(HEADER) + breadcrumbs + content \
+            + inline_icons(FOOTER.replace('{scripts}', script_tags(content)))
+
+    def legacy_write(path, content):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+
+    compiled_render = render_chunks
+    compiled_write = write_atomic
+
+    page_layout()  # compile outside the timed region, as a real build would reuse it
+    render_all()  # likewise the critical CSS analysis, which pages share by content
+    print(f'Benchmark: {count:,} synthetic pages')
+    timings = {}
+    out_dirs = {}
+    for label, render_fn, write_fn in (('format + concat', legacy_render, legacy_write),
+                                       ('compiled segments', compiled_render, compiled_write)):
+        start = time.perf_counter()
+        for page_file, page_data in corpus:
+            render_fn(page_file, page_data)
+        render_time = time.perf_counter() - start
+
+        out_dirs[label] = tempfile.mkdtemp(prefix='create-pages-bench-')
+        start = time.perf_counter()
+        for page_file, page_data in corpus:
+            write_fn(os.path.join(out_dirs[label], page_file), render_fn(page_file, page_data))
+        timings[label] = (render_time, time.perf_counter() - start)
+        print(f'  {label:<18} render {render_time * 1000:8.1f} ms '
+              f'({render_time / count * 1e6:5.1f} us/page)   '
+              f'render + write {timings[label][1] * 1000:8.1f} ms')
+
+    try:
+        legacy_dir, compiled_dir = out_dirs.values()
+        for page_file, _page_data in corpus:
+            with open(os.path.join(legacy_dir, page_file), 'rb') as a, \
+                    open(os.path.join(compiled_dir, page_file), 'rb') as b:
+                if a.read() != b.read():
+                    raise SystemExit(f'Output mismatch for {page_file}')
+    finally:
+        for out_dir in out_dirs.values():
+            shutil.rmtree(out_dir)
+
+    (legacy_render_time, legacy_total), (compiled_render_time, compiled_total) = timings.values()
+    print(f'  Speedup: render {legacy_render_time / compiled_render_time:.2f}x, '
+          f'render + write {legacy_total / compiled_total:.2f}x, output identical')
+
+def main():
+    """Main function"""
+    import build_report
+    parser = argparse.ArgumentParser(description='Generate website pages from templates')
+    parser.add_argument('pages', nargs='*', metavar='PAGE',
+                        help='only generate these pages (default: all)')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='number of worker processes (0 = one per CPU)')
+    parser.add_argument('--watch', action='store_true',
+                        help='keep running and rebuild affected pages when sources change')
+    parser.add_argument('--benchmark', type=int, nargs='?', const=5000, metavar='N',
+                        help='compare rendering paths on N synthetic pages (default 5000) and exit')
+    parser.add_argument('--report', metavar='FILE',
+                        help='write per-page timing, memory and byte counts as JSON (see build_report.py)')
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark(args.benchmark)
+        return
+    if args.watch:
+        watch()
+        return
+
+    known = {page_file for page_file, _page_data in iter_pages()}
+    unknown = [name for name in args.pages if name not in known]
+    if unknown:
+        parser.error(f'unknown page(s): {", ".join(unknown)}')
+
+    with build_report.stage('pages'):
+        generate(jobs=args.jobs or os.cpu_count() or 1, only=set(args.pages))
+    if args.report:
+        build_report.write_report(args.report)
 
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Critical CSS extraction
+Selects the styles.css rules that can apply to the top of a page (the
+header, breadcrumbs and first content section) so create-pages.py can
+inline them in the page head and load the full stylesheet asynchronously.
+
+Rules are matched as in css_purge.py, against the above-the-fold markup
+plus the SAFELIST classes scripts add at runtime (e.g. the light theme).
+Results are cached per page in .critical-css.json, keyed by a hash of the
+stylesheet and that markup, so a page is only analysed again when either
+changes.
+
+    python critical_css.py    # list the cached pages and their critical CSS sizes
+"""
+
+import functools
+import hashlib
+import json
+import os
+import re
+
+import css_minify
+import css_purge
+
+STYLESHEET = 'styles.css'
+CACHE_FILE = '.critical-css.json'
+CACHE_VERSION = 1
+
+SECTION_TAG = re.compile(r'<(/?)section\b[^>]*>', re.IGNORECASE)
+
+def first_section(content):
+    """The page content up to the end of its first <section> (all of it if there is none)"""
+    depth = 0
+    for match in SECTION_TAG.finditer(content):
+        depth += -1 if match.group(1) else 1
+        if depth == 0:
+            return content[:match.end()]
+    return content
+
+@functools.lru_cache(maxsize=256)
+def extract(css, fragment):
+    """Minified rules of a stylesheet that can apply to the elements in an HTML fragment"""
+    used = {'tags': set(css_purge.ALWAYS_PRESENT), 'classes': set(), 'ids': set()}
+    css_purge.scan_markup(fragment, used)
+    nodes = css_minify.parse(css)
+    css_purge.purge_rules(nodes, used, [])
+    css_purge.purge_keyframes(nodes, css_purge.animation_names(nodes), [])
+    return css_minify.minify(css_minify.serialize(nodes))
+
+_stylesheet = None  # (signature, text, hash)
+
+def read_stylesheet(path=STYLESHEET):
+    """Text and hash of the stylesheet, re-read only when its mtime or size changes"""
+    global _stylesheet
+    st = os.stat(path)
+    signature = (path, st.st_mtime_ns, st.st_size)
+    if _stylesheet is None or _stylesheet[0] != signature:
+        with open(path, 'r', encoding='utf-8') as f:
+            text = f.read()
+        _stylesheet = (signature, text, hashlib.sha256(text.encode('utf-8')).hexdigest())
+    return _stylesheet[1], _stylesheet[2]
+
+def load_cache(cache_file=CACHE_FILE):
+    """Load the cached critical CSS per page, or an empty cache if it is missing or outdated"""
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if cache.get('version') != CACHE_VERSION:
+        return {}
+    return cache.get('pages', {})
+
+_cache = None
+
+def critical_css(page_file, fragment):
+    """Critical CSS for a page whose above-the-fold markup is fragment"""
+    global _cache
+    if _cache is None:
+        _cache = load_cache()
+    css, stylesheet_hash = read_stylesheet()
+    key = hashlib.sha256((stylesheet_hash + '\0' + fragment).encode('utf-8')).hexdigest()
+    entry = _cache.get(page_file)
+    if not entry or entry['hash'] != key:
+        entry = {'hash': key, 'css': extract(css, fragment)}
+        _cache[page_file] = entry
+    return entry['css']
+
+def cache_entry(page_file):
+    """The cache entry critical_css() used for a page in this process, if any"""
+    return (_cache or {}).get(page_file)
+
+def save_cache(entries, pages, cache_file=CACHE_FILE):
+    """Merge new entries (e.g. from worker processes) and keep only the given pages"""
+    global _cache
+    if _cache is None:
+        _cache = load_cache(cache_file)
+    _cache.update((page, entry) for page, entry in entries.items() if entry)
+    pages = set(pages)
+    _cache = {page: entry for page, entry in _cache.items() if page in pages}
+    if _cache == load_cache(cache_file):
+        return
+    tmp_file = cache_file + '.tmp'
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump({'version': CACHE_VERSION, 'pages': _cache}, f, indent=2, sort_keys=True)
+        f.write('\n')
+    os.replace(tmp_file, cache_file)
+
+def main():
+    """Main function"""
+    cache = load_cache()
+    print("=" * 60)
+    print(f"Critical CSS: {len(cache)} pages cached ({CACHE_FILE})")
+    print("=" * 60)
+    if os.path.exists(STYLESHEET):
+        full = len(css_minify.minify(read_stylesheet()[0]))
+        print(f"  {full:>6,} bytes  {STYLESHEET} (minified)")
+    for page, entry in sorted(cache.items()):
+        print(f"  {len(entry['css']):>6,} bytes  {page}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,645 @@
+#!/usr/bin/env python3
+"""
+CSS minifier used by minify.py
+A tokenizer that keeps strings, url() and escapes intact, a parser that
+builds the rules and at-rules of a stylesheet, and these optimizations:
+
+  - whitespace and comments are dropped
+  - colors are written in their shortest form (#ffffff -> #fff)
+  - numbers lose redundant zeros (0.50s -> .5s)
+  - adjacent @media/@supports blocks with the same condition are merged
+  - rules with the same selector in the same block are merged
+  - declarations overridden later in the same rule are dropped
+  - adjacent rules with identical declarations are merged
+  - empty rules are dropped
+
+Rules are never moved into or out of an at-rule, so @media and @supports
+conditions apply to exactly the declarations they did, and a rule only
+moves past rules that set none of the same properties. Named colors are
+only rewritten in color properties: elsewhere, custom properties included,
+an identifier such as `white` need not be a color. Rules, at-rules and
+declarations keep their source offset, so the output can be source mapped.
+
+    python css_minify.py styles.css    # print the minified stylesheet
+    python css_minify.py --verify      # check the optimizations on VERIFY_CORPUS
+"""
+
+import collections
+import re
+import sys
+
+Token = collections.namedtuple('Token', 'type value start')
+Declaration = collections.namedtuple('Declaration', 'name value important start')
+
+class CSSSyntaxError(ValueError):
+    """Stylesheet the tokenizer or parser cannot handle"""
+
+SPACE = re.compile(r'\s+')
+WORD = re.compile(r'(?:\\.|/(?!\*)|[^\s"\'{}();:,\\/])+', re.DOTALL)
+DELIMITERS = '{}();:,'
+
+# At-rules whose block holds rules rather than declarations
+GROUPING_AT_RULES = {'@media', '@supports', '@container', '@layer', '@document',
+                     '@-moz-document', '@scope', '@starting-style'}
+
+# Spaces next to these characters are never significant
+TIGHT_AFTER = {'selector': ',>+~(', 'value': ',(', 'prelude': ',(:'}
+TIGHT_BEFORE = {'selector': ',>+~)', 'value': ',)', 'prelude': ',):'}
+
+HEX_COLOR = re.compile(r'#([0-9a-fA-F]{3,4}|[0-9a-fA-F]{6}|[0-9a-fA-F]{8})')
+NUMBER = re.compile(r'([+-]?)(\d*)(?:\.(\d+))?([a-zA-Z%]*)')
+
+# Named colors and hex colors that have a shorter spelling
+NAMED_TO_HEX = {'white': '#fff', 'black': '#000', 'yellow': '#ff0', 'fuchsia': '#f0f',
+                'magenta': '#f0f', 'aqua': '#0ff', 'cyan': '#0ff'}
+HEX_TO_NAME = {
+    '#f00': 'red', '#808080': 'gray', '#800000': 'maroon', '#800080': 'purple',
+    '#008000': 'green', '#808000': 'olive', '#000080': 'navy', '#008080': 'teal',
+    '#c0c0c0': 'silver', '#ffa500': 'orange', '#d2b48c': 'tan', '#f0ffff': 'azure',
+    '#f5f5dc': 'beige', '#ffe4c4': 'bisque', '#a52a2a': 'brown', '#ff7f50': 'coral',
+    '#ffd700': 'gold', '#4b0082': 'indigo', '#fffff0': 'ivory', '#f0e68c': 'khaki',
+    '#faf0e6': 'linen', '#da70d6': 'orchid', '#cd853f': 'peru', '#ffc0cb': 'pink',
+    '#dda0dd': 'plum', '#fa8072': 'salmon', '#a0522d': 'sienna', '#fffafa': 'snow',
+    '#ff6347': 'tomato', '#ee82ee': 'violet', '#f5deb3': 'wheat',
+}
+
+# Properties where a bare identifier such as `white` can only be a color
+COLOR_PROPERTY_PREFIXES = ('color', 'background', 'border', 'outline', 'box-shadow',
+                           'text-shadow', 'text-decoration', 'column-rule', 'fill',
+                           'stroke', 'caret-color', 'accent-color')
+
+# Functions every browser understands, so a later declaration using only
+# these cannot be a fallback that the earlier one stands in for
+SAFE_FUNCTIONS = {'rgb', 'rgba', 'hsl', 'hsla', 'url', 'calc', 'var', 'translate',
+                  'translatex', 'translatey', 'scale', 'rotate', 'repeat', 'minmax',
+                  'cubic-bezier', 'linear-gradient', 'radial-gradient'}
+
+# Shorthands that set properties outside their own name family
+SHORTHAND_FAMILIES = {
+    'font': {'line'},
+    'inset': {'top', 'right', 'bottom', 'left'},
+    'place': {'align', 'justify'},
+    'gap': {'row', 'column', 'grid'},
+    'columns': {'column'},
+    'inline': {'width'},
+    'block': {'height'},
+}
+
+# Pseudo-classes and pseudo-elements every browser knows; a selector list
+# with one the browser does not know would drop the whole merged rule
+SAFE_PSEUDOS = {'hover', 'focus', 'active', 'visited', 'link', 'first-child',
+                'last-child', 'first-of-type', 'last-of-type', 'nth-child',
+                'nth-of-type', 'not', 'checked', 'disabled', 'root', 'before', 'after'}
+PSEUDO = re.compile(r'(?<!\\)::?([\w-]+)')
+
+def scan_string(source, pos):
+    """End position of the string literal starting at pos"""
+    quote = source[pos]
+    pos += 1
+    while pos < len(source):
+        ch = source[pos]
+        if ch == '\\':
+            pos += 2
+        elif ch == quote:
+            return pos + 1
+        elif ch == '\n':
+            raise CSSSyntaxError(f"unterminated string at offset {pos}")
+        else:
+            pos += 1
+    raise CSSSyntaxError("unterminated string at end of input")
+
+def scan_url(source, pos):
+    """End position of an unquoted url( ... ) whose contents start at pos"""
+    end = source.find(')', pos)
+    if end < 0:
+        raise CSSSyntaxError(f"unterminated url() at offset {pos}")
+    return end + 1
+
+def tokenize(source):
+    """Split a stylesheet into tokens; comments are kept so callers can drop them"""
+    tokens = []
+    pos = 0
+    while pos < len(source):
+        ch = source[pos]
+        if ch.isspace():
+            tokens.append(Token('space', ' ', pos))
+            pos = SPACE.match(source, pos).end()
+        elif source.startswith('/*', pos):
+            end = source.find('*/', pos + 2)
+            if end < 0:
+                raise CSSSyntaxError(f"unterminated comment at offset {pos}")
+            tokens.append(Token('comment', source[pos:end + 2], pos))
+            pos = end + 2
+        elif ch in '"\'':
+            end = scan_string(source, pos)
+            tokens.append(Token('string', source[pos:end], pos))
+            pos = end
+        elif ch in DELIMITERS:
+            tokens.append(Token(ch, ch, pos))
+            pos += 1
+        elif ch == '@':
+            match = WORD.match(source, pos + 1)
+            if not match:
+                raise CSSSyntaxError(f"stray '@' at offset {pos}")
+            tokens.append(Token('at', '@' + match.group(0), pos))
+            pos = match.end()
+        else:
+            match = WORD.match(source, pos)
+            if not match:
+                raise CSSSyntaxError(f"unexpected {ch!r} at offset {pos}")
+            word = match.group(0)
+            start = pos
+            pos = match.end()
+            if word.lower() == 'url' and source.startswith('(', pos):
+                inner = SPACE.match(source, pos + 1)
+                contents = inner.end() if inner else pos + 1
+                if not source.startswith(('"', "'"), contents):
+                    end = scan_url(source, contents)
+                    tokens.append(Token('url', 'url(' + source[contents:end - 1].strip() + ')', start))
+                    pos = end
+                    continue
+            tokens.append(Token('word', word, start))
+    return tokens
+
+def join(tokens, context):
+    """Text of tokens with comments dropped and only significant spaces kept"""
+    parts = []
+    pending_space = False
+    for token in tokens:
+        if token.type == 'comment':
+            continue
+        if token.type == 'space':
+            pending_space = bool(parts)
+            continue
+        if pending_space:
+            previous = parts[-1]
+            escaped = len(previous) > 1 and previous[-2] == '\\'
+            if not (previous[-1] in TIGHT_AFTER[context] and not escaped
+                    or token.value[0] in TIGHT_BEFORE[context]):
+                parts.append(' ')
+            pending_space = False
+        parts.append(token.value)
+    return ''.join(parts)
+
+def skip_space(tokens, pos):
+    """Position of the next token that is not a space or comment"""
+    while pos < len(tokens) and tokens[pos].type in ('space', 'comment'):
+        pos += 1
+    return pos
+
+def read_prelude(tokens, pos):
+    """Tokens up to the next '{', ';' or '}' outside parentheses, and the position after them"""
+    start = pos
+    depth = 0
+    while pos < len(tokens):
+        kind = tokens[pos].type
+        if kind == '(':
+            depth += 1
+        elif kind == ')':
+            depth -= 1
+        elif depth <= 0 and kind in '{;}':
+            break
+        pos += 1
+    return tokens[start:pos], pos
+
+def parse_rules(tokens, pos, top=False):
+    """Rules and at-rules up to the closing '}' (or the end of the stylesheet)"""
+    nodes = []
+    while True:
+        pos = skip_space(tokens, pos)
+        if pos == len(tokens):
+            if not top:
+                raise CSSSyntaxError("unclosed block at end of input")
+            return nodes, pos
+        token = tokens[pos]
+        if token.type == '}':
+            if top:
+                raise CSSSyntaxError("unmatched '}'")
+            return nodes, pos + 1
+        if token.type == 'at':
+            node, pos = parse_at_rule(tokens, pos)
+            nodes.append(node)
+            continue
+        start = token.start
+        selector, pos = read_prelude(tokens, pos)
+        selector = join(selector, 'selector')
+        if pos == len(tokens) or tokens[pos].type != '{':
+            raise CSSSyntaxError(f"expected '{{' after {selector!r}")
+        declarations, pos = parse_declarations(tokens, pos + 1)
+        nodes.append({'type': 'rule', 'selector': selector, 'declarations': declarations,
+                      'start': start})
+
+def parse_at_rule(tokens, pos):
+    """An at-rule, with its block parsed as rules or declarations"""
+    name = tokens[pos].value.lower()
+    start = tokens[pos].start
+    prelude, pos = read_prelude(tokens, pos + 1)
+    node = {'type': 'at', 'name': name, 'prelude': join(prelude, 'prelude'),
+            'rules': None, 'declarations': None, 'start': start}
+    if pos == len(tokens) or tokens[pos].type == '}':
+        raise CSSSyntaxError(f"unterminated {name}")
+    if tokens[pos].type == ';':
+        return node, pos + 1
+    if name in GROUPING_AT_RULES or name.endswith('keyframes'):
+        node['rules'], pos = parse_rules(tokens, pos + 1)
+    else:
+        node['declarations'], pos = parse_declarations(tokens, pos + 1)
+    return node, pos
+
+def strip_space(value):
+    """Value tokens without leading and trailing spaces"""
+    while value and value[0].type == 'space':
+        value = value[1:]
+    while value and value[-1].type == 'space':
+        value = value[:-1]
+    return value
+
+def parse_declarations(tokens, pos):
+    """Declarations up to the closing '}'"""
+    declarations = []
+    while True:
+        pos = skip_space(tokens, pos)
+        if pos == len(tokens):
+            raise CSSSyntaxError("unclosed declaration block at end of input")
+        token = tokens[pos]
+        if token.type == '}':
+            return declarations, pos + 1
+        if token.type == ';':
+            pos += 1
+            continue
+        if token.type != 'word':
+            raise CSSSyntaxError(f"expected a property name, found {token.value!r}")
+        name = token.value
+        pos = skip_space(tokens, pos + 1)
+        if pos == len(tokens) or tokens[pos].type != ':':
+            raise CSSSyntaxError(f"expected ':' after {name!r} (nested rules are not supported)")
+        value, pos = read_prelude(tokens, pos + 1)
+        if pos < len(tokens) and tokens[pos].type == '{':
+            raise CSSSyntaxError(f"unexpected '{{' in the value of {name!r}")
+        value = strip_space([t for t in value if t.type != 'comment'])
+        important = False
+        if value and value[-1].type == 'word' and value[-1].value.lower().endswith('!important'):
+            important = True
+            rest = value[-1].value[:-len('!important')]
+            value = strip_space(value[:-1] + ([value[-1]._replace(value=rest)] if rest else []))
+        declarations.append(Declaration(name, value, important, token.start))
+
+def parse(source):
+    """Parse a stylesheet into a list of rule and at-rule nodes"""
+    return parse_rules(tokenize(source), 0, top=True)[0]
+
+def declaration_text(declaration):
+    """A declaration as it is written out"""
+    value = join(declaration.value, 'value')
+    if not value and declaration.name.startswith('--'):
+        value = ' '  # an empty custom property needs its space
+    return declaration.name + ':' + value + ('!important' if declaration.important else '')
+
+def serialize(nodes, mappings=None):
+    """Write rule and at-rule nodes out as minified CSS
+
+    If `mappings` is a list, (output offset, source offset, None) is
+    appended for every rule, at-rule and declaration, for source_map.build().
+    """
+    if mappings is None:
+        return ''.join(write_nodes(nodes))
+    out = []
+    length = 0
+    for text, start in write_nodes(nodes, mapped=True):
+        if start is not None:
+            mappings.append((length, start, None))
+        out.append(text)
+        length += len(text)
+    return ''.join(out)
+
+def write_nodes(nodes, mapped=False):
+    """Output text of nodes, as (text, source offset or None) pairs when `mapped`"""
+    def piece(text, start=None):
+        return (text, start) if mapped else text
+
+    def body(declarations):
+        yield piece('{')
+        for k, declaration in enumerate(declarations):
+            if k:
+                yield piece(';')
+            yield piece(declaration_text(declaration), declaration.start)
+        yield piece('}')
+
+    for node in nodes:
+        if node['type'] == 'rule':
+            yield piece(node['selector'], node['start'])
+            yield from body(node['declarations'])
+            continue
+        yield piece(node['name'] + (' ' + node['prelude'] if node['prelude'] else ''), node['start'])
+        if node['rules'] is not None:
+            yield piece('{')
+            yield from write_nodes(node['rules'], mapped)
+            yield piece('}')
+        elif node['declarations'] is not None:
+            yield from body(node['declarations'])
+        else:
+            yield piece(';')
+
+def all_declaration_lists(nodes, keyframes=True):
+    """Every declaration list in the tree, with the node that holds it"""
+    for node in nodes:
+        if node['type'] == 'rule' or node['declarations'] is not None:
+            yield node
+        elif node['rules'] is not None and (keyframes or not node['name'].endswith('keyframes')):
+            yield from all_declaration_lists(node['rules'], keyframes)
+
+def rule_lists(nodes):
+    """The top-level rule list and every grouping at-rule's, keyframes excluded"""
+    yield nodes
+    for node in nodes:
+        if node['type'] == 'at' and node['rules'] is not None and not node['name'].endswith('keyframes'):
+            yield from rule_lists(node['rules'])
+
+def shortest_hex(value):
+    """#aabbcc -> #abc where possible, lowercased"""
+    digits = value[1:].lower()
+    if len(digits) in (6, 8) and all(digits[i] == digits[i + 1] for i in range(0, len(digits), 2)):
+        digits = digits[::2]
+    return '#' + digits
+
+def rgb_to_hex(args):
+    """#hex for rgb()/rgba() arguments that are 0-255 integers, with no alpha or alpha 1"""
+    items = [t for t in args if t.type != 'space']
+    if len(items) % 2 == 0 or any(t.type != (',' if k % 2 else 'word') for k, t in enumerate(items)):
+        return None
+    parts = [t.value for t in items[::2]]
+    if len(parts) == 4 and parts[3] in ('1', '1.0', '100%'):
+        parts = parts[:3]
+    if len(parts) != 3 or not all(p.isdigit() and int(p) <= 255 for p in parts):
+        return None
+    return shortest_hex('#' + ''.join(f'{int(p):02x}' for p in parts))
+
+def shorten_colors(nodes):
+    """Write every color in its shortest form"""
+    for node in all_declaration_lists(nodes):
+        declarations = node['declarations']
+        for index, declaration in enumerate(declarations):
+            named = declaration.name.lower().startswith(COLOR_PROPERTY_PREFIXES)
+            value = []
+            tokens = declaration.value
+            i = 0
+            while i < len(tokens):
+                token = tokens[i]
+                if token.type == 'word':
+                    text = token.value
+                    if HEX_COLOR.fullmatch(text):
+                        text = shortest_hex(text)
+                        text = HEX_TO_NAME.get(text, text)
+                    elif named and text.lower() in NAMED_TO_HEX:
+                        text = NAMED_TO_HEX[text.lower()]
+                    elif (text.lower() in ('rgb', 'rgba') and i + 1 < len(tokens)
+                          and tokens[i + 1].type == '('):
+                        close = next((j for j in range(i + 2, len(tokens))
+                                      if tokens[j].type == ')'), None)
+                        color = close and rgb_to_hex(tokens[i + 2:close])
+                        if color:
+                            value.append(token._replace(value=HEX_TO_NAME.get(color, color)))
+                            i = close + 1
+                            continue
+                    token = token._replace(value=text)
+                value.append(token)
+                i += 1
+            declarations[index] = declaration._replace(value=value)
+
+def shorten_number(text):
+    """0.50s -> .5s, 10.0 -> 10; anything that is not a plain number is returned as-is"""
+    match = NUMBER.fullmatch(text)
+    if not match or not (match.group(2) or match.group(3)):
+        return text
+    sign, integer, fraction, unit = match.groups()
+    integer = integer.lstrip('0')
+    fraction = (fraction or '').rstrip('0')
+    if not integer and not fraction:
+        return '0' + unit
+    return sign + integer + ('.' + fraction if fraction else '') + unit
+
+def shorten_numbers(nodes):
+    """Drop leading and trailing zeros from numbers"""
+    for node in all_declaration_lists(nodes):
+        declarations = node['declarations']
+        for index, declaration in enumerate(declarations):
+            value = [t._replace(value=shorten_number(t.value)) if t.type == 'word' else t
+                     for t in declaration.value]
+            declarations[index] = declaration._replace(value=value)
+
+def merge_at_rules(nodes):
+    """Merge adjacent @media/@supports (etc.) blocks with the same condition"""
+    for rules in rule_lists(nodes):
+        merged = []
+        for node in rules:
+            previous = merged[-1] if merged else None
+            if (previous and node['type'] == 'at' and previous['type'] == 'at'
+                    and node['name'] in GROUPING_AT_RULES and node['name'] != '@layer'
+                    and (node['name'], node['prelude']) == (previous['name'], previous['prelude'])
+                    and node['rules'] is not None and previous['rules'] is not None):
+                previous['rules'].extend(node['rules'])
+                continue
+            merged.append(node)
+        rules[:] = merged
+
+def property_family(name):
+    """Name family used to decide whether two properties can affect each other"""
+    name = name.lower()
+    if name.startswith('--'):
+        return name
+    return re.sub(r'^-[a-z]+-', '', name).split('-')[0]
+
+def related(first, second):
+    """Whether setting one property can change the other"""
+    a, b = property_family(first), property_family(second)
+    return (a == b or 'all' in (a, b) or b in SHORTHAND_FAMILIES.get(a, ())
+            or a in SHORTHAND_FAMILIES.get(b, ()))
+
+def conflicts(declarations, nodes):
+    """Whether any rule in nodes sets a property related to one in declarations"""
+    names = {d.name for d in declarations}
+    for node in all_declaration_lists(nodes):
+        for other in node['declarations']:
+            if any(related(name, other.name) for name in names):
+                return True
+    return False
+
+def merge_duplicate_selectors(nodes):
+    """Merge rules with the same selector in the same block
+
+    The later rule's declarations move up into the earlier one, or the
+    earlier rule's down into the later one, only if no rule in between
+    sets a related property.
+    """
+    for rules in rule_lists(nodes):
+        merged = []
+        last = {}
+        for node in rules:
+            if node['type'] != 'rule':
+                merged.append(node)
+                continue
+            index = last.get(node['selector'])
+            if index is not None:
+                earlier = merged[index]
+                between = [n for n in merged[index + 1:] if n is not None]
+                if not conflicts(node['declarations'], between):
+                    earlier['declarations'].extend(node['declarations'])
+                    continue
+                if not conflicts(earlier['declarations'], between):
+                    node['declarations'][:0] = earlier['declarations']
+                    merged[index] = None
+            last[node['selector']] = len(merged)
+            merged.append(node)
+        rules[:] = [n for n in merged if n is not None]
+
+def is_safe_fallback_free(declaration):
+    """Whether a value uses nothing an older browser might reject"""
+    for i, token in enumerate(declaration.value):
+        if token.type != 'word':
+            continue
+        if re.match(r'-[a-z]+-', token.value.lower()):
+            return False
+        following = declaration.value[i + 1] if i + 1 < len(declaration.value) else None
+        if following and following.type == '(' and token.value.lower() not in SAFE_FUNCTIONS:
+            return False
+    return True
+
+def drop_overridden(nodes):
+    """Drop declarations that a later one for the same property always overrides"""
+    for node in all_declaration_lists(nodes):
+        declarations = node['declarations']
+        dropped = set()
+        for i, earlier in enumerate(declarations):
+            for j in range(i + 1, len(declarations)):
+                later = declarations[j]
+                if j in dropped or later.name.lower() != earlier.name.lower():
+                    continue
+                if earlier.important and not later.important:
+                    winner, loser = i, j
+                else:
+                    winner, loser = j, i
+                same = join(earlier.value, 'value') == join(later.value, 'value')
+                # A vendor-prefixed loser (display:-webkit-box before
+                # display:flex) is the fallback for browsers that reject the winner
+                if same or (is_safe_fallback_free(declarations[winner])
+                            and is_safe_fallback_free(declarations[loser])):
+                    dropped.add(loser)
+                if loser == i:
+                    break
+        node['declarations'] = [d for k, d in enumerate(declarations) if k not in dropped]
+
+def mergeable_selector(selector):
+    """Whether a selector can share a selector list without risking the other rule"""
+    return all(name.lower() in SAFE_PSEUDOS for name in PSEUDO.findall(selector))
+
+def merge_identical_rules(nodes):
+    """Merge adjacent rules with identical declarations into one selector list"""
+    for rules in rule_lists(nodes):
+        merged = []
+        for node in rules:
+            previous = merged[-1] if merged else None
+            if (previous and node['type'] == 'rule' and previous['type'] == 'rule'
+                    and list(map(declaration_text, node['declarations']))
+                    == list(map(declaration_text, previous['declarations']))
+                    and mergeable_selector(node['selector'])
+                    and mergeable_selector(previous['selector'])):
+                previous['selector'] += ',' + node['selector']
+                continue
+            merged.append(node)
+        rules[:] = merged
+
+def drop_empty(nodes):
+    """Drop rules without declarations and grouping at-rules without rules"""
+    kept = []
+    for node in nodes:
+        if node['type'] == 'rule' and not node['declarations']:
+            continue
+        if node['type'] == 'at' and node['rules'] is not None and not node['name'].endswith('keyframes'):
+            drop_empty(node['rules'])
+            if not node['rules']:
+                continue
+        kept.append(node)
+    nodes[:] = kept
+
+TRANSFORMS = [
+    ('colors', shorten_colors),
+    ('numbers', shorten_numbers),
+    ('merged at-rules', merge_at_rules),
+    ('merged duplicate selectors', merge_duplicate_selectors),
+    ('overridden declarations', drop_overridden),
+    ('merged identical rules', merge_identical_rules),
+    ('empty rules', drop_empty),
+]
+
+def optimize(source, mappings=None):
+    """Minify a stylesheet; returns the CSS and the bytes saved by each transformation
+
+    If `mappings` is a list, it is filled as by serialize() for the result.
+    """
+    tree = parse(source)
+    css = serialize(tree)
+    savings = {'whitespace and comments': len(source) - len(css)}
+    for number, (name, transform) in enumerate(TRANSFORMS, 1):
+        transform(tree)
+        optimized = serialize(tree, mappings if number == len(TRANSFORMS) else None)
+        savings[name] = len(css) - len(optimized)
+        css = optimized
+    return css, savings
+
+def minify(source, mappings=None):
+    """Minify a stylesheet"""
+    return optimize(source, mappings)[0]
+
+# ---------------------------------------------------------------------------
+# Verification
+# ---------------------------------------------------------------------------
+
+# Stylesheets and the exact output they must minify to: each optimization,
+# and the fallbacks and boundaries they must leave alone
+VERIFY_CORPUS = [
+    ('a { color: #ffffff; transition: opacity 0.50s } /* note */', 'a{color:#fff;transition:opacity .5s}'),
+    ('a{color:red;color:blue}', 'a{color:blue}'),
+    ('a{color:red!important;color:blue}', 'a{color:red!important}'),
+    ('a{display:block;display:flex}', 'a{display:flex}'),
+    ('a{display:-webkit-box;display:flex}', 'a{display:-webkit-box;display:flex}'),
+    ('a{background:-webkit-linear-gradient(red,blue);background:linear-gradient(red,blue)}',
+     'a{background:-webkit-linear-gradient(red,blue);background:linear-gradient(red,blue)}'),
+    ('a{width:10px}b{margin:0}a{width:20px}', 'a{width:20px}b{margin:0}'),
+    ('a{margin:0}b{margin-top:1px}a{margin:2px}', 'a{margin:0}b{margin-top:1px}a{margin:2px}'),
+    ('@media (min-width:1px){a{color:red}}@media (min-width:1px){b{color:red}}',
+     '@media (min-width:1px){a,b{color:red}}'),
+    ('a{--accent:white;content:"#ffffff  0.50"}', 'a{--accent:white;content:"#ffffff  0.50"}'),
+]
+
+def verify():
+    """Check every VERIFY_CORPUS stylesheet minifies to its expected output
+
+    Returns the number of failures.
+    """
+    failures = 0
+    for number, (source, expected) in enumerate(VERIFY_CORPUS, 1):
+        actual = minify(source)
+        if actual != expected:
+            failures += 1
+            print(f"  ✗ corpus case {number}: {source!r}\n"
+                  f"    expected: {expected!r}\n"
+                  f"    actual:   {actual!r}")
+    print(f"  {len(VERIFY_CORPUS)} CSS corpus cases checked, {failures} failure(s)")
+    return failures
+
+def main():
+    """Main function"""
+    if sys.argv[1:] == ['--verify']:
+        print("=" * 60)
+        print("Verifying CSS minifier")
+        print("=" * 60)
+        sys.exit(1 if verify() else 0)
+    for path in sys.argv[1:]:
+        with open(path, 'r', encoding='utf-8') as f:
+            css, savings = optimize(f.read())
+        print(css)
+        for name, saved in savings.items():
+            print(f"  {name}: {saved:,} bytes", file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
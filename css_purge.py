@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Unused CSS purge
+Drops the rules of styles.css whose selectors cannot match anything in the
+generated pages or in the markup and class names the scripts add at runtime,
+and writes what is left to styles.purged.css, which minify.py then uses in
+place of styles.css.
+
+A selector is kept when every compound in it could match on its own: its
+element, classes and ids all occur somewhere. Pseudo-classes, attribute
+selectors and combinators are ignored, so the purge only ever keeps too
+much. Class names the scripts build at runtime are kept through SAFELIST.
+
+    python create-pages.py && python css_purge.py && python minify.py
+"""
+
+import fnmatch
+import re
+import sys
+from pathlib import Path
+
+import css_minify
+import js_minify
+
+STYLESHEET = 'styles.css'
+OUTPUT_FILE = 'styles.purged.css'
+
+# Files scanned for elements, classes and ids in use
+CONTENT_GLOBS = ('*.html', '*.js')
+
+# Classes added by scripts in ways the scan cannot see (fnmatch patterns):
+# the theme classes on <html>, the back-to-top button state, scroll and
+# lazy-loading animation states, and the contact form's busy state
+SAFELIST = ('light-theme', 'dark-theme', 'visible', 'back-to-top', 'fade-in',
+            'slide-in', 'lazy-*', 'loading')
+
+# Selectors for these always match a page
+ALWAYS_PRESENT = {'html', 'body', 'head'}
+
+MARKUP_TAG = re.compile(r'''<([a-zA-Z][\w-]*)((?:[^>"']|"[^"]*"|'[^']*')*)>''')
+TAG_ATTRIBUTE = re.compile(r'''([\w-]+)\s*=\s*(?:"([^"]*)"|'([^']*)')''')
+INLINE_SCRIPT = re.compile(r'<script\b[^>]*>(.*?)</script\s*>', re.DOTALL | re.IGNORECASE)
+WORD = re.compile(r'[A-Za-z_-][\w:/.-]*')
+PSEUDO = re.compile(r'::?[\w-]+')
+
+def scan_markup(html, used):
+    """Add the elements, classes and ids of an HTML fragment to `used`"""
+    for name, attributes in MARKUP_TAG.findall(html):
+        used['tags'].add(name.lower())
+        for attribute, double, single in TAG_ATTRIBUTE.findall(attributes):
+            value = double or single
+            if attribute.lower() == 'class':
+                used['classes'].update(value.split())
+            elif attribute.lower() == 'id':
+                used['ids'].add(value.strip())
+
+def script_strings(source):
+    """Contents of the string and template literals of a script"""
+    try:
+        tokens = js_minify.tokenize(source)
+    except js_minify.JSSyntaxError:
+        return [''.join(m) for m in re.findall(r'''"([^"\n]*)"|'([^'\n]*)'|`([^`]*)`''', source)]
+    return [t.value for t in tokens if t.type in ('string', 'template')]
+
+def scan_script(source, used):
+    """Add everything a script could use as an element, class or id to `used`
+
+    Markup in strings is scanned as markup; every other word in a string
+    could be a class name (classList.add('visible')) or a selector part.
+    """
+    for text in script_strings(source):
+        scan_markup(text, used)
+        for word in WORD.findall(text):
+            for part in re.split(r'[.#]', word):
+                used['classes'].add(part)
+                used['ids'].add(part)
+                used['tags'].add(part.lower())
+
+def scan_content(paths):
+    """Elements, classes and ids used by the given pages and scripts"""
+    used = {'tags': set(ALWAYS_PRESENT), 'classes': set(), 'ids': set()}
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        if Path(path).suffix == '.js':
+            scan_script(content, used)
+        else:
+            scan_markup(content, used)
+            for script in INLINE_SCRIPT.findall(content):
+                scan_script(script, used)
+    return used
+
+def split_top_level(text, separators):
+    """Split text at separator characters outside (), [] and strings"""
+    parts = []
+    depth = 0
+    quote = None
+    start = 0
+    i = 0
+    while i < len(text):
+        ch = text[i]
+        if ch == '\\':
+            i += 2
+            continue
+        if quote:
+            if ch == quote:
+                quote = None
+        elif ch in '"\'':
+            quote = ch
+        elif ch in '([':
+            depth += 1
+        elif ch in ')]':
+            depth -= 1
+        elif depth == 0 and ch in separators:
+            parts.append(text[start:i])
+            start = i + 1
+        i += 1
+    parts.append(text[start:])
+    return [part for part in parts if part.strip()]
+
+def strip_pseudos(selector):
+    """A selector without attribute selectors and pseudo-classes/elements (and their arguments)"""
+    out = []
+    i = 0
+    while i < len(selector):
+        ch = selector[i]
+        if ch == '\\':
+            out.append(selector[i:i + 2])
+            i += 2
+        elif ch == '[' or ch == ':':
+            if ch == ':':
+                match = PSEUDO.match(selector, i)
+                i = match.end() if match else i + 1
+                if not selector.startswith('(', i):
+                    continue
+            # Skip the bracketed or parenthesized argument
+            depth = 0
+            while i < len(selector):
+                if selector[i] == '\\':
+                    i += 2
+                    continue
+                if selector[i] in '([':
+                    depth += 1
+                elif selector[i] in ')]':
+                    depth -= 1
+                    if depth == 0:
+                        i += 1
+                        break
+                i += 1
+        else:
+            out.append(ch)
+            i += 1
+    return ''.join(out)
+
+def unescape(name):
+    """CSS identifier with backslash escapes resolved (focus\\:ring -> focus:ring)"""
+    return re.sub(r'\\(.)', r'\1', name)
+
+def compound_matches(compound, used):
+    """Whether the element, classes and ids of one compound selector are all in use"""
+    tag = re.match(r'[a-zA-Z][\w-]*', compound)
+    if tag and tag.group(0).lower() not in used['tags']:
+        return False
+    for kind, name in re.findall(r'([.#])((?:\\.|[\w-])+)', compound):
+        name = unescape(name)
+        if kind == '#' and name not in used['ids']:
+            return False
+        if kind == '.' and name not in used['classes'] and not is_safelisted(name):
+            return False
+    return True
+
+def is_safelisted(class_name):
+    """Whether a class matches a SAFELIST pattern"""
+    return any(fnmatch.fnmatchcase(class_name, pattern) for pattern in SAFELIST)
+
+def selector_matches(selector, used):
+    """Whether a complex selector could match an element in the content"""
+    compounds = split_top_level(strip_pseudos(selector), ' >+~')
+    return all(compound_matches(compound, used) for compound in compounds)
+
+def animation_names(nodes):
+    """Words used in the animation properties of the given rules"""
+    names = set()
+    for node in css_minify.all_declaration_lists(nodes, keyframes=False):
+        for declaration in node['declarations']:
+            if declaration.name.lower() in ('animation', 'animation-name'):
+                names.update(t.value for t in declaration.value if t.type == 'word')
+    return names
+
+def purge_rules(nodes, used, dropped):
+    """Remove rules and selectors that match nothing; dropped selectors are appended to `dropped`"""
+    kept = []
+    for node in nodes:
+        if node['type'] == 'rule':
+            selectors = split_top_level(node['selector'], ',')
+            matching = [s for s in selectors if selector_matches(s, used)]
+            dropped.extend(s for s in selectors if s not in matching)
+            if not matching:
+                continue
+            node['selector'] = ','.join(matching)
+        elif node['rules'] is not None and not node['name'].endswith('keyframes'):
+            purge_rules(node['rules'], used, dropped)
+            if not node['rules']:
+                continue
+        kept.append(node)
+    nodes[:] = kept
+
+def purge_keyframes(nodes, names, dropped):
+    """Remove @keyframes that no remaining rule animates with"""
+    kept = []
+    for node in nodes:
+        if node['type'] == 'at' and node['rules'] is not None:
+            if node['name'].endswith('keyframes'):
+                if node['prelude'] not in names:
+                    dropped.append(f"{node['name']} {node['prelude']}")
+                    continue
+            else:
+                purge_keyframes(node['rules'], names, dropped)
+        kept.append(node)
+    nodes[:] = kept
+
+def format_stylesheet(nodes, indent=''):
+    """One rule per line, with grouping at-rules opened and closed on lines of their own"""
+    lines = []
+    for node in nodes:
+        if node['type'] == 'at' and node['rules'] is not None and not node['name'].endswith('keyframes'):
+            head = node['name'] + (' ' + node['prelude'] if node['prelude'] else '')
+            lines.append(f'{indent}{head}{{')
+            lines.extend(format_stylesheet(node['rules'], indent + '  '))
+            lines.append(f'{indent}}}')
+        else:
+            lines.append(indent + css_minify.serialize([node]))
+    return lines
+
+def purge(css, used):
+    """Purged stylesheet text and the selectors (and @keyframes) dropped from it"""
+    nodes = css_minify.parse(css)
+    dropped = []
+    purge_rules(nodes, used, dropped)
+    purge_keyframes(nodes, animation_names(nodes), dropped)
+    return '\n'.join(format_stylesheet(nodes)) + '\n', dropped
+
+def content_files():
+    """The pages and scripts scanned for elements, classes and ids"""
+    paths = []
+    for pattern in CONTENT_GLOBS:
+        paths.extend(sorted(Path('.').glob(pattern)))
+    return paths
+
+def main():
+    """Main function"""
+    print("=" * 60)
+    print("Unused CSS Purge")
+    print("=" * 60)
+    print()
+
+    paths = content_files()
+    used = scan_content(paths)
+    with open(STYLESHEET, 'r', encoding='utf-8') as f:
+        source = f.read()
+    try:
+        css, dropped = purge(source, used)
+    except css_minify.CSSSyntaxError as error:
+        print(f"✗ Cannot parse {STYLESHEET}: {error}")
+        sys.exit(1)
+
+    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
+        f.write(f'/* Purged from {STYLESHEET} by css_purge.py - do not edit */\n')
+        f.write(css)
+
+    print(f"Scanned {len(paths)} files: {len(used['tags'])} element names, "
+          f"{len(used['classes'])} class names, {len(used['ids'])} ids")
+    if dropped:
+        print(f"Dropped {len(dropped)} unused selector(s):")
+        for selector in dropped:
+            print(f"  {selector}")
+    minified = len(css_minify.minify(source))
+    purged = len(css_minify.minify(css))
+    print()
+    print(f"  {STYLESHEET}: {minified:,} bytes minified")
+    print(f"  {OUTPUT_FILE}: {purged:,} bytes minified "
+          f"({(minified - purged) / minified * 100:.1f}% smaller)")
+    print()
+    print("✓ CSS purge complete!")
+
+if __name__ == '__main__':
+    main()
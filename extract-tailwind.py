@@ -0,0 +1,683 @@
+#!/usr/bin/env python3
+"""
+Build-time Tailwind CSS extraction
+Scans the generated pages and JavaScript for the Tailwind utility classes in
+use and writes a static tailwind.css, replacing the in-browser CDN compiler
+"""
+
+import argparse
+import gzip
+import re
+from pathlib import Path
+
+OUTPUT_FILE = 'tailwind.css'
+
+# Files scanned for class names, like Tailwind's `content` setting
+CONTENT_GLOBS = ('*.html', '*.js')
+
+# Tailwind v3 default theme (the subset of the palette this site can use)
+COLORS = {
+    'slate': ['#f8fafc', '#f1f5f9', '#e2e8f0', '#cbd5e1', '#94a3b8', '#64748b',
+              '#475569', '#334155', '#1e293b', '#0f172a', '#020617'],
+    'gray': ['#f9fafb', '#f3f4f6', '#e5e7eb', '#d1d5db', '#9ca3af', '#6b7280',
+             '#4b5563', '#374151', '#1f2937', '#111827', '#030712'],
+    'red': ['#fef2f2', '#fee2e2', '#fecaca', '#fca5a5', '#f87171', '#ef4444',
+            '#dc2626', '#b91c1c', '#991b1b', '#7f1d1d', '#450a0a'],
+    'amber': ['#fffbeb', '#fef3c7', '#fde68a', '#fcd34d', '#fbbf24', '#f59e0b',
+              '#d97706', '#b45309', '#92400e', '#78350f', '#451a03'],
+    'yellow': ['#fefce8', '#fef9c3', '#fef08a', '#fde047', '#facc15', '#eab308',
+               '#ca8a04', '#a16207', '#854d0e', '#713f12', '#422006'],
+    'green': ['#f0fdf4', '#dcfce7', '#bbf7d0', '#86efac', '#4ade80', '#22c55e',
+              '#16a34a', '#15803d', '#166534', '#14532d', '#052e16'],
+    'emerald': ['#ecfdf5', '#d1fae5', '#a7f3d0', '#6ee7b7', '#34d399', '#10b981',
+                '#059669', '#047857', '#065f46', '#064e3b', '#022c22'],
+    'cyan': ['#ecfeff', '#cffafe', '#a5f3fc', '#67e8f9', '#22d3ee', '#06b6d4',
+             '#0891b2', '#0e7490', '#155e75', '#164e63', '#083344'],
+    'sky': ['#f0f9ff', '#e0f2fe', '#bae6fd', '#7dd3fc', '#38bdf8', '#0ea5e9',
+            '#0284c7', '#0369a1', '#075985', '#0c4a6e', '#082f49'],
+    'blue': ['#eff6ff', '#dbeafe', '#bfdbfe', '#93c5fd', '#60a5fa', '#3b82f6',
+             '#2563eb', '#1d4ed8', '#1e40af', '#1e3a8a', '#172554'],
+    'indigo': ['#eef2ff', '#e0e7ff', '#c7d2fe', '#a5b4fc', '#818cf8', '#6366f1',
+               '#4f46e5', '#4338ca', '#3730a3', '#312e81', '#1e1b4b'],
+}
+SHADES = ['50', '100', '200', '300', '400', '500', '600', '700', '800', '900', '950']
+SPECIAL_COLORS = {'white': '#ffffff', 'black': '#000000',
+                  'transparent': 'transparent', 'current': 'currentColor', 'inherit': 'inherit'}
+
+SPACING_STEPS = ['0', 'px', '0.5', '1', '1.5', '2', '2.5', '3', '3.5', '4', '5', '6', '7', '8',
+                 '9', '10', '11', '12', '14', '16', '20', '24', '28', '32', '36', '40', '44',
+                 '48', '52', '56', '60', '64', '72', '80', '96']
+
+SCREENS = [('sm', 640), ('md', 768), ('lg', 1024), ('xl', 1280), ('2xl', 1536)]
+
+PSEUDO_VARIANTS = {
+    'first': ':first-child', 'last': ':last-child', 'hover': ':hover',
+    'focus': ':focus', 'focus-visible': ':focus-visible', 'active': ':active',
+    'disabled': ':disabled',
+}
+
+FONT_SIZES = {
+    'xs': ('0.75rem', '1rem'), 'sm': ('0.875rem', '1.25rem'), 'base': ('1rem', '1.5rem'),
+    'lg': ('1.125rem', '1.75rem'), 'xl': ('1.25rem', '1.75rem'), '2xl': ('1.5rem', '2rem'),
+    '3xl': ('1.875rem', '2.25rem'), '4xl': ('2.25rem', '2.5rem'), '5xl': ('3rem', '1'),
+    '6xl': ('3.75rem', '1'), '7xl': ('4.5rem', '1'), '8xl': ('6rem', '1'), '9xl': ('8rem', '1'),
+}
+FONT_WEIGHTS = {'thin': '100', 'extralight': '200', 'light': '300', 'normal': '400',
+                'medium': '500', 'semibold': '600', 'bold': '700', 'extrabold': '800',
+                'black': '900'}
+LEADING = {'none': '1', 'tight': '1.25', 'snug': '1.375', 'normal': '1.5',
+           'relaxed': '1.625', 'loose': '2'}
+TRACKING = {'tighter': '-0.05em', 'tight': '-0.025em', 'normal': '0em', 'wide': '0.025em',
+            'wider': '0.05em', 'widest': '0.1em'}
+MAX_WIDTHS = {'xs': '20rem', 'sm': '24rem', 'md': '28rem', 'lg': '32rem', 'xl': '36rem',
+              '2xl': '42rem', '3xl': '48rem', '4xl': '56rem', '5xl': '64rem', '6xl': '72rem',
+              '7xl': '80rem', 'full': '100%', 'none': 'none', 'prose': '65ch'}
+RADII = {'none': '0px', 'sm': '0.125rem', '': '0.25rem', 'md': '0.375rem', 'lg': '0.5rem',
+         'xl': '0.75rem', '2xl': '1rem', '3xl': '1.5rem', 'full': '9999px'}
+GRADIENT_DIRECTIONS = {'t': 'to top', 'tr': 'to top right', 'r': 'to right',
+                       'br': 'to bottom right', 'b': 'to bottom', 'bl': 'to bottom left',
+                       'l': 'to left', 'tl': 'to top left'}
+
+TRANSFORM = ('translate(var(--tw-translate-x), var(--tw-translate-y)) rotate(var(--tw-rotate)) '
+             'skewX(var(--tw-skew-x)) skewY(var(--tw-skew-y)) '
+             'scaleX(var(--tw-scale-x)) scaleY(var(--tw-scale-y))')
+TRANSITION_TIMING = [('transition-timing-function', 'cubic-bezier(0.4, 0, 0.2, 1)'),
+                     ('transition-duration', '150ms')]
+
+# Utilities with fixed declarations, in Tailwind's plugin order
+STATIC_UTILITIES = {
+    'sr-only': [('position', 'absolute'), ('width', '1px'), ('height', '1px'), ('padding', '0'),
+                ('margin', '-1px'), ('overflow', 'hidden'), ('clip', 'rect(0, 0, 0, 0)'),
+                ('white-space', 'nowrap'), ('border-width', '0')],
+    'not-sr-only': [('position', 'static'), ('width', 'auto'), ('height', 'auto'),
+                    ('padding', '0'), ('margin', '0'), ('overflow', 'visible'),
+                    ('clip', 'auto'), ('white-space', 'normal')],
+    'static': [('position', 'static')],
+    'fixed': [('position', 'fixed')],
+    'absolute': [('position', 'absolute')],
+    'relative': [('position', 'relative')],
+    'sticky': [('position', 'sticky')],
+    'mx-auto': [('margin-left', 'auto'), ('margin-right', 'auto')],
+    'block': [('display', 'block')],
+    'inline-block': [('display', 'inline-block')],
+    'inline': [('display', 'inline')],
+    'flex': [('display', 'flex')],
+    'inline-flex': [('display', 'inline-flex')],
+    'grid': [('display', 'grid')],
+    'contents': [('display', 'contents')],
+    'hidden': [('display', 'none')],
+    'aspect-auto': [('aspect-ratio', 'auto')],
+    'aspect-square': [('aspect-ratio', '1 / 1')],
+    'aspect-video': [('aspect-ratio', '16 / 9')],
+    'h-full': [('height', '100%')],
+    'h-screen': [('height', '100vh')],
+    'min-h-screen': [('min-height', '100vh')],
+    'w-full': [('width', '100%')],
+    'w-auto': [('width', 'auto')],
+    'flex-1': [('flex', '1 1 0%')],
+    'flex-auto': [('flex', '1 1 auto')],
+    'flex-none': [('flex', 'none')],
+    'flex-shrink-0': [('flex-shrink', '0')],
+    'shrink-0': [('flex-shrink', '0')],
+    'transform': [('transform', TRANSFORM)],
+    'cursor-pointer': [('cursor', 'pointer')],
+    'cursor-not-allowed': [('cursor', 'not-allowed')],
+    'resize-none': [('resize', 'none')],
+    'resize': [('resize', 'both')],
+    'list-none': [('list-style-type', 'none')],
+    'flex-row': [('flex-direction', 'row')],
+    'flex-col': [('flex-direction', 'column')],
+    'flex-wrap': [('flex-wrap', 'wrap')],
+    'place-items-center': [('place-items', 'center')],
+    'items-start': [('align-items', 'flex-start')],
+    'items-end': [('align-items', 'flex-end')],
+    'items-center': [('align-items', 'center')],
+    'items-baseline': [('align-items', 'baseline')],
+    'items-stretch': [('align-items', 'stretch')],
+    'justify-start': [('justify-content', 'flex-start')],
+    'justify-end': [('justify-content', 'flex-end')],
+    'justify-center': [('justify-content', 'center')],
+    'justify-between': [('justify-content', 'space-between')],
+    'overflow-hidden': [('overflow', 'hidden')],
+    'overflow-auto': [('overflow', 'auto')],
+    'overflow-x-auto': [('overflow-x', 'auto')],
+    'whitespace-nowrap': [('white-space', 'nowrap')],
+    'border': [('border-width', '1px')],
+    'border-0': [('border-width', '0px')],
+    'border-2': [('border-width', '2px')],
+    'border-t': [('border-top-width', '1px')],
+    'border-b': [('border-bottom-width', '1px')],
+    'border-l': [('border-left-width', '1px')],
+    'border-r': [('border-right-width', '1px')],
+    'object-cover': [('-o-object-fit', 'cover'), ('object-fit', 'cover')],
+    'object-contain': [('-o-object-fit', 'contain'), ('object-fit', 'contain')],
+    'text-left': [('text-align', 'left')],
+    'text-center': [('text-align', 'center')],
+    'text-right': [('text-align', 'right')],
+    'uppercase': [('text-transform', 'uppercase')],
+    'lowercase': [('text-transform', 'lowercase')],
+    'capitalize': [('text-transform', 'capitalize')],
+    'italic': [('font-style', 'italic')],
+    'underline': [('text-decoration-line', 'underline')],
+    'antialiased': [('-webkit-font-smoothing', 'antialiased'),
+                    ('-moz-osx-font-smoothing', 'grayscale')],
+    'shadow': [('--tw-shadow', '0 1px 3px 0 rgb(0 0 0 / 0.1), 0 1px 2px -1px rgb(0 0 0 / 0.1)'),
+               ('box-shadow', 'var(--tw-ring-offset-shadow, 0 0 #0000), '
+                              'var(--tw-ring-shadow, 0 0 #0000), var(--tw-shadow)')],
+    'shadow-lg': [('--tw-shadow', '0 10px 15px -3px rgb(0 0 0 / 0.1), 0 4px 6px -4px rgb(0 0 0 / 0.1)'),
+                  ('box-shadow', 'var(--tw-ring-offset-shadow, 0 0 #0000), '
+                                 'var(--tw-ring-shadow, 0 0 #0000), var(--tw-shadow)')],
+    'shadow-xl': [('--tw-shadow', '0 20px 25px -5px rgb(0 0 0 / 0.1), 0 8px 10px -6px rgb(0 0 0 / 0.1)'),
+                  ('box-shadow', 'var(--tw-ring-offset-shadow, 0 0 #0000), '
+                                 'var(--tw-ring-shadow, 0 0 #0000), var(--tw-shadow)')],
+    'outline-none': [('outline', '2px solid transparent'), ('outline-offset', '2px')],
+    'backdrop-blur-sm': [('-webkit-backdrop-filter', 'blur(4px)'), ('backdrop-filter', 'blur(4px)')],
+    'backdrop-blur': [('-webkit-backdrop-filter', 'blur(8px)'), ('backdrop-filter', 'blur(8px)')],
+    'backdrop-blur-md': [('-webkit-backdrop-filter', 'blur(12px)'), ('backdrop-filter', 'blur(12px)')],
+    'transition': [('transition-property', 'color, background-color, border-color, '
+                                           'text-decoration-color, fill, stroke, opacity, box-shadow, '
+                                           'transform, filter, -webkit-backdrop-filter, backdrop-filter')]
+                  + TRANSITION_TIMING,
+    'transition-all': [('transition-property', 'all')] + TRANSITION_TIMING,
+    'transition-colors': [('transition-property', 'color, background-color, border-color, '
+                                                  'text-decoration-color, fill, stroke')]
+                         + TRANSITION_TIMING,
+    'transition-opacity': [('transition-property', 'opacity')] + TRANSITION_TIMING,
+    'transition-transform': [('transition-property', 'transform')] + TRANSITION_TIMING,
+}
+
+# Order of utility groups in the stylesheet, mirroring Tailwind's core plugin
+# order so that later groups win the same way they do with the CDN build
+GROUP_ORDER = [
+    'sr-only', 'position', 'inset', 'z-index', 'order', 'grid-column', 'margin', 'display',
+    'aspect-ratio', 'height', 'min-height', 'width', 'max-width', 'flex', 'flex-shrink',
+    'transform', 'cursor', 'resize', 'list-style', 'grid-template-columns', 'flex-direction',
+    'flex-wrap', 'place-items', 'align-items', 'justify-content', 'gap', 'space', 'overflow',
+    'white-space', 'border-radius', 'border-width', 'border-color', 'background-color',
+    'background-image', 'gradient-stops', 'object-fit', 'padding', 'text-align', 'font-size',
+    'font-weight', 'text-transform', 'font-style', 'line-height', 'letter-spacing', 'color',
+    'text-decoration', 'opacity', 'font-smoothing', 'box-shadow', 'outline', 'ring',
+    'backdrop-filter', 'transition', 'transition-duration',
+]
+
+PROPERTY_GROUPS = {
+    'position': 'position', 'inset': 'inset', 'top': 'inset', 'right': 'inset',
+    'bottom': 'inset', 'left': 'inset', 'z-index': 'z-index', 'order': 'order',
+    'grid-column': 'grid-column', 'margin': 'margin', 'margin-top': 'margin',
+    'margin-right': 'margin', 'margin-bottom': 'margin', 'margin-left': 'margin',
+    'display': 'display', 'aspect-ratio': 'aspect-ratio', 'height': 'height',
+    'min-height': 'min-height', 'width': 'width', 'max-width': 'max-width', 'flex': 'flex',
+    'flex-shrink': 'flex-shrink', 'transform': 'transform', '--tw-scale-x': 'transform',
+    'cursor': 'cursor', 'resize': 'resize', 'list-style-type': 'list-style',
+    'grid-template-columns': 'grid-template-columns', 'flex-direction': 'flex-direction',
+    'flex-wrap': 'flex-wrap', 'place-items': 'place-items', 'align-items': 'align-items',
+    'justify-content': 'justify-content', 'gap': 'gap', 'column-gap': 'gap', 'row-gap': 'gap',
+    'overflow': 'overflow', 'overflow-x': 'overflow', 'white-space': 'white-space',
+    'border-radius': 'border-radius', 'border-width': 'border-width',
+    'border-top-width': 'border-width', 'border-bottom-width': 'border-width',
+    'border-left-width': 'border-width', 'border-right-width': 'border-width',
+    'border-color': 'border-color', 'background-color': 'background-color',
+    'background-image': 'background-image', '--tw-gradient-from': 'gradient-stops',
+    '--tw-gradient-to': 'gradient-stops', '-o-object-fit': 'object-fit',
+    'padding': 'padding', 'padding-top': 'padding', 'padding-right': 'padding',
+    'padding-bottom': 'padding', 'padding-left': 'padding', 'text-align': 'text-align',
+    'font-size': 'font-size', 'font-weight': 'font-weight', 'text-transform': 'text-transform',
+    'font-style': 'font-style', 'line-height': 'line-height', 'letter-spacing': 'letter-spacing',
+    'color': 'color', 'text-decoration-line': 'text-decoration', 'opacity': 'opacity',
+    '-webkit-font-smoothing': 'font-smoothing', '--tw-shadow': 'box-shadow',
+    'outline': 'outline', '--tw-ring-offset-shadow': 'ring', '--tw-ring-color': 'ring',
+    '-webkit-backdrop-filter': 'backdrop-filter', 'transition-property': 'transition',
+    'transition-duration': 'transition-duration',
+}
+
+SHORTHANDS = ('inset', 'margin', 'padding', 'gap', 'border-width')
+
+# Marker classes that only take part in variant selectors; feather-* classes
+# are hooks on the icons create-pages.py inlines
+MARKER_CLASSES = {'group'}
+
+PREFLIGHT = """*,::before,::after{box-sizing:border-box;border-width:0;border-style:solid;border-color:#e5e7eb}
+::before,::after{--tw-content:''}
+html,:host{line-height:1.5;-webkit-text-size-adjust:100%;-moz-tab-size:4;tab-size:4;font-family:ui-sans-serif,system-ui,sans-serif,"Apple Color Emoji","Segoe UI Emoji","Segoe UI Symbol","Noto Color Emoji";font-feature-settings:normal;font-variation-settings:normal;-webkit-tap-highlight-color:transparent}
+body{margin:0;line-height:inherit}
+hr{height:0;color:inherit;border-top-width:1px}
+abbr:where([title]){-webkit-text-decoration:underline dotted;text-decoration:underline dotted}
+h1,h2,h3,h4,h5,h6{font-size:inherit;font-weight:inherit}
+a{color:inherit;text-decoration:inherit}
+b,strong{font-weight:bolder}
+code,kbd,samp,pre{font-family:ui-monospace,SFMono-Regular,Menlo,Monaco,Consolas,"Liberation Mono","Courier New",monospace;font-feature-settings:normal;font-variation-settings:normal;font-size:1em}
+small{font-size:80%}
+sub,sup{font-size:75%;line-height:0;position:relative;vertical-align:baseline}
+sub{bottom:-0.25em}
+sup{top:-0.5em}
+table{text-indent:0;border-color:inherit;border-collapse:collapse}
+button,input,optgroup,select,textarea{font-family:inherit;font-feature-settings:inherit;font-variation-settings:inherit;font-size:100%;font-weight:inherit;line-height:inherit;letter-spacing:inherit;color:inherit;margin:0;padding:0}
+button,select{text-transform:none}
+button,input:where([type='button']),input:where([type='reset']),input:where([type='submit']){-webkit-appearance:button;background-color:transparent;background-image:none}
+:-moz-focusring{outline:auto}
+:-moz-ui-invalid{box-shadow:none}
+progress{vertical-align:baseline}
+::-webkit-inner-spin-button,::-webkit-outer-spin-button{height:auto}
+[type='search']{-webkit-appearance:textfield;outline-offset:-2px}
+::-webkit-search-decoration{-webkit-appearance:none}
+::-webkit-file-upload-button{-webkit-appearance:button;font:inherit}
+summary{display:list-item}
+blockquote,dl,dd,h1,h2,h3,h4,h5,h6,hr,figure,p,pre{margin:0}
+fieldset{margin:0;padding:0}
+legend{padding:0}
+ol,ul,menu{list-style:none;margin:0;padding:0}
+dialog{padding:0}
+textarea{resize:vertical}
+input::placeholder,textarea::placeholder{opacity:1;color:#9ca3af}
+button,[role="button"]{cursor:pointer}
+:disabled{cursor:default}
+img,svg,video,canvas,audio,iframe,embed,object{display:block;vertical-align:middle}
+img,video{max-width:100%;height:auto}
+[hidden]{display:none}
+*,::before,::after,::backdrop{--tw-translate-x:0;--tw-translate-y:0;--tw-rotate:0;--tw-skew-x:0;--tw-skew-y:0;--tw-scale-x:1;--tw-scale-y:1;--tw-ring-inset: ;--tw-ring-offset-width:0px;--tw-ring-offset-color:#fff;--tw-ring-color:rgb(59 130 246 / 0.5);--tw-ring-offset-shadow:0 0 #0000;--tw-ring-shadow:0 0 #0000;--tw-shadow:0 0 #0000}
+"""
+
+def spacing(step):
+    """Resolve a spacing scale step such as '4' or '0.5' to a CSS length"""
+    if step == 'px':
+        return '1px'
+    if step == '0':
+        return '0px'
+    if step in SPACING_STEPS:
+        return f'{float(step) / 4:g}rem'
+    return None
+
+def arbitrary(value):
+    """Unwrap an arbitrary value like [1.02], turning underscores into spaces"""
+    if value.startswith('[') and value.endswith(']'):
+        return value[1:-1].replace('_', ' ')
+    return None
+
+def hex_to_rgb(value):
+    """Convert #rgb or #rrggbb to an 'r g b' triple"""
+    value = value.lstrip('#')
+    if len(value) == 3:
+        value = ''.join(c * 2 for c in value)
+    return ' '.join(str(int(value[i:i + 2], 16)) for i in (0, 2, 4))
+
+def resolve_color(name):
+    """Resolve 'cyan-400', 'white/10' or '[#0b1220]/80' to a CSS color, or None"""
+    alpha = None
+    if '/' in name and not name.endswith(']'):
+        name, opacity = name.rsplit('/', 1)
+        if not opacity.isdigit():
+            return None
+        alpha = int(opacity) / 100
+
+    value = arbitrary(name)
+    if value is None:
+        if name in SPECIAL_COLORS:
+            value = SPECIAL_COLORS[name]
+        elif '-' in name:
+            family, shade = name.rsplit('-', 1)
+            if family not in COLORS or shade not in SHADES:
+                return None
+            value = COLORS[family][SHADES.index(shade)]
+        else:
+            return None
+    elif not re.fullmatch(r'#[0-9a-fA-F]{3}|#[0-9a-fA-F]{6}', value):
+        return None
+
+    if alpha is None or not value.startswith('#'):
+        return value
+    return f'rgb({hex_to_rgb(value)} / {alpha:g})'
+
+def utility_declarations(utility):
+    """Return the (property, value) declarations for a bare utility, or None"""
+    if utility in STATIC_UTILITIES:
+        return STATIC_UTILITIES[utility]
+
+    negative = utility.startswith('-')
+    name = utility[1:] if negative else utility
+
+    match = re.fullmatch(r'(inset|top|right|bottom|left)-(.+)', name)
+    if match:
+        value = spacing(match.group(2)) or arbitrary(match.group(2))
+        if value is None:
+            return None
+        value = f'-{value}' if negative else value
+        return [(match.group(1), value)]
+
+    match = re.fullmatch(r'([mp])([xytrbl]?)-(.+)', name)
+    if match and (match.group(1) == 'm' or not negative):
+        value = spacing(match.group(3)) or arbitrary(match.group(3))
+        if value is None:
+            return None
+        value = f'-{value}' if negative else value
+        prop = 'margin' if match.group(1) == 'm' else 'padding'
+        sides = {'': [''], 'x': ['-left', '-right'], 'y': ['-top', '-bottom'],
+                 't': ['-top'], 'r': ['-right'], 'b': ['-bottom'], 'l': ['-left']}
+        return [(prop + side, value) for side in sides[match.group(2)]]
+
+    if negative:
+        return None
+
+    match = re.fullmatch(r'z-(\d+|auto)', name)
+    if match:
+        return [('z-index', match.group(1))]
+
+    match = re.fullmatch(r'order-(\d+|first|last|none)', name)
+    if match:
+        value = {'first': '-9999', 'last': '9999', 'none': '0'}.get(match.group(1), match.group(1))
+        return [('order', value)]
+
+    match = re.fullmatch(r'col-span-(\d+|full)', name)
+    if match:
+        if match.group(1) == 'full':
+            return [('grid-column', '1 / -1')]
+        return [('grid-column', f'span {match.group(1)} / span {match.group(1)}')]
+
+    match = re.fullmatch(r'aspect-(\[.+\])', name)
+    if match:
+        return [('aspect-ratio', arbitrary(match.group(1)))]
+
+    match = re.fullmatch(r'([hw])-(.+)', name)
+    if match:
+        value = spacing(match.group(2)) or arbitrary(match.group(2))
+        if value is None:
+            return None
+        return [({'h': 'height', 'w': 'width'}[match.group(1)], value)]
+
+    match = re.fullmatch(r'max-w-(.+)', name)
+    if match and match.group(1) in MAX_WIDTHS:
+        return [('max-width', MAX_WIDTHS[match.group(1)])]
+
+    match = re.fullmatch(r'scale-(\d+|\[.+\])', name)
+    if match:
+        value = arbitrary(match.group(1)) or f'{int(match.group(1)) / 100:g}'
+        return [('--tw-scale-x', value), ('--tw-scale-y', value), ('transform', TRANSFORM)]
+
+    match = re.fullmatch(r'grid-cols-(\d+)', name)
+    if match:
+        return [('grid-template-columns', f'repeat({match.group(1)}, minmax(0, 1fr))')]
+
+    match = re.fullmatch(r'gap-([xy]-)?(.+)', name)
+    if match:
+        value = spacing(match.group(2))
+        if value is None:
+            return None
+        prop = {'': 'gap', 'x-': 'column-gap', 'y-': 'row-gap'}[match.group(1) or '']
+        return [(prop, value)]
+
+    match = re.fullmatch(r'rounded(?:-(.+))?', name)
+    if match and (match.group(1) or '') in RADII:
+        return [('border-radius', RADII[match.group(1) or ''])]
+
+    match = re.fullmatch(r'text-(.+)', name)
+    if match:
+        if match.group(1) in FONT_SIZES:
+            size, line_height = FONT_SIZES[match.group(1)]
+            return [('font-size', size), ('line-height', line_height)]
+        color = resolve_color(match.group(1))
+        return [('color', color)] if color else None
+
+    match = re.fullmatch(r'font-(.+)', name)
+    if match and match.group(1) in FONT_WEIGHTS:
+        return [('font-weight', FONT_WEIGHTS[match.group(1)])]
+
+    match = re.fullmatch(r'leading-(.+)', name)
+    if match and match.group(1) in LEADING:
+        return [('line-height', LEADING[match.group(1)])]
+
+    match = re.fullmatch(r'tracking-(.+)', name)
+    if match and match.group(1) in TRACKING:
+        return [('letter-spacing', TRACKING[match.group(1)])]
+
+    match = re.fullmatch(r'border-(.+)', name)
+    if match:
+        color = resolve_color(match.group(1))
+        return [('border-color', color)] if color else None
+
+    match = re.fullmatch(r'bg-gradient-to-(\w+)', name)
+    if match and match.group(1) in GRADIENT_DIRECTIONS:
+        direction = GRADIENT_DIRECTIONS[match.group(1)]
+        return [('background-image', f'linear-gradient({direction}, var(--tw-gradient-stops))')]
+
+    match = re.fullmatch(r'bg-(.+)', name)
+    if match:
+        value = arbitrary(match.group(1))
+        if value and re.match(r'(linear|radial|conic)-gradient\(|url\(', value):
+            return [('background-image', value)]
+        color = resolve_color(match.group(1))
+        return [('background-color', color)] if color else None
+
+    match = re.fullmatch(r'from-(.+)', name)
+    if match:
+        color = resolve_color(match.group(1))
+        if not color:
+            return None
+        fade = 'rgb(255 255 255 / 0)' if color == 'transparent' else re.sub(
+            r'rgb\((\d+ \d+ \d+) / [\d.]+\)', r'rgb(\1 / 0)',
+            color if color.startswith('rgb') else f'rgb({hex_to_rgb(color)} / 0)')
+        return [('--tw-gradient-from', color), ('--tw-gradient-to', fade),
+                ('--tw-gradient-stops', 'var(--tw-gradient-from), var(--tw-gradient-to)')]
+
+    match = re.fullmatch(r'to-(.+)', name)
+    if match:
+        color = resolve_color(match.group(1))
+        return [('--tw-gradient-to', color)] if color else None
+
+    match = re.fullmatch(r'opacity-(\d+)', name)
+    if match:
+        return [('opacity', f'{int(match.group(1)) / 100:g}')]
+
+    match = re.fullmatch(r'duration-(\d+)', name)
+    if match:
+        return [('transition-duration', f'{match.group(1)}ms')]
+
+    match = re.fullmatch(r'ring(?:-(\d+))?', name)
+    if match:
+        width = match.group(1) or '3'
+        return [('--tw-ring-offset-shadow', 'var(--tw-ring-inset) 0 0 0 var(--tw-ring-offset-width) '
+                                            'var(--tw-ring-offset-color)'),
+                ('--tw-ring-shadow', f'var(--tw-ring-inset) 0 0 0 calc({width}px + '
+                                     'var(--tw-ring-offset-width)) var(--tw-ring-color)'),
+                ('box-shadow', 'var(--tw-ring-offset-shadow), var(--tw-ring-shadow), '
+                               'var(--tw-shadow, 0 0 #0000)')]
+
+    match = re.fullmatch(r'ring-(.+)', name)
+    if match:
+        color = resolve_color(match.group(1))
+        return [('--tw-ring-color', color)] if color else None
+
+    return None
+
+def split_variants(class_name):
+    """Split 'md:hover:bg-white/10' into (['md', 'hover'], 'bg-white/10')"""
+    parts = []
+    depth = 0
+    current = ''
+    for char in class_name:
+        if char == '[':
+            depth += 1
+        elif char == ']':
+            depth -= 1
+        if char == ':' and depth == 0:
+            parts.append(current)
+            current = ''
+        else:
+            current += char
+    return parts, current
+
+def escape_class(class_name):
+    """Escape a class name for use in a CSS selector"""
+    escaped = ''
+    for i, char in enumerate(class_name):
+        if char.isalnum() and char.isascii() or char in '-_':
+            if i == 0 and char.isdigit():
+                escaped += f'\\{ord(char):x} '
+            else:
+                escaped += char
+        else:
+            escaped += '\\' + char
+    return escaped
+
+def shorthand_rank(declarations):
+    """Order p-4 before px-4 before pt-4 so the more specific side wins"""
+    if declarations[0][0] in SHORTHANDS:
+        return 0
+    return 1 if len(declarations) == 2 and declarations[0][1] == declarations[1][1] else 2
+
+def build_rule(class_name):
+    """Turn a candidate class into (sort_key, media, css) or None if it is not a utility"""
+    variants, utility = split_variants(class_name)
+    declarations = utility_declarations(utility)
+    if not declarations:
+        return None
+
+    screen = None
+    pseudos = ''
+    group_hover = False
+    for variant in variants:
+        if variant in dict(SCREENS) and screen is None:
+            screen = variant
+        elif variant in PSEUDO_VARIANTS:
+            pseudos += PSEUDO_VARIANTS[variant]
+        elif variant == 'group-hover':
+            group_hover = True
+        else:
+            return None
+
+    selector = '.' + escape_class(class_name) + pseudos
+    if group_hover:
+        selector = '.group:hover ' + selector
+    body = ';'.join(f'{prop}:{value}' for prop, value in declarations)
+    if utility in ('sr-only', 'not-sr-only'):
+        group = 'sr-only'
+    else:
+        group = PROPERTY_GROUPS.get(declarations[0][0])
+    order = GROUP_ORDER.index(group) if group in GROUP_ORDER else len(GROUP_ORDER)
+    variant_rank = 1 if (pseudos or group_hover) else 0
+    screen_rank = [name for name, _width in SCREENS].index(screen) + 1 if screen else 0
+    key = (screen_rank, variant_rank, order, shorthand_rank(declarations), class_name)
+    return key, screen, f'{selector}{{{body}}}'
+
+def build_space_rule(class_name):
+    """space-x-* / space-y-* utilities, which style the children of an element"""
+    variants, utility = split_variants(class_name)
+    match = re.fullmatch(r'space-([xy])-(.+)', utility)
+    if not match or any(v not in dict(SCREENS) for v in variants) or len(variants) > 1:
+        return None
+    value = spacing(match.group(2))
+    if value is None:
+        return None
+    if match.group(1) == 'y':
+        body = f'margin-top:{value};margin-bottom:0px'
+    else:
+        body = f'margin-left:{value};margin-right:0px'
+    screen = variants[0] if variants else None
+    screen_rank = [name for name, _width in SCREENS].index(screen) + 1 if screen else 0
+    selector = f'.{escape_class(class_name)}>:not([hidden])~:not([hidden])'
+    key = (screen_rank, 0, GROUP_ORDER.index('space'), 0, class_name)
+    return key, screen, f'{selector}{{{body}}}'
+
+def scan_candidates(paths):
+    """Collect every token in the given files that could be a class name"""
+    candidates = set()
+    token = re.compile(r'[^<>"\'`\s]*[^<>"\'`\s:]')
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            candidates.update(token.findall(f.read()))
+    return candidates
+
+def custom_classes(stylesheet='styles.css'):
+    """Class names defined in the hand-written stylesheet"""
+    try:
+        with open(stylesheet, 'r', encoding='utf-8') as f:
+            return set(re.findall(r'\.([A-Za-z_][\w-]*)', f.read()))
+    except FileNotFoundError:
+        return set()
+
+def class_attribute_values(paths):
+    """Class names written in class="..." attributes, for the unknown-class report"""
+    names = set()
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            for value in re.findall(r'class="([^"]*)"', f.read()):
+                names.update(value.split())
+    return names
+
+def generate_css(candidates):
+    """Generate the stylesheet for every candidate that is a known utility"""
+    rules = []
+    for candidate in candidates:
+        rule = build_rule(candidate) or build_space_rule(candidate)
+        if rule:
+            rules.append(rule)
+    rules.sort(key=lambda rule: rule[0])
+
+    lines = ['/* Generated by extract-tailwind.py - do not edit */', PREFLIGHT.rstrip('\n')]
+    open_screen = None
+    for _key, screen, css in rules:
+        if screen != open_screen:
+            if open_screen:
+                lines.append('}')
+            if screen:
+                lines.append(f'@media (min-width:{dict(SCREENS)[screen]}px){{')
+            open_screen = screen
+        lines.append(css)
+    if open_screen:
+        lines.append('}')
+    return '\n'.join(lines) + '\n', [rule[0][-1] for rule in rules]
+
+def content_files():
+    """The pages and scripts scanned for class names"""
+    paths = []
+    for pattern in CONTENT_GLOBS:
+        paths.extend(sorted(Path('.').glob(pattern)))
+    return paths
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description='Generate a static Tailwind stylesheet from the classes in use')
+    parser.add_argument('-o', '--output', default=OUTPUT_FILE, help=f'output file (default: {OUTPUT_FILE})')
+    parser.add_argument('--cdn-script', metavar='FILE',
+                        help='a saved copy of the Tailwind CDN script to compare sizes against')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Tailwind Class Extraction")
+    print("=" * 60)
+    print()
+
+    paths = content_files()
+    candidates = scan_candidates(paths)
+    css, generated = generate_css(candidates)
+
+    unknown = sorted(name for name in class_attribute_values(paths)
+                     - set(generated) - custom_classes() - MARKER_CLASSES
+                     if not name.startswith('feather'))
+    if unknown:
+        print(f"⚠ {len(unknown)} class(es) are neither Tailwind utilities nor defined in styles.css:")
+        for name in unknown:
+            print(f"  {name}")
+        print()
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        f.write(css)
+
+    data = css.encode('utf-8')
+    print(f"Scanned {len(paths)} files, {len(candidates):,} candidate tokens")
+    print(f"Generated {len(generated)} utilities into {args.output}")
+    print()
+    print("Size report:")
+    if args.cdn_script:
+        with open(args.cdn_script, 'rb') as f:
+            script = f.read()
+        print(f"  Before (CDN compiler): {len(script):,} bytes, "
+              f"{len(gzip.compress(script, 9)):,} bytes gzipped, plus in-browser compile time")
+    else:
+        print("  Before (CDN compiler): render-blocking third-party script "
+              "(pass --cdn-script to measure a saved copy)")
+    print(f"  After ({args.output}): {len(data):,} bytes, "
+          f"{len(gzip.compress(data, 9)):,} bytes gzipped")
+    print()
+    print("✓ Tailwind extraction complete!")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+// Form Validation
+// Marks empty required fields and blocks submitting until they are filled
+
+(function() {
+  'use strict';
+
+  // Form validation
+  function initializeFormValidation() {
+    const forms = document.querySelectorAll('form');
+    
+    forms.forEach(form => {
+      form.addEventListener('submit', (e) => {
+        const inputs = form.querySelectorAll('input[required], textarea[required]');
+        let isValid = true;
+
+        inputs.forEach(input => {
+          if (!input.value.trim()) {
+            isValid = false;
+            input.classList.add('border-red-500');
+            
+            // Remove error class on input
+            input.addEventListener('input', () => {
+              input.classList.remove('border-red-500');
+            }, { once: true });
+          }
+        });
+
+        if (!isValid) {
+          e.preventDefault();
+          
+          // Show error message
+          const errorMsg = document.createElement('div');
+          errorMsg.className = 'text-red-400 text-sm mt-2';
+          errorMsg.textContent = 'Please fill in all required fields.';
+          errorMsg.setAttribute('role', 'alert');
+          
+          const existingError = form.querySelector('[role="alert"]');
+          if (existingError) {
+            existingError.remove();
+          }
+          
+          form.appendChild(errorMsg);
+          
+          // Remove error message after 5 seconds
+          setTimeout(() => errorMsg.remove(), 5000);
+        }
+      });
+    });
+  }
+
+  // Initialize when DOM is ready
+  if (document.readyState === 'loading') {
+    document.addEventListener('DOMContentLoaded', initializeFormValidation);
+  } else {
+    initializeFormValidation();
+  }
+})();
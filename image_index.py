@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Image dimension index
+Reads the intrinsic size of JPEG, PNG and WebP files from their headers
+only (JPEG SOF, PNG IHDR, WebP VP8/VP8L/VP8X) through memory-mapped reads,
+and caches the results on disk keyed by each file's mtime and size.
+
+Used by create-pages.py and optimize-images.py:
+
+    import image_index
+    width, height = image_index.image_dimensions('images/drill rig.jpg')
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+from pathlib import Path
+
+INDEX_FILE = '.image-index.json'
+INDEX_VERSION = 1
+IMAGE_DIR = 'images'
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp')
+
+# JPEG start-of-frame markers (every SOFn except DHT, JPG and DAC)
+JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7,
+                    0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+def exif_orientation(data, start, end):
+    """EXIF orientation (1-8) from an APP1 segment body, or 1 if absent"""
+    if data[start:start + 6] != b'Exif\0\0':
+        return 1
+    tiff = start + 6
+    order = {b'II': '<', b'MM': '>'}.get(data[tiff:tiff + 2])
+    if not order or tiff + 8 > end:
+        return 1
+    ifd = tiff + struct.unpack(order + 'I', data[tiff + 4:tiff + 8])[0]
+    if ifd + 2 > end:
+        return 1
+    count = struct.unpack(order + 'H', data[ifd:ifd + 2])[0]
+    for entry in range(ifd + 2, min(ifd + 2 + count * 12, end - 11), 12):
+        tag, kind = struct.unpack(order + 'HH', data[entry:entry + 4])
+        if tag == 0x0112 and kind == 3:
+            return struct.unpack(order + 'H', data[entry + 8:entry + 10])[0]
+    return 1
+
+def jpeg_dimensions(data):
+    """Width and height from the first SOF segment, as displayed after EXIF rotation"""
+    orientation = 1
+    pos = 2
+    while pos + 4 <= len(data):
+        if data[pos] != 0xFF:
+            return None
+        marker = data[pos + 1]
+        if marker == 0xFF:  # fill byte
+            pos += 1
+            continue
+        if marker == 0x01 or 0xD0 <= marker <= 0xD9:  # markers without a length
+            pos += 2
+            continue
+        length = struct.unpack('>H', data[pos + 2:pos + 4])[0]
+        if marker == 0xE1:
+            orientation = exif_orientation(data, pos + 4, min(pos + 2 + length, len(data)))
+        elif marker in JPEG_SOF_MARKERS:
+            height, width = struct.unpack('>HH', data[pos + 5:pos + 9])
+            # Orientations 5-8 rotate the image by 90 degrees
+            return (height, width) if orientation >= 5 else (width, height)
+        elif marker == 0xDA:  # start of scan: no frame header found
+            return None
+        pos += 2 + length
+    return None
+
+def png_dimensions(data):
+    """Width and height from the IHDR chunk"""
+    if data[12:16] != b'IHDR':
+        return None
+    return struct.unpack('>II', data[16:24])
+
+def webp_dimensions(data):
+    """Width and height from the first VP8, VP8L or VP8X chunk"""
+    chunk = data[12:16]
+    if chunk == b'VP8 ' and data[23:26] == b'\x9d\x01\x2a':
+        width, height = struct.unpack('<HH', data[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b'VP8L' and data[20] == 0x2F:
+        bits = struct.unpack('<I', data[21:25])[0]
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b'VP8X':
+        width = int.from_bytes(data[24:27], 'little') + 1
+        height = int.from_bytes(data[27:30], 'little') + 1
+        return width, height
+    return None
+
+def read_dimensions(path):
+    """Return (width, height, format) read from the file header, or None"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size < 30:
+            return None
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            if data[:3] == b'\xff\xd8\xff':
+                size, fmt = jpeg_dimensions(data), 'jpeg'
+            elif data[:8] == b'\x89PNG\r\n\x1a\n':
+                size, fmt = png_dimensions(data), 'png'
+            elif data[:4] == b'RIFF' and data[8:12] == b'WEBP':
+                size, fmt = webp_dimensions(data), 'webp'
+            else:
+                return None
+    return (size[0], size[1], fmt) if size else None
+
+def load_index(index_file=INDEX_FILE):
+    """Load the cached index, or an empty one if it is missing or outdated"""
+    try:
+        with open(index_file, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if index.get('version') != INDEX_VERSION:
+        return {}
+    return index.get('images', {})
+
+def save_index(images, index_file=INDEX_FILE):
+    """Write the index atomically"""
+    tmp_file = index_file + '.tmp'
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump({'version': INDEX_VERSION, 'images': images}, f, indent=2, sort_keys=True)
+        f.write('\n')
+    os.replace(tmp_file, index_file)
+
+def build_index(image_dir=IMAGE_DIR, index_file=INDEX_FILE):
+    """Index every image in image_dir, re-reading only files whose mtime or size changed"""
+    cached = load_index(index_file)
+    images = {}
+    for path in sorted(Path(image_dir).glob('*')):
+        if path.suffix.lower() not in IMAGE_EXTENSIONS or not path.is_file():
+            continue
+        key = path.as_posix()
+        st = path.stat()
+        entry = cached.get(key)
+        if not entry or entry['mtime_ns'] != st.st_mtime_ns or entry['size'] != st.st_size:
+            dimensions = read_dimensions(path)
+            if dimensions is None:
+                continue
+            width, height, fmt = dimensions
+            entry = {'width': width, 'height': height, 'format': fmt,
+                     'mtime_ns': st.st_mtime_ns, 'size': st.st_size}
+        images[key] = entry
+
+    if images != cached:
+        save_index(images, index_file)
+    return images
+
+_index = None
+
+def image_dimensions(path):
+    """(width, height) of an image in images/, or None if it is not a readable image"""
+    global _index
+    key = Path(path).as_posix()
+    if _index is None:
+        _index = build_index()
+    entry = _index.get(key)
+    if entry:
+        try:
+            st = os.stat(key)
+        except FileNotFoundError:
+            return None
+        if (st.st_mtime_ns, st.st_size) != (entry['mtime_ns'], entry['size']):
+            _index = build_index()
+            entry = _index.get(key)
+    elif os.path.isfile(key) and os.path.dirname(key) == IMAGE_DIR:
+        # Added since the index was built
+        _index = build_index()
+        entry = _index.get(key)
+    return (entry['width'], entry['height']) if entry else None
+
+def main():
+    """Main function"""
+    image_dir = sys.argv[1] if len(sys.argv) > 1 else IMAGE_DIR
+    images = build_index(image_dir)
+    print("=" * 60)
+    print(f"Image index: {len(images)} images in {image_dir}/ ({INDEX_FILE})")
+    print("=" * 60)
+    for key, entry in images.items():
+        print(f"  {entry['width']:>5} x {entry['height']:<5} {entry['format']:<5} {key}")
+
+if __name__ == '__main__':
+    main()
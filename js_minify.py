@@ -0,0 +1,936 @@
+#!/usr/bin/env python3
+"""
+JavaScript minifier used by minify.py
+A lexer that understands strings, template literals and regex literals,
+followed by a scope analysis that renames function-local identifiers.
+
+Top-level names are never renamed because the site scripts share globals
+(config.js defines ZICON_CONFIG for the others). Scopes that call eval()
+or use `with` keep their names, as do all scopes around them.
+
+    python js_minify.py app.js          # print the minified script
+    python js_minify.py --verify *.js   # check the output with node
+"""
+
+import collections
+import os
+import re
+import subprocess
+import sys
+import tempfile
+
+Token = collections.namedtuple('Token', 'type value start newline_before')
+
+class JSSyntaxError(ValueError):
+    """Source the lexer or scope analysis cannot handle"""
+
+PUNCTUATORS = sorted([
+    '{', '}', '(', ')', '[', ']', ';', ',', '<', '>', '+', '-', '*', '/', '%', '&', '|',
+    '^', '!', '~', '?', ':', '=', '.', '@', '#',
+    '...', '<=', '>=', '==', '!=', '===', '!==', '**', '++', '--', '<<', '>>', '>>>',
+    '&&', '||', '??', '?.', '+=', '-=', '*=', '/=', '%=', '**=', '<<=', '>>=', '>>>=',
+    '&=', '|=', '^=', '&&=', '||=', '??=', '=>',
+], key=len, reverse=True)
+PUNCTUATOR = re.compile('|'.join(map(re.escape, PUNCTUATORS)))
+IDENTIFIER = re.compile(r'[A-Za-z_$\u0080-\uffff][\w$\u0080-\uffff]*')
+NUMBER = re.compile(r'(?:0[xX][\da-fA-F_]+|0[oO][0-7_]+|0[bB][01_]+)n?'
+                    r'|(?:\d[\d_]*\.?[\d_]*|\.\d[\d_]*)(?:[eE][+-]?\d[\d_]*)?n?')
+LINE_TERMINATORS = '\n\r\u2028\u2029'
+SPACES = ' \t\f\v\u00a0\ufeff'
+
+KEYWORDS = {
+    'await', 'break', 'case', 'catch', 'class', 'const', 'continue', 'debugger', 'default',
+    'delete', 'do', 'else', 'enum', 'export', 'extends', 'false', 'finally', 'for',
+    'function', 'if', 'import', 'in', 'instanceof', 'let', 'new', 'null', 'return', 'super',
+    'switch', 'this', 'throw', 'true', 'try', 'typeof', 'var', 'void', 'while', 'with',
+    'yield',
+}
+# Never generated as new names
+RESERVED = KEYWORDS | {'arguments', 'eval', 'implements', 'interface', 'package', 'private',
+                       'protected', 'public', 'static', 'undefined', 'NaN', 'Infinity', 'of'}
+
+# Keywords after which an expression (so a regex or an object literal) begins
+EXPRESSION_KEYWORDS = {'return', 'typeof', 'instanceof', 'in', 'of', 'new', 'delete', 'void',
+                       'throw', 'case', 'do', 'else', 'yield', 'await', 'extends'}
+
+# A line break after these tokens, or before the second group, never ends a
+# statement, so it can be dropped (see asi_break)
+CONTINUE_AFTER = {
+    '{', '(', '[', ',', ';', '.', '?.', '?', ':', '...', '=>', '!', '~',
+    '=', '+=', '-=', '*=', '/=', '%=', '**=', '<<=', '>>=', '>>>=', '&=', '|=', '^=',
+    '&&=', '||=', '??=', '==', '!=', '===', '!==', '<', '>', '<=', '>=', '&&', '||',
+    '??', '+', '-', '*', '/', '%', '**', '<<', '>>', '>>>', '&', '|', '^',
+}
+CONTINUE_BEFORE = {
+    '}', ')', ']', ',', ';', '.', '?.', '?', ':', '=>', '(', '[',
+    '=', '+=', '-=', '*=', '/=', '%=', '**=', '<<=', '>>=', '>>>=', '&=', '|=', '^=',
+    '&&=', '||=', '??=', '==', '!=', '===', '!==', '<', '>', '<=', '>=', '&&', '||',
+    '??', '+', '-', '*', '/', '%', '**', '<<', '>>', '>>>', '&', '|', '^',
+}
+# No line break is allowed after these (`return\nx` returns undefined)
+RESTRICTED = {'return', 'break', 'continue', 'throw', 'yield', 'async'}
+
+# ---------------------------------------------------------------------------
+# Lexer
+# ---------------------------------------------------------------------------
+
+def regex_allowed(tokens):
+    """Whether a '/' after these tokens starts a regex literal rather than a division"""
+    if not tokens:
+        return True
+    last = tokens[-1]
+    if last.type in ('num', 'string', 'regex'):
+        return False
+    if last.type == 'template':
+        return last.value.endswith('${')
+    if last.type == 'name':
+        return last.value in EXPRESSION_KEYWORDS
+    return last.value not in (')', ']', '}', '++', '--')
+
+def scan_string(source, pos):
+    """End of the string literal starting at pos"""
+    quote = source[pos]
+    pos += 1
+    while pos < len(source):
+        char = source[pos]
+        if char == '\\':
+            pos += 2
+        elif char == quote:
+            return pos + 1
+        elif char in '\n\r':
+            break
+        else:
+            pos += 1
+    raise JSSyntaxError(f"unterminated string at offset {pos}")
+
+def scan_template(source, pos):
+    """End of a template chunk starting after '`' or '}'; also whether it opens a ${"""
+    while pos < len(source):
+        char = source[pos]
+        if char == '\\':
+            pos += 2
+        elif char == '`':
+            return pos + 1, False
+        elif source.startswith('${', pos):
+            return pos + 2, True
+        else:
+            pos += 1
+    raise JSSyntaxError("unterminated template literal")
+
+def scan_regex(source, pos):
+    """End of the regex literal (including flags) starting at pos"""
+    in_class = False
+    pos += 1
+    while pos < len(source):
+        char = source[pos]
+        if char == '\\':
+            pos += 2
+            continue
+        if char in LINE_TERMINATORS:
+            break
+        if char == '[':
+            in_class = True
+        elif char == ']':
+            in_class = False
+        elif char == '/' and not in_class:
+            flags = IDENTIFIER.match(source, pos + 1)
+            return flags.end() if flags else pos + 1
+        pos += 1
+    raise JSSyntaxError(f"unterminated regex literal at offset {pos}")
+
+def tokenize(source):
+    """Split JavaScript source into tokens, dropping comments and whitespace
+
+    Each token records whether a line break preceded it, which automatic
+    semicolon insertion depends on.
+    """
+    tokens = []
+    braces = []  # '{' or '${' for every open brace, to find where templates resume
+    pos = 0
+    newline = False
+    if source.startswith('#!'):
+        end = source.find('\n')
+        end = len(source) if end < 0 else end
+        tokens.append(Token('hashbang', source[:end], 0, False))
+        pos = end
+
+    while pos < len(source):
+        char = source[pos]
+        if char in LINE_TERMINATORS:
+            newline = True
+            pos += 1
+            continue
+        if char in SPACES:
+            pos += 1
+            continue
+        if source.startswith('//', pos):
+            while pos < len(source) and source[pos] not in LINE_TERMINATORS:
+                pos += 1
+            continue
+        if source.startswith('/*', pos):
+            end = source.find('*/', pos + 2)
+            if end < 0:
+                raise JSSyntaxError(f"unterminated comment at offset {pos}")
+            if any(c in LINE_TERMINATORS for c in source[pos:end]):
+                newline = True
+            pos = end + 2
+            continue
+
+        start = pos
+        if char in '\'"':
+            kind, pos = 'string', scan_string(source, pos)
+        elif char == '`' or (char == '}' and braces and braces[-1] == '${'):
+            if char == '}':
+                braces.pop()
+            pos, opens = scan_template(source, pos + 1)
+            if opens:
+                braces.append('${')
+            kind = 'template'
+        elif char == '/' and regex_allowed(tokens):
+            kind, pos = 'regex', scan_regex(source, pos)
+        elif char.isdigit() or (char == '.' and source[pos + 1:pos + 2].isdigit()):
+            kind, pos = 'num', NUMBER.match(source, pos).end()
+        elif IDENTIFIER.match(source, pos):
+            kind, pos = 'name', IDENTIFIER.match(source, pos).end()
+        else:
+            match = PUNCTUATOR.match(source, pos)
+            if not match:
+                raise JSSyntaxError(f"unexpected character {char!r} at offset {pos}")
+            value = match.group(0)
+            if value == '?.' and source[pos + 2:pos + 3].isdigit():
+                value = '?'  # a ? .5 : 1
+            kind, pos = 'punct', pos + len(value)
+            if value == '{':
+                braces.append('{')
+            elif value == '}' and braces:
+                braces.pop()
+        tokens.append(Token(kind, source[start:pos], start, newline))
+        newline = False
+    return tokens
+
+def asi_break(prev, token):
+    """Whether the line break before `token` may end a statement (so it must be kept)"""
+    if not token.newline_before or prev is None:
+        return False
+    if token.type == 'punct' and token.value in ('}', ';'):
+        return False  # a statement ends here with or without the line break
+    if prev.type == 'hashbang':
+        return True
+    if token.value in ('++', '--') and token.type == 'punct':
+        return True
+    if prev.type == 'name' and prev.value in RESTRICTED:
+        return True
+    if prev.type == 'punct' and prev.value in CONTINUE_AFTER:
+        return False
+    if prev.type == 'name' and prev.value in EXPRESSION_KEYWORDS:
+        return False
+    if prev.type == 'template' and prev.value.endswith('${'):
+        return False
+    if token.type == 'punct' and token.value in CONTINUE_BEFORE:
+        return False
+    if token.type == 'template':
+        return False  # a tagged template either way, or the end of a ${} substitution
+    if token.type == 'name' and token.value in ('in', 'instanceof'):
+        return False
+    return True
+
+# ---------------------------------------------------------------------------
+# Scope analysis
+# ---------------------------------------------------------------------------
+
+def new_scope(parent, is_function):
+    """A scope: declared names with reference counts, names used from below, children"""
+    scope = {'parent': parent, 'function': is_function, 'names': {}, 'uses': set(),
+             'children': [], 'unsafe': False}
+    if parent is not None:
+        parent['children'].append(scope)
+    return scope
+
+def remove_scope(scopes, scope):
+    """Remove a scope from the open-scope stack (by identity: scopes link to each other)"""
+    for k in range(len(scopes) - 1, -1, -1):
+        if scopes[k] is scope:
+            del scopes[k]
+            return
+
+def function_scope(scope):
+    """Nearest scope that `var` declarations belong to"""
+    while not scope['function']:
+        scope = scope['parent']
+    return scope
+
+def match_brackets(tokens):
+    """Map the index of every '(' , '[' and '{' to the index of its closing token"""
+    closing = {}
+    stack = []
+    for i, token in enumerate(tokens):
+        if token.type == 'punct' and token.value in '([{':
+            stack.append(i)
+        elif token.type == 'template' and token.value.endswith('${'):
+            if token.value.startswith('}') and stack:
+                closing[stack.pop()] = i
+            stack.append(i)
+        elif (token.type == 'punct' and token.value in ')]}') or (
+                token.type == 'template' and token.value.startswith('}')):
+            if not stack:
+                raise JSSyntaxError(f"unbalanced {token.value!r} at offset {token.start}")
+            closing[stack.pop()] = i
+    if stack:
+        raise JSSyntaxError("unbalanced brackets")
+    return closing
+
+def is_statement_start(prev, token):
+    """Whether `token` begins a statement (for function/class declarations and labels)"""
+    return (prev is None or prev.type == 'hashbang'
+            or (prev.type == 'punct' and prev.value in (';', '{', '}', ')'))
+            or (prev.type == 'name' and prev.value in ('else', 'do', 'export', 'default'))
+            or asi_break(prev, token))
+
+def analyze(tokens):
+    """Find declarations and references and the scope of each
+
+    Returns (root scope, declarations, references, shorthands): the first two
+    map token indexes to the scope the name is declared in or looked up
+    from; shorthands holds the indexes of `{name}` object properties, which
+    need an explicit key when renamed.
+    """
+    closing = match_brackets(tokens)
+    root = new_scope(None, True)
+    scopes = [root]
+    frames = [{'kind': 'block', 'declare': None, 'ternary': 0}]
+    declarations = {}
+    references = {}
+    shorthands = set()
+    skipped = set()           # names already classified by a keyword
+    pending = None            # (scope, origin) waiting for its body
+    ends = []                 # (scope, depth, ternary, terminators) of brace-less bodies
+    paren_scope = None        # (scope, origin) for the next '(' after function/catch/for
+    class_pending = False
+    colon_is_ternary = False
+
+    def declare(index, scope):
+        declarations[index] = scope
+        name = tokens[index].value
+        scope['names'].setdefault(name, 0)
+        # A var or function hoisted out of a block is also used from that block,
+        # which must not give its own bindings the same new name
+        site = scopes[-1]
+        ancestor = site['parent']
+        while ancestor is not None and ancestor is not scope:
+            ancestor = ancestor['parent']
+        if ancestor is not None:
+            references[index] = site
+
+    def mark_unsafe(scope):
+        while scope is not None:
+            scope['unsafe'] = True
+            scope = scope['parent']
+
+    for i, token in enumerate(tokens):
+        prev = tokens[i - 1] if i else None
+        nxt = tokens[i + 1] if i + 1 < len(tokens) else None
+        value = token.value
+        is_punct = token.type == 'punct'
+
+        # A body that was not a block ends at a terminator at its own depth
+        while ends and ends[-1][1] == len(frames):
+            scope, _depth, ternary, terminators = ends[-1]
+            frame = frames[-1]
+            closes = (is_punct and value in ')]}') or (
+                token.type == 'template' and value.startswith('}'))
+            if (closes or (is_punct and value in terminators)
+                    or (is_punct and value == ':' and frame['ternary'] <= ternary)
+                    or asi_break(prev, token)):
+                ends.pop()
+                remove_scope(scopes, scope)
+            else:
+                break
+
+        if pending is not None:
+            scope, origin = pending
+            if is_punct and value == '=>':
+                pending = (scope, 'arrow')
+                continue
+            pending = None
+            if not (is_punct and value == '{'):
+                # Expression-bodied arrow function, or a for statement without braces
+                terminators = {',', ';'} if origin == 'arrow' else {';'}
+                ends.append((scope, len(frames), frames[-1]['ternary'], terminators))
+            else:
+                frames.append({'kind': 'block', 'declare': None, 'ternary': 0, 'scope': scope})
+                continue
+
+        frame = frames[-1]
+        scope = scopes[-1]
+        if frame['declare'] is not None and asi_break(prev, token):
+            frame['declare'] = None
+        declaring = frame['declare'] is not None and frame['declare']['active']
+
+        if token.type == 'name':
+            if i in skipped:
+                continue
+            if prev is not None and prev.type == 'punct' and prev.value in ('.', '?.'):
+                continue  # property access
+            if prev is not None and prev.type == 'punct' and prev.value == '#':
+                continue  # private class member
+            if value in ('var', 'let', 'const') and nxt is not None and (
+                    nxt.type == 'name' or nxt.value in ('[', '{')):
+                target = function_scope(scope) if value == 'var' else scope
+                frame['declare'] = {'scope': target, 'active': True}
+                continue
+            if value == 'function':
+                j = i + 1
+                if j < len(tokens) and tokens[j].value == '*':
+                    j += 1
+                inner = new_scope(scope, True)
+                if j < len(tokens) and tokens[j].type == 'name':
+                    before, first = prev, token
+                    if before is not None and before.value == 'async':
+                        before, first = (tokens[i - 2] if i > 1 else None), prev
+                    if is_statement_start(before, first):
+                        declare(j, function_scope(scope))
+                    else:
+                        declare(j, inner)  # named function expression
+                    skipped.add(j)
+                paren_scope = (inner, 'function')
+                continue
+            if value == 'class':
+                if nxt is not None and nxt.type == 'name' and nxt.value != 'extends':
+                    if is_statement_start(prev, token):
+                        declare(i + 1, scope)
+                    skipped.add(i + 1)
+                class_pending = True
+                continue
+            if value == 'catch' and nxt is not None and nxt.value == '(':
+                paren_scope = (new_scope(scope, False), 'catch')
+                continue
+            if value == 'for':
+                paren_scope = (new_scope(scope, False), 'for')
+                continue
+            if value in ('with', 'eval'):
+                mark_unsafe(scope)
+            if value in KEYWORDS:
+                if value in ('in',) and frame['declare'] is not None:
+                    frame['declare'] = None
+                continue
+
+            if nxt is not None and nxt.type == 'punct' and nxt.value == '=>':
+                inner = new_scope(scope, True)
+                scopes.append(inner)
+                declare(i, inner)
+                pending = (inner, 'arrow')
+                continue
+
+            # Labels and break/continue targets live in their own namespace
+            if prev is not None and prev.value in ('break', 'continue') and not token.newline_before:
+                continue
+            if (nxt is not None and nxt.value == ':' and frame['kind'] == 'block'
+                    and is_statement_start(prev, token)):
+                continue
+
+            if frame['kind'] in ('object', 'class') and object_key_position(tokens, i, frame['kind']):
+                if nxt is None or nxt.value in (':', '(') or (
+                        frame['kind'] == 'class' and nxt.value in ('=', ';', '}')):
+                    continue  # property or method name
+                if value in ('get', 'set', 'async', 'static') and nxt.value not in (',', '}', '='):
+                    continue  # accessor/modifier keyword
+                if frame['kind'] == 'object' and nxt.value in (',', '}', '='):
+                    shorthands.add(i)
+                    if frame['declare'] is not None and frame['declare']['active']:
+                        declare(i, frame['declare']['scope'])
+                    else:
+                        references[i] = scope
+                    continue
+
+            if declaring:
+                if prev is not None and frame['kind'] not in ('pattern-object', 'pattern-array', 'params') \
+                        and ((prev.type == 'name' and prev.value not in ('var', 'let', 'const'))
+                             or prev.value in (']', '}')):
+                    frame['declare'] = None  # `of` in for (const x of xs)
+                    continue
+                if frame['kind'] == 'pattern-object' and prev.value in ('{', ','):
+                    if nxt is not None and nxt.value == ':':
+                        continue  # key of a destructuring pattern
+                    shorthands.add(i)
+                declare(i, frame['declare']['scope'])
+                continue
+            references[i] = scope
+            continue
+
+        if token.type == 'template':
+            if value.startswith('}'):
+                closed = frames.pop()
+                if closed.get('scope') is not None:
+                    remove_scope(scopes, closed['scope'])
+            if value.endswith('${'):
+                frames.append({'kind': 'paren', 'declare': None, 'ternary': 0})
+            continue
+
+        if not is_punct:
+            continue
+
+        if value in ('(', '[', '{'):
+            child = {'kind': 'paren', 'declare': None, 'ternary': 0}
+            if value == '(':
+                after = tokens[closing[i] + 1] if closing[i] + 1 < len(tokens) else None
+                owned = None
+                if after is not None and after.value == '=>':
+                    owned = (new_scope(scope, True), 'arrow')
+                elif paren_scope is not None:
+                    owned, paren_scope = paren_scope, None
+                elif (frame['kind'] in ('object', 'class') and after is not None
+                      and after.value == '{'):
+                    owned = (new_scope(scope, True), 'function')  # method
+                if owned is not None:
+                    inner, origin = owned
+                    scopes.append(inner)
+                    child['after'] = owned
+                    if origin != 'for':
+                        child['kind'] = 'params'
+                        child['declare'] = {'scope': inner, 'active': True}
+            elif declaring and not (value == '[' and frame['kind'] == 'pattern-object'
+                                    and prev.value in ('{', ',')):
+                child['kind'] = 'pattern-array' if value == '[' else 'pattern-object'
+                child['declare'] = {'scope': frame['declare']['scope'], 'active': True}
+            elif value == '[':
+                child['kind'] = 'bracket'
+            else:
+                kind = brace_kind(prev, frame, colon_is_ternary)
+                if class_pending:
+                    kind, class_pending = 'class', False
+                child['kind'] = kind
+                if kind == 'block':
+                    inner = new_scope(scope, False)
+                    scopes.append(inner)
+                    child['scope'] = inner
+            frames.append(child)
+            colon_is_ternary = False
+            continue
+
+        if value in (')', ']', '}'):
+            closed = frames.pop()
+            if len(frames) == 0:
+                raise JSSyntaxError(f"unbalanced {value!r} at offset {token.start}")
+            if closed.get('scope') is not None:
+                remove_scope(scopes, closed['scope'])
+            if 'after' in closed:
+                pending = closed['after']
+            continue
+
+        colon_is_ternary = False
+        if value == '?':
+            frame['ternary'] += 1
+        elif value == ':' and frame['ternary'] > 0:
+            frame['ternary'] -= 1
+            colon_is_ternary = True
+        elif frame['declare'] is not None:
+            if value == '=':
+                frame['declare']['active'] = False
+            elif value == ',':
+                frame['declare']['active'] = True
+            elif value == ';':
+                frame['declare'] = None
+
+    return root, declarations, references, shorthands
+
+def object_key_position(tokens, i, kind):
+    """Whether the name at i sits where an object or class member name goes"""
+    starts = (',', '{') if kind == 'object' else (',', '{', ';', '}')
+    j = i - 1
+    # Skip modifiers such as `get`, `static async` or the `*` of generators
+    while j > 0 and i - j <= 2 and tokens[j].value in ('get', 'set', 'async', 'static', '*'):
+        j -= 1
+    return tokens[j].type == 'punct' and tokens[j].value in starts
+
+def brace_kind(prev, frame, colon_is_ternary):
+    """Whether a '{' opens a block or an object literal"""
+    if prev is None or prev.type == 'hashbang':
+        return 'block'
+    if prev.type == 'punct':
+        if prev.value in (')', ';', '{', '}', '=>'):
+            return 'block'
+        if prev.value == ':' and not colon_is_ternary and frame['kind'] == 'block':
+            return 'block'  # after a label or case
+        return 'object'
+    if prev.type == 'name':
+        if prev.value in EXPRESSION_KEYWORDS and prev.value not in ('do', 'else'):
+            return 'object'
+        return 'block'
+    if prev.type == 'template' and prev.value.endswith('${'):
+        return 'object'
+    return 'block'
+
+# ---------------------------------------------------------------------------
+# Renaming
+# ---------------------------------------------------------------------------
+
+NAME_START = 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ$_'
+NAME_PART = NAME_START + '0123456789'
+
+def short_names():
+    """a, b, ..., _, aa, ab, ... skipping reserved words"""
+    length = 1
+    while True:
+        for first in NAME_START:
+            if length == 1:
+                yield first
+                continue
+            for rest in short_name_tails(length - 1):
+                name = first + rest
+                if name not in RESERVED:
+                    yield name
+        length += 1
+
+def short_name_tails(length):
+    """Every combination of `length` identifier characters"""
+    if length == 0:
+        yield ''
+        return
+    for char in NAME_PART:
+        for rest in short_name_tails(length - 1):
+            yield char + rest
+
+def assign_names(tokens, root, declarations, references):
+    """Choose short names for the bindings of every non-global scope
+
+    A scope may reuse any name except those of free globals and outer
+    bindings referenced from inside it, so sibling functions share names.
+    Returns {token index: new name}.
+    """
+    bindings = {}  # token index -> declaring scope (None for globals)
+    for i, scope in declarations.items():
+        bindings[i] = scope
+    for i, scope in references.items():
+        name = tokens[i].value
+        target = scope
+        while target is not None and name not in target['names']:
+            target = target['parent']
+        bindings[i] = target
+        if target is not None:
+            target['names'][name] += 1
+        # Every scope between the reference and its binding must not shadow it
+        inner = scope
+        while inner is not target:
+            inner['uses'].add((id(target) if target is not None else None, name))
+            inner = inner['parent']
+
+    new_names = {}  # (scope id, old name) -> new name
+    scopes_by_id = {}
+
+    def visit(scope):
+        scopes_by_id[id(scope)] = scope
+        if scope is not root and not scope['unsafe'] and scope['names']:
+            taken = set()
+            for target, name in scope['uses']:
+                taken.add(new_names.get((target, name), name))
+            generator = short_names()
+            for name, _count in sorted(scope['names'].items(), key=lambda item: -item[1]):
+                candidate = next(generator)
+                while candidate in taken:
+                    candidate = next(generator)
+                new_names[(id(scope), name)] = candidate
+        for child in scope['children']:
+            visit(child)
+
+    visit(root)
+
+    renames = {}
+    for i, scope in bindings.items():
+        if scope is not None:
+            new = new_names.get((id(scope), tokens[i].value))
+            if new is not None and new != tokens[i].value:
+                renames[i] = new
+    return renames
+
+# ---------------------------------------------------------------------------
+# Output
+# ---------------------------------------------------------------------------
+
+def needs_space(prev_text, prev, text):
+    """Whether two adjacent tokens would merge without a space between them"""
+    a, b = prev_text[-1], text[0]
+    word_b = b.isalnum() or b in '_$\\' or ord(b) > 127
+    if word_b and (a.isalnum() or a in '_$\\' or ord(a) > 127 or prev.type == 'regex'):
+        return True
+    if (a, b) in (('+', '+'), ('-', '-'), ('/', '/'), ('/', '*'), ('<', '!'), ('-', '>')):
+        return True
+    return prev.type == 'num' and b == '.'
+
+def redundant_semicolon(tokens, i, closing_of):
+    """Whether the ';' at i directly before a '}' can be dropped"""
+    following = tokens[i + 1] if i + 1 < len(tokens) else None
+    if following is None or following.value != '}' or following.type != 'punct':
+        return False
+    prev = tokens[i - 1] if i else None
+    if prev is None or prev.value in ('else', 'do', ';', '{', '}'):
+        return False  # empty statement
+    if prev.value == ')':
+        opening = closing_of.get(i - 1)
+        if opening is not None and opening > 0 and tokens[opening - 1].value in ('if', 'for', 'while', 'with'):
+            return False
+    return True
+
+def generate(tokens, renames=None, shorthands=()):
+    """Join tokens with the least whitespace that keeps the same parse
+
+    Yields (token index, text) pairs, so callers can map output back to
+    source positions.
+    """
+    renames = renames or {}
+    closing_of = {end: start for start, end in match_brackets(tokens).items()}
+    prev = None
+    prev_text = ''
+    for i, token in enumerate(tokens):
+        if token.type == 'punct' and token.value == ';' and redundant_semicolon(tokens, i, closing_of):
+            continue
+        text = renames.get(i, token.value)
+        if i in shorthands and i in renames:
+            text = f'{token.value}:{text}'
+        if prev is not None:
+            if asi_break(prev, token) or prev.type == 'hashbang':
+                yield None, '\n'
+            elif needs_space(prev_text, prev, text):
+                yield None, ' '
+        yield i, text
+        prev = token
+        prev_text = text
+
+def minify(source, mangle=True, mappings=None):
+    """Minify JavaScript source, renaming local identifiers when `mangle` is set
+
+    If `mappings` is a list, (output offset, source offset, original name
+    or None) is appended for every token written, for source_map.build().
+    """
+    tokens = tokenize(source)
+    renames, shorthands = {}, set()
+    if mangle:
+        root, declarations, references, shorthands = analyze(tokens)
+        renames = assign_names(tokens, root, declarations, references)
+    if mappings is None:
+        return ''.join(text for _index, text in generate(tokens, renames, shorthands))
+    out = []
+    length = 0
+    for index, text in generate(tokens, renames, shorthands):
+        if index is not None:
+            token = tokens[index]
+            renamed = index in renames and index not in shorthands
+            mappings.append((length, token.start, token.value if renamed else None))
+        out.append(text)
+        length += len(text)
+    return ''.join(out)
+
+# ---------------------------------------------------------------------------
+# Verification
+# ---------------------------------------------------------------------------
+
+# Programs whose console output must not change when minified: the lexer
+# and ASI edge cases the old regex minifier got wrong, plus scoping cases
+VERIFY_CORPUS = [
+    r"""const url = 'https://example.com//path'; console.log(url, "a // b", '/* no */');""",
+    r"""const re = /\/\/+|[/*]/g; console.log('a//b/*c'.replace(re, '-'), /[/]/.test('/'));""",
+    r"""const a = 4, b = 2, g = 1; console.log(a / b / g, a /b/ g);""",
+    r"""const x = 3; console.log(`x: ${x} , y : ${`nested ${x + 1}`}`, `a,
+    b : c`);""",
+    r"""let i = 1
+let j = i
+++j
+console.log(i, j)
+const f = () => 1
+;[1, 2].forEach(n => console.log(n))""",
+    r"""function f() { return
+  42 }
+console.log(f(), typeof f)""",
+    r"""(function () {
+  'use strict';
+  const total = 1;
+  function add(value) { const total = value + 1; return total; }
+  function outer() { const inner = () => total + add(2); return inner(); }
+  console.log(outer(), add(5));
+})();""",
+    r"""(function () {
+  const name = 'site', size = 3;
+  const options = { name, size, nested: { name }, [name + 'Key']: size };
+  const { name: alias, size: count = 1, missing = 'default' } = options;
+  const [first, , third = 'none', ...rest] = [1, 2, undefined, 4, 5];
+  console.log(JSON.stringify(options), alias, count, missing, first, third, rest);
+})();""",
+    r"""(function () {
+  function walk(items, depth = 0, { label } = { label: 'root' }, ...more) {
+    return items.map((item, index) => `${label}:${depth}:${index}:${item}`).concat(more);
+  }
+  console.log(walk(['a', 'b'], 1, { label: 'x' }, 'extra').join('|'));
+})();""",
+    r"""(function () {
+  const handlers = [];
+  for (let i = 0; i < 3; i++) handlers.push(() => i);
+  for (var k = 0; k < 3; k++) {}
+  outer: for (const row of [[1, 2], [3, 4]]) { for (const cell of row) { if (cell === 2) continue outer; console.log(cell); } }
+  try { throw new Error('boom'); } catch (error) { console.log(error.message, k); }
+  console.log(handlers.map(h => h()).join(','));
+})();""",
+    r"""(function () {
+  const value = 5;
+  const result = value > 3 ? { big: true } : { big: false };
+  switch (value) { case 5: { const value = 'inner'; console.log(value); break; } default: console.log('none'); }
+  const counter = { count: 0, get double() { return this.count * 2; }, increment() { this.count++; return this; } };
+  console.log(result.big, counter.increment().double, 1 .toFixed(1), value - -1, value + +'1');
+})();""",
+    r"""(function () {
+  async function load(delay) { await null; return delay * 2; }
+  const run = async (items) => { let sum = 0; for (const item of items) sum += await load(item); return sum; };
+  run([1, 2, 3]).then(total => console.log('total', total));
+})();""",
+    r"""(function () {
+  var shadow = 'outer';
+  function test() { console.log(shadow, typeof hoisted, hoisted()); function hoisted() { return arguments.length; } }
+  test();
+  const reg = x => /=>/.test(x) ? 'arrow' : 'plain';
+  console.log(reg('=>'), reg('a'), [1, 2].map(n => ({ n })).length);
+})();""",
+    r"""(function () {
+  const KEY = 'code';
+  try { null.x; } catch (error) { var kind = error.constructor.name; }
+  const { [KEY]: code, other = KEY } = { code: 7 };
+  console.log(kind, code, other);
+})();""",
+]
+
+# Runs a script against stub globals that record every property access, call
+# and assignment (calling back any function passed in), and prints the trace.
+# A minified script must leave exactly the same trace as its source.
+TRACE_HARNESS = r"""
+const fs = require('fs');
+const code = fs.readFileSync(process.argv[2], 'utf8').replace(/^#!.*/, '');
+const trace = [];
+const paths = new WeakMap();
+const REAL = new Set(['JSON', 'Object', 'Array', 'String', 'Number', 'Boolean', 'Promise',
+  'Error', 'TypeError', 'RegExp', 'Symbol', 'Map', 'Set', 'parseInt', 'parseFloat', 'isNaN',
+  'encodeURIComponent', 'decodeURIComponent', 'undefined', 'NaN', 'Infinity']);
+let depth = 0;
+function describe(value, level = 0) {
+  if (paths.has(value)) return paths.get(value);
+  if (typeof value === 'function') return 'fn';
+  if (value === null || typeof value !== 'object') return typeof value === 'string' ? JSON.stringify(value) : String(value);
+  if (level > 2) return '{...}';
+  if (Array.isArray(value)) return '[' + value.map(v => describe(v, level + 1)).join(',') + ']';
+  return '{' + Object.keys(value).map(k => k + ':' + describe(value[k], level + 1)).join(',') + '}';
+}
+function invoke(fn, path) {
+  if (depth > 3) return;
+  depth++;
+  try {
+    const result = fn(stub(path + '.e'), stub(path + '.f'));
+    if (result && typeof result.then === 'function' && !paths.has(result)) {
+      result.catch(e => trace.push('reject ' + e.constructor.name));
+    }
+  } catch (e) { trace.push('throw ' + e.constructor.name); }
+  depth--;
+}
+function stub(path) {
+  const proxy = new Proxy(function () {}, {
+    get(target, key) {
+      if (key === Symbol.toPrimitive) return () => path;
+      if (typeof key === 'symbol' || key === 'then' || key === 'toJSON') return undefined;
+      trace.push('get ' + path + '.' + key);
+      return stub(path + '.' + key);
+    },
+    set(target, key, value) { trace.push('set ' + path + '.' + String(key) + '=' + describe(value)); return true; },
+    has() { return true; },
+    apply(target, self, args) {
+      trace.push('call ' + path + '(' + args.map(a => describe(a)).join(',') + ')');
+      args.forEach((a, i) => typeof a === 'function' && invoke(a, path + '#' + i));
+      return stub(path + '()');
+    },
+    construct(target, args) {
+      trace.push('new ' + path + '(' + args.map(a => describe(a)).join(',') + ')');
+      args.forEach((a, i) => typeof a === 'function' && invoke(a, path + '#' + i));
+      return stub('new ' + path);
+    },
+  });
+  paths.set(proxy, path);
+  return proxy;
+}
+const env = new Proxy({}, {
+  has(target, key) { return typeof key === 'string' && !REAL.has(key); },
+  get(target, key) {
+    if (typeof key === 'symbol') return undefined;
+    return key in target ? target[key] : stub(key);
+  },
+  set(target, key, value) { target[key] = value; trace.push('global ' + String(key) + '=' + describe(value)); return true; },
+});
+try { new Function('env', 'with (env) {\n' + code + '\n}')(env); } catch (e) { trace.push('throw ' + e.constructor.name); }
+process.on('exit', () => console.log(trace.join('\n')));
+"""
+
+def node(*args, source=None):
+    """Run node with the given arguments and optional stdin"""
+    return subprocess.run(['node', *args], input=source, capture_output=True, text=True, timeout=60)
+
+def trace_script(source):
+    """Trace of running a script under TRACE_HARNESS"""
+    with tempfile.TemporaryDirectory() as tmp:
+        harness = os.path.join(tmp, 'harness.js')
+        script = os.path.join(tmp, 'script.js')
+        with open(harness, 'w', encoding='utf-8') as f:
+            f.write(TRACE_HARNESS)
+        with open(script, 'w', encoding='utf-8') as f:
+            f.write(source)
+        check = node('--check', script)
+        if check.returncode:
+            return None, check.stderr.strip()
+        return node(harness, script).stdout, None
+
+def verify(paths):
+    """Check that minified scripts parse and behave like their sources
+
+    Every script in `paths` and every VERIFY_CORPUS program is minified;
+    scripts must pass `node --check` and leave the same TRACE_HARNESS trace,
+    corpus programs must print the same output. Returns the number of
+    failures, or 0 with a warning when node is not installed.
+    """
+    try:
+        node('--version')
+    except FileNotFoundError:
+        print("⚠ node is not installed; skipping JavaScript verification")
+        return 0
+
+    failures = 0
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            source = f.read()
+        expected, _error = trace_script(source)
+        actual, error = trace_script(minify(source))
+        if error:
+            failures += 1
+            print(f"  ✗ {path}: minified output does not parse\n{error}")
+        elif actual != expected:
+            failures += 1
+            print(f"  ✗ {path}: minified output behaves differently")
+        else:
+            print(f"  ✓ {path} ({expected.count(chr(10))} traced operations match)")
+
+    for number, program in enumerate(VERIFY_CORPUS, 1):
+        expected = node('-', source=program)
+        actual = node('-', source=minify(program))
+        if (expected.returncode, expected.stdout) != (actual.returncode, actual.stdout):
+            failures += 1
+            print(f"  ✗ corpus case {number}: output differs\n"
+                  f"    expected: {expected.stdout or expected.stderr!r}\n"
+                  f"    actual:   {actual.stdout or actual.stderr!r}")
+    print(f"  {len(VERIFY_CORPUS)} corpus cases checked, {failures} failure(s)")
+    return failures
+
+def main():
+    """Main function"""
+    if sys.argv[1:2] == ['--verify']:
+        paths = sys.argv[2:]
+        print("=" * 60)
+        print("Verifying JavaScript minifier")
+        print("=" * 60)
+        sys.exit(1 if verify(paths) else 0)
+    for path in sys.argv[1:]:
+        with open(path, 'r', encoding='utf-8') as f:
+            print(minify(f.read()))
+
+if __name__ == '__main__':
+    main()
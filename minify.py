@@ -1,70 +1,681 @@
 #!/usr/bin/env python3
 """
 Minification script for production deployment
-Minifies CSS and JavaScript files
+Minifies CSS, JavaScript and HTML files
 """
 
+import argparse
+import contextlib
+import gzip
+import hashlib
+import io
+import json
 import re
 import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-def minify_css(css_content):
-    """Minify CSS content"""
-    # Remove comments
-    css_content = re.sub(r'/\*.*?\*/', '', css_content, flags=re.DOTALL)
-    
-    # Remove whitespace
-    css_content = re.sub(r'\s+', ' ', css_content)
-    css_content = re.sub(r'\s*([{}:;,])\s*', r'\1', css_content)
-    
-    # Remove trailing semicolons
-    css_content = re.sub(r';}', '}', css_content)
-    
-    return css_content.strip()
+import build_report
+import css_minify
+import css_purge
+import js_minify
+import source_map
 
-def minify_js(js_content):
-    """Basic JavaScript minification"""
-    # Remove single-line comments (but preserve URLs)
-    js_content = re.sub(r'(?<!:)//.*?$', '', js_content, flags=re.MULTILINE)
-    
-    # Remove multi-line comments
-    js_content = re.sub(r'/\*.*?\*/', '', js_content, flags=re.DOTALL)
-    
-    # Remove extra whitespace
-    js_content = re.sub(r'\s+', ' ', js_content)
-    js_content = re.sub(r'\s*([{}();,:])\s*', r'\1', js_content)
-    
-    return js_content.strip()
+try:
+    import brotli
+except ImportError:
+    brotli = None
 
-def process_file(input_path, output_path, file_type):
-    """Process and minify a file"""
-    print(f"Processing {input_path}...")
-    
+# Text assets in dist/ that get precompressed .gz and .br siblings
+COMPRESSIBLE_EXTENSIONS = ('.html', '.css', '.js', '.svg', '.json', '.xml', '.txt')
+COMPRESS_CACHE = 'dist/.compress-cache.json'
+# Fewer stale files than this are compressed in-process, where starting
+# worker processes would cost more than it saves
+PARALLEL_COMPRESS_MIN = 3
+
+# Files minified into dist/, found by glob so new pages, stylesheets and
+# scripts are picked up; command-line tools and generated inputs are not
+INPUT_GLOBS = (('*.css', 'css'), ('*.js', 'js'), ('*.html', 'html'))
+EXCLUDED_INPUTS = {'schema-generator.js', css_purge.OUTPUT_FILE}
+
+# Minified text per output, keyed by a hash of its source and the minifier
+# code, so unchanged files are not minified again
+MINIFY_CACHE = '.minify-cache.json'
+MINIFY_CACHE_VERSION = 1
+
+# Fingerprinted copies (styles.3fa2c1d0.css) are cached as immutable, so
+# pages in dist/ reference them through this logical -> hashed name map
+ASSET_MANIFEST = 'dist/asset-manifest.json'
+HASH_LENGTH = 8
+
+# With --source-maps, minified CSS/JS get a v3 map alongside (app.min.js.map,
+# app.1b913eb6.js.map); --source-map-comments also links each fingerprinted
+# file to its map so browser devtools find it
+SOURCE_MAP_COMMENTS = {'.css': '\n/*# sourceMappingURL={} */', '.js': '\n//# sourceMappingURL={}'}
+
+# Pages that load the same local scripts share one bundle of them. Each
+# module's own "run init once the DOM is ready" check becomes a push onto
+# ZICON_BOOT, and the bundle ends with the single BOOT_SEQUENCE that runs them
+BOOT_QUEUE = 'ZICON_BOOT'
+READY_CHECK = ['if', '(', 'document', '.', 'readyState', '===', "'loading'", ')', '{',
+               'document', '.', 'addEventListener', '(', "'DOMContentLoaded'", ',', None, ')',
+               '}', 'else', '{', None, '(', ')', '}']
+BOOT_SEQUENCE = '''
+// Run every module's init once the DOM is ready; one failing init
+// does not stop the others, and its error is still reported
+(function() {
+  function boot() {
+    ZICON_BOOT.forEach(function(init) {
+      try {
+        init();
+      } catch (error) {
+        setTimeout(function() { throw error; });
+      }
+    });
+  }
+
+  if (document.readyState === 'loading') {
+    document.addEventListener('DOMContentLoaded', boot);
+  } else {
+    boot();
+  }
+})();
+'''
+PAGE_SCRIPT = re.compile(r'<script src="([^"]+)"></script>')
+
+def purged_source(input_file):
+    """The purged copy of a stylesheet if css_purge.py wrote one from the current content, else the file itself"""
+    if input_file != css_purge.STYLESHEET or not os.path.exists(css_purge.OUTPUT_FILE):
+        return input_file
+    inputs = [Path(input_file)] + css_purge.content_files()
+    if os.path.getmtime(css_purge.OUTPUT_FILE) >= max(os.path.getmtime(path) for path in inputs):
+        return css_purge.OUTPUT_FILE
+    print(f"⚠ {css_purge.OUTPUT_FILE} is older than the pages, scripts or {input_file}; "
+          f"using {input_file} (run css_purge.py again)")
+    return input_file
+
+def minify_css(css_content, savings=None, mappings=None):
+    """Minify CSS content
+
+    Uses the css_minify tokenizer and optimizer, so strings and url() are
+    kept intact. `savings`, if given, is filled with the bytes saved by
+    each transformation, and `mappings` with the source map mappings.
+    Stylesheets it cannot parse are left unminified.
+    """
+    try:
+        minified, report = css_minify.optimize(css_content, mappings)
+    except css_minify.CSSSyntaxError as error:
+        print(f"  ⚠ Cannot minify: {error}; copying unchanged")
+        return css_content
+    if savings is not None:
+        savings.update(report)
+    return minified
+
+def minify_js(js_content, mappings=None):
+    """Minify JavaScript content
+
+    Uses the js_minify lexer, so strings, template literals and regex
+    literals are kept intact, and renames function-local identifiers.
+    `mappings`, if given, is filled with the source map mappings. Source
+    it cannot handle is left unminified.
+    """
+    try:
+        return js_minify.minify(js_content, mappings=mappings)
+    except js_minify.JSSyntaxError as error:
+        print(f"  ⚠ Cannot minify: {error}; copying unchanged")
+        return js_content
+
+# Elements kept verbatim: whitespace inside them is significant or not HTML
+PRESERVED_HTML = re.compile(
+    r'''<!--.*?-->|<(pre|textarea|script|style)\b(?:[^>"']|"[^"]*"|'[^']*')*>.*?</\1\s*>''',
+    re.DOTALL | re.IGNORECASE)
+
+# A tag, allowing '>' inside quoted attribute values (e.g. data: URIs)
+HTML_TAG = re.compile(r'''(<[!/]?[a-zA-Z](?:[^>"']|"[^"]*"|'[^']*')*>)''')
+
+# Whitespace next to these tags never renders, so it can be dropped entirely
+BLOCK_TAGS = {
+    '!doctype', 'html', 'head', 'body', 'title', 'meta', 'link', 'base', 'script',
+    'style', 'noscript', 'header', 'footer', 'main', 'nav', 'section', 'article',
+    'aside', 'div', 'p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'ul', 'ol', 'li', 'dl',
+    'dt', 'dd', 'form', 'fieldset', 'legend', 'table', 'thead', 'tbody', 'tfoot',
+    'tr', 'th', 'td', 'figure', 'figcaption', 'blockquote', 'hr', 'br', 'pre',
+    'address', 'details', 'summary', 'dialog',
+}
+
+# HTML whitespace; unlike \s it leaves non-breaking spaces (U+00A0) alone
+HTML_SPACE = re.compile(r'[ \t\n\r\f]+')
+HTML_SPACE_CHARS = ' \t\n\r\f'
+
+def html_tag_name(tag):
+    """Lowercase element name of a tag such as '<div class="x">' or '</div>'"""
+    match = re.match(r'</?(!?[a-zA-Z][\w-]*)', tag)
+    return match.group(1).lower() if match else ''
+
+def minify_html_tag(tag):
+    """Collapse whitespace between attributes, leaving quoted values untouched"""
+    tag = re.sub(r'''("[^"]*"|'[^']*')|[ \t\n\r\f]+''', lambda m: m.group(1) or ' ', tag)
+    return re.sub(r'[ \t\n\r\f]+(/?>)$', r'\1', tag)
+
+def minify_html(html_content):
+    """Minify HTML content
+
+    Comments are removed (except IE conditional comments) and whitespace is
+    collapsed, and dropped next to block-level tags. <pre>, <textarea>,
+    <script> and <style> elements and all attribute values are kept as-is.
+    """
+    # Split into ('tag', name, text), ('text', None, text) and verbatim blocks
+    tokens = []
+    position = 0
+    for match in PRESERVED_HTML.finditer(html_content):
+        for part in HTML_TAG.split(html_content[position:match.start()]):
+            if HTML_TAG.fullmatch(part):
+                tokens.append(('tag', html_tag_name(part), minify_html_tag(part)))
+            elif part:
+                tokens.append(('text', None, part))
+        block = match.group(0)
+        if not block.startswith('<!--'):
+            tokens.append(('tag', match.group(1).lower(), block))
+        elif block.startswith('<!--[if'):
+            tokens.append(('tag', '!doctype', block))
+        position = match.end()
+    for part in HTML_TAG.split(html_content[position:]):
+        if HTML_TAG.fullmatch(part):
+            tokens.append(('tag', html_tag_name(part), minify_html_tag(part)))
+        elif part:
+            tokens.append(('text', None, part))
+
+    output = []
+    for i, (kind, name, text) in enumerate(tokens):
+        if kind == 'text':
+            text = HTML_SPACE.sub(' ', text)
+            previous = tokens[i - 1] if i > 0 else None
+            following = tokens[i + 1] if i + 1 < len(tokens) else None
+            if previous is None or previous[1] in BLOCK_TAGS:
+                text = text.lstrip(' ')
+            if following is None or following[1] in BLOCK_TAGS:
+                text = text.rstrip(' ')
+        output.append(text)
+
+    return ''.join(output).strip(HTML_SPACE_CHARS)
+
+def map_source_name(input_path):
+    """Name a source map gives an input: the stylesheet the purged copy was made from
+
+    styles.purged.css is an intermediate file that is never deployed; the
+    purged text itself is embedded in the map as sourcesContent.
+    """
+    if os.path.basename(input_path) == css_purge.OUTPUT_FILE:
+        return css_purge.STYLESHEET
+    return os.path.basename(input_path)
+
+def source_map_text(generated, output_path, source_name, source, mappings):
+    """JSON text of the source map for a file minified from a single source"""
+    built = source_map.build(generated, os.path.basename(output_path), [(source_name, source)],
+                             [(output, 0, start, name) for output, start, name in mappings])
+    return json.dumps(built, separators=(',', ':'))
+
+def write_source_map(output_path, map_text):
+    """Write output_path.map, or remove a stale one if there is no map"""
+    map_path = output_path + '.map'
+    if map_text is None:
+        if os.path.exists(map_path):
+            os.remove(map_path)
+        return
+    with open(map_path, 'w', encoding='utf-8') as f:
+        f.write(map_text)
+
+def minify_file(input_path, output_path, file_type, source_maps=False):
+    """Minify a file, with a source map for CSS and JS if `source_maps` is set
+
+    Returns the cache entry for the file: its original size, minified
+    text, map, savings per transformation and any warnings printed. Runs
+    in worker processes, so it writes nothing and prints nothing itself.
+    """
     with open(input_path, 'r', encoding='utf-8') as f:
         content = f.read()
-    
-    if file_type == 'css':
-        minified = minify_css(content)
-    elif file_type == 'js':
-        minified = minify_js(content)
-    else:
-        minified = content
-    
+
+    transformations = {}
+    mappings = [] if source_maps and file_type in ('css', 'js') else None
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        if file_type == 'css':
+            minified = minify_css(content, transformations, mappings)
+        elif file_type == 'js':
+            minified = minify_js(content, mappings)
+        elif file_type == 'html':
+            minified = minify_html(content)
+        else:
+            minified = content
+
+    map_text = None
+    if mappings:
+        map_text = source_map_text(minified, output_path, map_source_name(input_path), content, mappings)
+    return {'original': len(content), 'minified': minified, 'map': map_text,
+            'transformations': transformations, 'log': log.getvalue()}
+
+def measured_minify_file(input_path, output_path, file_type, source_maps=False):
+    """minify_file() and its build_report metrics"""
+    started = build_report.start()
+    entry = minify_file(input_path, output_path, file_type, source_maps)
+    return entry, build_report.finish(started, os.path.getsize(input_path), output_size(entry))
+
+def output_size(entry):
+    """Bytes of minified output in a cache entry"""
+    return len(entry['minified'].encode('utf-8'))
+
+def write_output(output_path, file_type, entry):
+    """Write a minified file (and its source map) from its cache entry"""
     with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(minified)
-    
-    original_size = len(content)
-    minified_size = len(minified)
-    savings = ((original_size - minified_size) / original_size) * 100
-    
+        f.write(entry['minified'])
+    if file_type in ('css', 'js'):
+        write_source_map(output_path, entry['map'])
+
+def report_file(input_path, entry, cached=False):
+    """Print the sizes and savings of a minified file"""
+    print(f"Unchanged {input_path} (cached)" if cached else f"Processing {input_path}...")
+    print(entry['log'], end='')
+
+    original_size = entry['original']
+    minified_size = len(entry['minified'])
+    savings = ((original_size - minified_size) / original_size) * 100 if original_size else 0
+
     print(f"  Original: {original_size:,} bytes")
     print(f"  Minified: {minified_size:,} bytes")
     print(f"  Savings: {savings:.1f}%")
-    
-    return original_size, minified_size
+    for transformation, saved in entry['transformations'].items():
+        if saved:
+            print(f"    {transformation}: {saved:,} bytes")
+
+def process_file(input_path, output_path, file_type, source_maps=False):
+    """Process and minify a file"""
+    entry = minify_file(input_path, output_path, file_type, source_maps)
+    write_output(output_path, file_type, entry)
+    report_file(input_path, entry)
+    return entry['original'], len(entry['minified'])
+
+def discover_inputs():
+    """(input file, output file, type) for every file to minify, found by INPUT_GLOBS"""
+    files = []
+    for pattern, file_type in INPUT_GLOBS:
+        for path in sorted(Path('.').glob(pattern)):
+            if path.name in EXCLUDED_INPUTS:
+                continue
+            if file_type == 'html':
+                output = f'dist/{path.name}'
+            else:
+                output = f'dist/{path.stem}.min{path.suffix}'
+            files.append((path.name, output, file_type))
+    return files
+
+def minifier_hash():
+    """Hash of the code that minification depends on, so changing it invalidates the cache"""
+    digest = hashlib.sha256()
+    for module in (sys.modules[__name__], css_minify, js_minify, source_map):
+        with open(module.__file__, 'rb') as f:
+            digest.update(f.read())
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+def load_minify_cache(cache_path=MINIFY_CACHE):
+    """Cache entries from the previous run, or an empty cache if it is missing or outdated"""
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if cache.get('version') != MINIFY_CACHE_VERSION:
+        return {}
+    return cache.get('files', {})
+
+def minify_files(files, jobs=1, source_maps=False, cache_path=MINIFY_CACHE):
+    """Minify files into dist/, reusing cached results for unchanged inputs
+
+    `files` holds (source file, output file, type). Changed files are
+    minified across `jobs` worker processes; every output is written again,
+    since later steps rewrite dist/ in place. Returns the total original
+    and minified sizes.
+    """
+    previous = load_minify_cache(cache_path)
+    code_hash = minifier_hash()
+    cache = {}
+    stale = []
+    for source_file, output_file, file_type in files:
+        digest = hashlib.sha256()
+        with open(source_file, 'rb') as f:
+            digest.update(f.read())
+        digest.update(f'\0{code_hash}\0{source_file}\0{file_type}\0{source_maps}'.encode('utf-8'))
+        entry = previous.get(output_file)
+        if entry and entry['hash'] == digest.hexdigest():
+            cache[output_file] = entry
+        else:
+            stale.append((source_file, output_file, file_type, digest.hexdigest()))
+
+    tasks = [(source_file, output_file, file_type, source_maps)
+             for source_file, output_file, file_type, _digest in stale]
+    parallel = jobs > 1 and len(tasks) > 1
+    with ProcessPoolExecutor(max_workers=jobs) if parallel else contextlib.nullcontext() as executor:
+        if executor:
+            results = executor.map(measured_minify_file, *zip(*tasks))
+        else:
+            results = (measured_minify_file(*task) for task in tasks)
+        for (source_file, output_file, _type, digest), (entry, metrics) in zip(stale, results):
+            cache[output_file] = dict(entry, hash=digest)
+            build_report.record_file('minify', source_file, metrics)
+
+    minified_outputs = {output_file for _source, output_file, _type, _digest in stale}
+    total_original = 0
+    total_minified = 0
+    for source_file, output_file, file_type in files:
+        entry = cache[output_file]
+        write_output(output_file, file_type, entry)
+        report_file(source_file, entry, cached=output_file not in minified_outputs)
+        if output_file not in minified_outputs:
+            build_report.record_file('minify', source_file, build_report.cached(
+                os.path.getsize(source_file), output_size(entry)))
+        total_original += entry['original']
+        total_minified += len(entry['minified'])
+        print()
+    print(f"Minified {len(stale)} of {len(files)} files ({len(files) - len(stale)} unchanged)")
+
+    with open(cache_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': MINIFY_CACHE_VERSION, 'files': cache}, f, sort_keys=True)
+    return total_original, total_minified
+
+def rewrite_references(text, manifest, shifts=None):
+    """Replace quoted references such as "styles.css" or 'icons.svg#menu' with hashed names
+
+    If `shifts` is a list, (offset, change in length) is appended for each
+    replacement, for source_map.shift_columns().
+    """
+    if not manifest:
+        return text
+    pattern = re.compile(r'''(?<=["'])(%s)(?=[#?"'])''' % '|'.join(map(re.escape, manifest)))
+
+    def replace(match):
+        hashed = manifest[match.group(1)]
+        if shifts is not None:
+            shifts.append((match.start(), len(hashed) - len(match.group(1))))
+        return hashed
+
+    return pattern.sub(replace, text)
+
+def fingerprint_assets(assets, dist_dir='dist', map_comments=False):
+    """Copy built assets to content-hashed names and write the asset manifest
+
+    `assets` is a list of (logical name, built file) pairs. References to
+    earlier entries are rewritten before an asset is hashed, so listing the
+    icon sprite before the scripts that use it keeps every hash honest.
+    Older fingerprinted copies are left in place for pages still cached.
+    A built file's source map is copied along, adjusted for the rewritten
+    references, and with `map_comments` the copy links to it.
+    """
+    manifest = {}
+    for logical, built in assets:
+        with open(built, 'r', encoding='utf-8') as f:
+            original = f.read()
+        shifts = []
+        content = rewrite_references(original, manifest, shifts)
+        stem, extension = os.path.splitext(logical)
+        has_map = os.path.exists(built + '.map')
+        comment = SOURCE_MAP_COMMENTS.get(extension) if map_comments and has_map else None
+        # The comment names the hashed file, so only its presence is hashed
+        digest = hashlib.sha256((content + (comment or '')).encode('utf-8')).hexdigest()[:HASH_LENGTH]
+        hashed = f"{stem}.{digest}{extension}"
+        path = os.path.join(dist_dir, hashed)
+        if comment:
+            content += comment.format(hashed + '.map')
+        if not os.path.exists(path):
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(content)
+        if has_map:
+            with open(built + '.map', 'r', encoding='utf-8') as f:
+                built_map = json.load(f)
+            copied = dict(source_map.shift_columns(built_map, original, shifts), file=hashed)
+            with open(path + '.map', 'w', encoding='utf-8') as f:
+                json.dump(copied, f, separators=(',', ':'))
+        manifest[logical] = hashed
+        print(f"  {logical} -> {hashed}")
+
+    with open(ASSET_MANIFEST, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+        f.write('\n')
+    return manifest
+
+def rewrite_pages(manifest, dist_dir='dist'):
+    """Point every page in dist/ at the fingerprinted assets"""
+    for page in sorted(Path(dist_dir).glob('*.html')):
+        with open(page, 'r', encoding='utf-8') as f:
+            content = f.read()
+        rewritten = rewrite_references(content, manifest)
+        if rewritten != content:
+            with open(page, 'w', encoding='utf-8') as f:
+                f.write(rewritten)
+
+def boot_module(source):
+    """A module with its DOMContentLoaded check replaced by a push onto the boot queue"""
+    # Semicolons are optional in the check, so they are left out of the match
+    tokens = [t for t in js_minify.tokenize(source) if t.value != ';']
+    texts = ["'" + t.value[1:-1] + "'" if t.type == 'string' else t.value for t in tokens]
+    out = []
+    position = 0
+    i = 0
+    while i + len(READY_CHECK) <= len(tokens):
+        window = texts[i:i + len(READY_CHECK)]
+        names = {text for text, expected in zip(window, READY_CHECK) if expected is None}
+        if (len(names) == 1 and all(text == expected for text, expected in zip(window, READY_CHECK)
+                                    if expected is not None)
+                and all(tokens[i + k].type == 'name' for k, expected in enumerate(READY_CHECK)
+                        if expected is None)):
+            end = tokens[i + len(READY_CHECK) - 1]
+            out.append(source[position:tokens[i].start])
+            out.append(f'{BOOT_QUEUE}.push({names.pop()});')
+            position = end.start + len(end.value)
+            i += len(READY_CHECK)
+        else:
+            i += 1
+    out.append(source[position:])
+    return ''.join(out)
+
+def bundle_source(modules):
+    """Concatenate module sources around a single boot sequence"""
+    parts = [f'var {BOOT_QUEUE} = [];\n']
+    for module in modules:
+        with open(module, 'r', encoding='utf-8') as f:
+            parts.append(f'// {module}\n' + boot_module(f.read()).rstrip() + '\n;\n')
+    parts.append(BOOT_SEQUENCE)
+    return ''.join(parts)
+
+def bundle_page(content, modules, logical):
+    """Page HTML with its first bundled script tag pointing at the bundle and the others removed"""
+    replaced = []
+
+    def replace(match):
+        if match.group(1) not in modules:
+            return match.group(0)
+        replaced.append(match.group(1))
+        return f'<script src="{logical}"></script>' if len(replaced) == 1 else ''
+
+    return PAGE_SCRIPT.sub(replace, content)
+
+def bundle_scripts(scripts, dist_dir='dist', source_maps=False):
+    """Replace the local script tags of each page in dist/ with one bundle per script list
+
+    `scripts` are the source names of the scripts that may be bundled.
+    The bundle takes the place of a page's first bundled script; every
+    module runs its init from the boot sequence, so none depends on
+    where its own tag was. Pages that load a single script keep it.
+    With `source_maps`, each bundle's map points into the bundle source.
+    Returns (logical name, built file, source) for each bundle written.
+    """
+    pages = {}
+    for page in sorted(Path(dist_dir).glob('*.html')):
+        with open(page, 'r', encoding='utf-8') as f:
+            content = f.read()
+        modules = tuple(src for src in PAGE_SCRIPT.findall(content) if src in scripts)
+        if len(modules) > 1:
+            pages.setdefault(modules, []).append((page, content))
+
+    bundles = []
+    for modules, members in pages.items():
+        logical = '+'.join(os.path.splitext(module)[0] for module in modules) + '.js'
+        built = os.path.join(dist_dir, logical[:-len('.js')] + '.min.js')
+        source = bundle_source(modules)
+        mappings = [] if source_maps else None
+        minified = minify_js(source, mappings)
+        with open(built, 'w', encoding='utf-8') as f:
+            f.write(minified)
+        write_source_map(built, source_map_text(minified, built, logical, source, mappings)
+                         if mappings else None)
+        bundles.append((logical, built, source))
+        print(f"  {logical}: {', '.join(modules)} "
+              f"({os.path.getsize(built):,} bytes, {len(members)} page(s))")
+
+        for page, content in members:
+            with open(page, 'w', encoding='utf-8') as f:
+                f.write(bundle_page(content, modules, logical))
+    return bundles
+
+def map_timing(file_type, source, repeat=5):
+    """Best-of-`repeat` seconds to minify a source, without and with its source map"""
+    minify = css_minify.minify if file_type == 'css' else js_minify.minify
+
+    def run(with_map):
+        start = time.perf_counter()
+        if with_map:
+            mappings = []
+            source_map_text(minify(source, mappings=mappings), 'out', 'in', source, mappings)
+        else:
+            minify(source)
+        return time.perf_counter() - start
+
+    # Alternate the runs so both see the same machine load
+    plain = with_map = float('inf')
+    for _ in range(repeat):
+        plain = min(plain, run(False))
+        with_map = min(with_map, run(True))
+    return plain, with_map
+
+def verify_source_maps(mapped, manifest, dist_dir='dist'):
+    """Check every source map against its file and time what generating them costs
+
+    `mapped` holds (logical name, built file, file type, source) for each
+    minified CSS/JS file; the map of its fingerprinted copy is checked too.
+    Returns the number of mappings that do not point at the same token.
+    """
+    failures = 0
+    plain_time = map_time = 0.0
+    for logical, built, file_type, source in mapped:
+        for path in (built, os.path.join(dist_dir, manifest[logical])):
+            if not os.path.exists(path + '.map'):
+                continue  # copied unminified
+            with open(path, 'r', encoding='utf-8') as f:
+                generated = f.read()
+            with open(path + '.map', 'r', encoding='utf-8') as f:
+                checked, mismatches = source_map.check(generated, json.load(f))
+            failures += mismatches
+            mark = '✓' if not mismatches else '✗'
+            print(f"  {mark} {path}.map: {checked:,} mappings, {mismatches} mismatch(es)")
+        plain, with_map = map_timing(file_type, source)
+        plain_time += plain
+        map_time += with_map
+    if plain_time:
+        print(f"  Source maps add {(map_time - plain_time) / plain_time * 100:.0f}% to minification "
+              f"time ({plain_time * 1000:.0f} ms -> {map_time * 1000:.0f} ms)")
+    return failures
+
+def compress_file(path):
+    """Write maximum-effort .gz and .br siblings of a file
+
+    A sibling that would not be smaller than the file itself is removed
+    instead, so the server falls back to the original.
+    """
+    started = build_report.start()
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    variants = {'.gz': gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli:
+        variants['.br'] = brotli.compress(data, mode=brotli.MODE_TEXT, quality=11)
+
+    sizes = {}
+    for suffix, compressed in variants.items():
+        if len(compressed) < len(data):
+            with open(path + suffix, 'wb') as f:
+                f.write(compressed)
+            sizes[suffix] = len(compressed)
+        elif os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    return path, len(data), sizes, build_report.finish(started, len(data), sum(sizes.values()))
+
+def precompress(dist_dir='dist', cache_path=COMPRESS_CACHE):
+    """Precompress every text asset in dist/, skipping files whose content is unchanged"""
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = {}
+
+    encodings = ['.gz', '.br'] if brotli else ['.gz']
+    hashes = {}
+    stale = []
+    for path in sorted(Path(dist_dir).rglob('*')):
+        if (path.suffix not in COMPRESSIBLE_EXTENSIONS or path.name.startswith('.')
+                or not path.is_file()):
+            continue
+        with open(path, 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        hashes[str(path)] = digest
+        entry = cache.get(str(path))
+        if entry and entry['hash'] == digest and entry['encodings'] == encodings:
+            siblings = [str(path) + suffix for suffix in encodings]
+            build_report.record_file('precompress', path, build_report.cached(
+                path.stat().st_size, sum(os.path.getsize(sibling) for sibling in siblings
+                                         if os.path.exists(sibling))))
+            continue
+        stale.append(str(path))
+
+    if not brotli:
+        print("⚠ brotli is not installed, writing .gz files only (pip install brotli)")
+    print(f"Precompressing {len(stale)} of {len(hashes)} files "
+          f"({len(hashes) - len(stale)} unchanged)...")
+
+    new_cache = {path: {'hash': digest, 'encodings': encodings} for path, digest in hashes.items()}
+    if not stale and new_cache == cache:
+        return
+
+    parallel = len(stale) >= PARALLEL_COMPRESS_MIN
+    with ProcessPoolExecutor() if parallel else contextlib.nullcontext() as executor:
+        results = executor.map(compress_file, stale) if executor else map(compress_file, stale)
+        for path, size, sizes, metrics in results:
+            build_report.record_file('precompress', path, metrics)
+            report = ', '.join(f"{suffix} {compressed:,} bytes" for suffix, compressed in sizes.items())
+            print(f"  {path}: {size:,} bytes -> {report or 'not compressible'}")
+
+    cache = new_cache
+    with open(cache_path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, indent=2, sort_keys=True)
 
 def main():
     """Main function"""
+    parser = argparse.ArgumentParser(description='Minify, fingerprint and precompress assets into dist/')
+    parser.add_argument('--verify', action='store_true',
+                        help='check with node that minified scripts behave like their sources')
+    parser.add_argument('--source-maps', action='store_true',
+                        help='write a source map next to each minified CSS/JS file')
+    parser.add_argument('--source-map-comments', action='store_true',
+                        help='also add sourceMappingURL comments to the fingerprinted files')
+    parser.add_argument('-j', '--jobs', type=int, default=0,
+                        help='number of worker processes for changed files (default: one per CPU)')
+    parser.add_argument('--report', metavar='FILE',
+                        help='write per-step and per-file timing, memory and byte counts as JSON '
+                             '(see build_report.py)')
+    args = parser.parse_args()
+    source_maps = args.source_maps or args.source_map_comments
+
     print("=" * 60)
     print("Production Minification Script")
     print("=" * 60)
@@ -74,42 +685,85 @@ def main():
     dist_dir = Path('dist')
     dist_dir.mkdir(exist_ok=True)
     
-    total_original = 0
-    total_minified = 0
-    
-    # Files to minify
-    files_to_process = [
-        ('styles.css', 'dist/styles.min.css', 'css'),
-        ('app.js', 'dist/app.min.js', 'js'),
-        ('contact-form.js', 'dist/contact-form.min.js', 'js'),
-        ('analytics.js', 'dist/analytics.min.js', 'js'),
-        ('newsletter.js', 'dist/newsletter.min.js', 'js'),
-        ('theme-toggle.js', 'dist/theme-toggle.min.js', 'js'),
-        ('breadcrumbs.js', 'dist/breadcrumbs.min.js', 'js'),
-    ]
-    
-    for input_file, output_file, file_type in files_to_process:
-        if os.path.exists(input_file):
-            orig, mini = process_file(input_file, output_file, file_type)
-            total_original += orig
-            total_minified += mini
-            print()
-        else:
-            print(f"⚠ File not found: {input_file}")
-            print()
-    
+    # Every stylesheet, script and page, including those written by create-pages.py
+    files_to_process = discover_inputs()
+    sources = [(purged_source(input_file), output_file, file_type)
+               for input_file, output_file, file_type in files_to_process]
+    with build_report.stage('minify'):
+        total_original, total_minified = minify_files(sources, args.jobs or os.cpu_count() or 1,
+                                                      source_maps)
+    print()
+
+    mapped = []
+    for (input_file, output_file, file_type), (source_file, _, _) in zip(files_to_process, sources):
+        if source_maps and file_type in ('css', 'js'):
+            with open(source_file, 'r', encoding='utf-8') as f:
+                mapped.append((input_file, output_file, file_type, f.read()))
+
     print("=" * 60)
     print(f"Total Original Size: {total_original:,} bytes")
     print(f"Total Minified Size: {total_minified:,} bytes")
     print(f"Total Savings: {((total_original - total_minified) / total_original) * 100:.1f}%")
     print("=" * 60)
     print()
+
+    scripts = [input_file for input_file, _output_file, file_type in files_to_process
+               if file_type == 'js']
+    print("Bundling scripts...")
+    with build_report.stage('bundle'):
+        bundles = bundle_scripts(scripts, source_maps=source_maps)
+    if source_maps:
+        mapped += [(logical, built, 'js', source) for logical, built, source in bundles]
+    if not bundles:
+        print("  No page loads more than one local script")
+    print()
+
+    if args.verify:
+        print("Verifying the CSS minifier...")
+        if css_minify.verify():
+            print("\n✗ The CSS minifier changed a stylesheet it must not; dist/ is incomplete")
+            sys.exit(1)
+        print()
+        print("Verifying minified JavaScript...")
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = list(scripts)
+            for logical, _built, source in bundles:
+                paths.append(os.path.join(tmp, logical))
+                with open(paths[-1], 'w', encoding='utf-8') as f:
+                    f.write(source)
+            failures = js_minify.verify(paths)
+        if failures:
+            print("\n✗ Minified JavaScript failed verification; dist/ is incomplete")
+            sys.exit(1)
+        print()
+
+    print("Fingerprinting assets...")
+    assets = [('icons.svg', 'icons.svg')] if os.path.exists('icons.svg') else []
+    assets += [(input_file, output_file) for input_file, output_file, file_type in files_to_process
+               if file_type in ('css', 'js')]
+    assets += [(logical, built) for logical, built, _source in bundles]
+    with build_report.stage('fingerprint'):
+        manifest = fingerprint_assets(assets, map_comments=args.source_map_comments)
+        rewrite_pages(manifest)
+    print()
+
+    if args.verify and source_maps:
+        print("Verifying source maps...")
+        if verify_source_maps(mapped, manifest):
+            print("\n✗ Source maps point at the wrong source positions")
+            sys.exit(1)
+        print()
+
+    with build_report.stage('precompress'):
+        precompress()
+    if args.report:
+        build_report.write_report(args.report)
+    print()
     print("✓ Minification complete!")
     print()
     print("Next steps:")
-    print("1. Update HTML files to use .min.css and .min.js files")
-    print("2. Test the minified files")
-    print("3. Deploy the dist/ directory to production")
+    print("1. Test the pages in dist/, which reference the fingerprinted assets")
+    print("2. Deploy the dist/ directory to production")
 
 if __name__ == '__main__':
     main()
@@ -4,9 +4,56 @@ Image optimization script for Zic0n Engineering website
 Converts images to WebP format and creates responsive versions
 """
 
+import argparse
+import base64
+import hashlib
+import io
+import json
 import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+import build_report
+import image_index
+
+try:
+    from PIL import Image, ImageFilter, ImageOps
+except ImportError:
+    Image = None
+
+SOURCE_DIR = Path('images')
+OUTPUT_DIR = SOURCE_DIR / 'optimized'
+MANIFEST_FILE = OUTPUT_DIR / 'manifest.json'
+SOURCE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp')
+
+# Widths (px) of the responsive variants; an image is never upscaled, and
+# one narrower than the largest width also gets a variant at its own width
+DEFAULT_WIDTHS = (400, 800, 1200, 1600)
+
+# Encoder quality per output format
+DEFAULT_QUALITY = {'webp': 80, 'avif': 60}
+
+# Low-quality placeholder painted behind an image until it loads: a tiny
+# blurred WebP inlined as a data URI (typically 100-300 bytes)
+PLACEHOLDER_WIDTH = 16
+PLACEHOLDER_QUALITY = 40
+
+# Byte budget per variant, by the role an image plays on the generated pages
+BUDGETS = {'hero': 200 * 1024, 'card': 100 * 1024, 'headshot': 80 * 1024, 'thumbnail': 50 * 1024}
+BUDGET_REPORT = OUTPUT_DIR / 'budget-report.json'
+
+# --strict lowers the quality in steps until a variant fits, down to a floor
+QUALITY_STEP = 5
+MIN_QUALITY = {'webp': 40, 'avif': 30}
+
+MARKUP_TAG = re.compile(r'''<(/?)([a-zA-Z][\w-]*)((?:[^>"']|"[^"]*"|'[^']*')*)>''')
+TAG_ATTRIBUTE = re.compile(r'''([\w-]+)="([^"]*)"''')
+GRID_COLUMNS = re.compile(r'(?:\w+:)?grid-cols-(\d+)')
+VOID_ELEMENTS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link',
+                 'meta', 'source', 'track', 'wbr'}
+
 def create_webp_fallback_html():
     """Generate HTML snippet for WebP with fallback"""
     return """
@@ -63,24 +110,341 @@ def generate_image_optimization_guide():
 - **Team photos:** 600x600px (max 80KB)
 - **Thumbnails:** 400x300px (max 50KB)
 
+`python optimize-images.py` checks every variant against the budget for the
+role the pages give its image, writes `images/optimized/budget-report.json`
+and fails when one is over; `--strict` recompresses until they fit. Without
+Pillow no variants are built, so the originals are checked instead.
+
 ## Current Images to Optimize
 
 """
     
     images_dir = Path('images')
     if images_dir.exists():
-        for img in sorted(images_dir.glob('*')):
-            if img.suffix.lower() in ['.jpg', '.jpeg', '.png', '.webp']:
-                size = img.stat().st_size / 1024  # KB
-                guide += f"- {img.name} ({size:.1f} KB)\n"
+        for key, entry in image_index.build_index(images_dir).items():
+            size = entry['size'] / 1024  # KB
+            guide += f"- {Path(key).name} ({entry['width']}x{entry['height']}, {size:.1f} KB)\n"
     
     return guide
 
+def available_formats():
+    """Output formats the installed Pillow can encode, in order of preference"""
+    Image.init()
+    return [fmt for fmt in ('avif', 'webp') if fmt.upper() in Image.SAVE]
+
+def variant_stem(source):
+    """File name stem for the variants of a source image, e.g. 'drill-rig'"""
+    return re.sub(r'[^a-z0-9]+', '-', source.stem.lower()).strip('-')
+
+def variant_widths(width, widths):
+    """Target widths for an image `width` pixels wide, without upscaling"""
+    targets = [w for w in widths if w < width]
+    if width <= max(widths):
+        targets.append(width)
+    return sorted(set(targets)) or [width]
+
+def file_hash(path):
+    """SHA-256 of a file's content"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 16), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def placeholder_data_uri(img):
+    """Tiny blurred WebP of an image as a data: URI"""
+    width, height = img.size
+    size = (PLACEHOLDER_WIDTH, max(1, round(height * PLACEHOLDER_WIDTH / width)))
+    small = img.resize(size, Image.BOX).filter(ImageFilter.GaussianBlur(0.6))
+    buffer = io.BytesIO()
+    small.save(buffer, 'WEBP', quality=PLACEHOLDER_QUALITY, method=6)
+    return 'data:image/webp;base64,' + base64.b64encode(buffer.getvalue()).decode('ascii')
+
+def encode_variant(img, path, fmt, quality):
+    """Write one variant in the given format and quality"""
+    if fmt == 'webp':
+        img.save(path, 'WEBP', quality=quality, method=6)
+    else:
+        img.save(path, 'AVIF', quality=quality, speed=4)
+
+def optimize_image(task):
+    """Encode every width/format variant of one image (runs in a worker process)
+
+    The placeholder is only computed when the task carries none, i.e. when
+    the source content changed since the previous run.
+    """
+    source, stem, targets, quality, placeholder, budget = task
+    with Image.open(source) as img:
+        img = ImageOps.exif_transpose(img)
+        if img.mode not in ('RGB', 'RGBA'):
+            img = img.convert('RGBA' if 'A' in img.getbands() else 'RGB')
+        width, height = img.size
+        if placeholder is None:
+            placeholder = placeholder_data_uri(img)
+
+        variants = {}
+        for fmt, fmt_quality in quality.items():
+            variants[fmt] = []
+            for target in targets:
+                resized = img if target == width else img.resize(
+                    (target, round(height * target / width)), Image.LANCZOS)
+                path = OUTPUT_DIR / f"{stem}-{target}.{fmt}"
+                variant_quality = fmt_quality
+                encode_variant(resized, path, fmt, variant_quality)
+                # Strict mode: recompress until the variant fits its budget
+                while (budget and path.stat().st_size > budget
+                       and variant_quality - QUALITY_STEP >= MIN_QUALITY[fmt]):
+                    variant_quality -= QUALITY_STEP
+                    encode_variant(resized, path, fmt, variant_quality)
+                if budget and path.stat().st_size > budget and variants[fmt]:
+                    # Still too heavy at the quality floor: serve the narrower variants only
+                    path.unlink()
+                    continue
+                variants[fmt].append({
+                    'width': target,
+                    'height': resized.size[1],
+                    'file': path.as_posix(),
+                    'bytes': path.stat().st_size,
+                    'quality': variant_quality,
+                })
+    return {'width': width, 'height': height, 'variants': variants, 'placeholder': placeholder}
+
+def variant_bytes(entry):
+    """Total size of an image's variants"""
+    return sum(variant['bytes'] for variants in entry['variants'].values() for variant in variants)
+
+def measured_optimize_image(task):
+    """optimize_image() and its build_report metrics"""
+    started = build_report.start()
+    result = optimize_image(task)
+    return result, build_report.finish(started, os.path.getsize(task[0]), variant_bytes(result))
+
+def load_manifest(path=MANIFEST_FILE):
+    """Load the variant manifest from the previous run"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def source_manifest():
+    """Manifest-shaped entries for the original images, as pages serve them without variants
+
+    Uses the header-only image index, so budgets can be checked without Pillow.
+    """
+    return {key: {'variants': {'original': [{'width': entry['width'], 'bytes': entry['size'], 'file': key}]}}
+            for key, entry in image_index.build_index(SOURCE_DIR).items()}
+
+def is_current(entry, digest, settings, budget=None):
+    """Whether a manifest entry was built from this content and settings and still exists"""
+    if not entry or entry.get('hash') != digest or entry.get('settings') != settings:
+        return False
+    if entry.get('budget') != budget:
+        return False
+    if 'placeholder' not in entry:
+        return False
+    return all(os.path.exists(variant['file'])
+               for variants in entry['variants'].values() for variant in variants)
+
+def image_role(ancestors):
+    """Role of an image from the class lists of its enclosing elements, outermost first"""
+    classes = {name for names in ancestors for name in names}
+    if classes & {'aspect-square', 'rounded-full'}:
+        return 'headshot'
+    for names in reversed(ancestors):
+        columns = [int(match.group(1)) for match in map(GRID_COLUMNS.fullmatch, names) if match]
+        if columns:
+            if max(columns) >= 4:
+                return 'thumbnail'
+            break
+    return 'card' if 'card' in classes else 'hero'
+
+def classify_images(pages=None):
+    """Map each local image to its most constrained role across the pages that use it"""
+    pages = pages if pages is not None else sorted(Path('.').glob('*.html'))
+    roles = {}
+    for page in pages:
+        html = Path(page).read_text(encoding='utf-8')
+        stack = []
+        for match in MARKUP_TAG.finditer(html):
+            closing, name, attributes = match.group(1), match.group(2).lower(), match.group(3)
+            attrs = dict(TAG_ATTRIBUTE.findall(attributes))
+            if closing:
+                for i in range(len(stack) - 1, -1, -1):
+                    if stack[i][0] == name:
+                        del stack[i:]
+                        break
+            elif name == 'img':
+                src = attrs.get('src', '')
+                if src.startswith(SOURCE_DIR.as_posix() + '/'):
+                    role = image_role([names for _name, names in stack])
+                    if src not in roles or BUDGETS[role] < BUDGETS[roles[src]]:
+                        roles[src] = role
+            elif name not in VOID_ELEMENTS and not attributes.rstrip().endswith('/'):
+                stack.append((name, attrs.get('class', '').split()))
+    return roles
+
+def check_budgets(manifest, roles, report_file=BUDGET_REPORT):
+    """Compare every variant with its image's budget and write a JSON report
+
+    Returns the number of images over budget.
+    """
+    images = []
+    for key, entry in sorted(manifest.items()):
+        role = roles.get(key)
+        if role is None:
+            images.append({'image': key, 'role': None, 'status': 'unused'})
+            continue
+        budget = BUDGETS[role]
+        over = [{'format': fmt, 'width': v['width'], 'bytes': v['bytes'], 'file': v['file']}
+                for fmt, variants in entry.get('variants', {}).items()
+                for v in variants if v['bytes'] > budget]
+        images.append({'image': key, 'role': role, 'budget': budget,
+                       'largest': max((v['bytes'] for variants in entry.get('variants', {}).values()
+                                       for v in variants), default=0),
+                       'status': 'over' if over else 'ok', 'over_budget': over})
+
+    failures = [image for image in images if image['status'] == 'over']
+    report = {'budgets': BUDGETS, 'images': images, 'failures': len(failures)}
+    report_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(report_file, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+        f.write('\n')
+
+    print("\nImage budgets")
+    print("=" * 50)
+    for image in images:
+        name = Path(image['image']).name
+        if image['status'] == 'unused':
+            print(f"  - {name}: not used by any page")
+        elif image['status'] == 'ok':
+            print(f"  ✓ {name}: {image['role']}, largest variant {image['largest'] / 1024:.1f} KB "
+                  f"of {image['budget'] // 1024} KB")
+        else:
+            worst = ', '.join(f"{v['format']} {v['width']}w {v['bytes'] / 1024:.1f} KB"
+                              for v in image['over_budget'])
+            print(f"  ⚠ {name}: {image['role']} budget {image['budget'] // 1024} KB exceeded by {worst}")
+    print(f"{len(failures)} of {len(images)} images over budget, report: {report_file}")
+    return len(failures)
+
+def optimize_images(widths=DEFAULT_WIDTHS, quality=None, jobs=None, force=False, strict=False):
+    """Build responsive variants for every image in images/, skipping unchanged ones
+
+    With `strict`, variants are recompressed at lower quality until they
+    fit the budget of the role the pages give their image. Returns the
+    manifest.
+    """
+    quality = {fmt: q for fmt, q in (quality or DEFAULT_QUALITY).items() if fmt in available_formats()}
+    settings = {'widths': sorted(widths), 'quality': quality}
+    roles = classify_images() if strict else {}
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+
+    previous = load_manifest()
+    manifest = {}
+    tasks = []
+    stems = set()
+    for source in sorted(SOURCE_DIR.glob('*')):
+        if source.suffix.lower() not in SOURCE_EXTENSIONS or not source.is_file():
+            continue
+        key = source.as_posix()
+        stem = variant_stem(source)
+        if stem in stems:
+            stem += '-' + source.suffix.lower().lstrip('.')
+        stems.add(stem)
+
+        digest = file_hash(source)
+        budget = BUDGETS[roles[key]] if key in roles else None
+        if not force and is_current(previous.get(key), digest, settings, budget):
+            manifest[key] = previous[key]
+            print(f"Unchanged {source.name}")
+            build_report.record_file('images', key, build_report.cached(
+                source.stat().st_size, variant_bytes(manifest[key])))
+            continue
+
+        # Plan the variants from the header-only index before decoding anything
+        dimensions = image_index.image_dimensions(key)
+        if dimensions is None:
+            print(f"⚠ Cannot read the size of {source.name}, skipping")
+            continue
+        manifest[key] = {'hash': digest, 'settings': settings}
+        if budget:
+            manifest[key]['budget'] = budget
+        # The placeholder depends only on the content, so reuse it across setting changes
+        entry = previous.get(key) or {}
+        placeholder = entry.get('placeholder') if entry.get('hash') == digest else None
+        tasks.append((key, stem, variant_widths(dimensions[0], widths), quality, placeholder, budget))
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        results = executor.map(measured_optimize_image, tasks)
+        for (key, *_options), (result, metrics) in zip(tasks, results):
+            manifest[key].update(result)
+            build_report.record_file('images', key, metrics)
+            original = os.path.getsize(key)
+            largest = {fmt: variants[-1]['bytes'] for fmt, variants in result['variants'].items()}
+            sizes = ', '.join(f"{fmt} {size / 1024:.1f} KB" for fmt, size in largest.items())
+            print(f"Optimized {Path(key).name} ({original / 1024:.1f} KB -> {sizes} at "
+                  f"{result['variants'][next(iter(largest))][-1]['width']}px)")
+
+    # Variants of images that were removed or renamed
+    current_files = {variant['file'] for entry in manifest.values()
+                     for variants in entry['variants'].values() for variant in variants}
+    for path in OUTPUT_DIR.glob('*'):
+        if path not in (MANIFEST_FILE, BUDGET_REPORT) and path.as_posix() not in current_files:
+            path.unlink()
+
+    with open(MANIFEST_FILE, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write('\n')
+    print(f"\nProcessed {len(tasks)} of {len(manifest)} images "
+          f"({', '.join(quality) or 'no formats'}), manifest: {MANIFEST_FILE}")
+    return manifest
+
+def parse_quality(values):
+    """Parse FORMAT=QUALITY arguments such as 'webp=75'"""
+    quality = dict(DEFAULT_QUALITY)
+    for value in values or []:
+        fmt, _sep, q = value.partition('=')
+        if fmt not in DEFAULT_QUALITY or not q.isdigit():
+            raise argparse.ArgumentTypeError(f"invalid quality setting: {value}")
+        quality[fmt] = int(q)
+    return quality
+
 def main():
     """Main function"""
+    parser = argparse.ArgumentParser(description='Build responsive WebP/AVIF variants of images/')
+    parser.add_argument('--widths', type=lambda v: [int(w) for w in v.split(',')],
+                        default=list(DEFAULT_WIDTHS),
+                        help='comma-separated variant widths (default: %(default)s)')
+    parser.add_argument('--quality', action='append', metavar='FORMAT=Q',
+                        help='encoder quality, e.g. webp=75 or avif=55 (repeatable)')
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help='number of worker processes (default: one per CPU)')
+    parser.add_argument('--force', action='store_true',
+                        help='rebuild every image even if unchanged')
+    parser.add_argument('--strict', action='store_true',
+                        help='lower the quality of over-budget variants until they fit')
+    parser.add_argument('--report', metavar='FILE',
+                        help='write per-image timing, memory and byte counts as JSON (see build_report.py)')
+    args = parser.parse_args()
+
     print("Image Optimization Script")
     print("=" * 50)
-    
+
+    if Image is None:
+        print("⚠ Pillow is not installed (pip install Pillow); skipping conversion")
+        # Without variants the pages serve the originals, so budget those
+        manifest = load_manifest() or source_manifest()
+    else:
+        if 'avif' not in available_formats():
+            print("⚠ This Pillow build cannot write AVIF; writing WebP only")
+        with build_report.stage('images'):
+            manifest = optimize_images(args.widths, parse_quality(args.quality), args.jobs,
+                                       args.force, args.strict)
+    failures = check_budgets(manifest, classify_images()) if manifest else 0
+    if args.report:
+        build_report.write_report(args.report)
+    print()
+
     # Create optimization guide
     guide = generate_image_optimization_guide()
     
@@ -90,8 +454,15 @@ def main():
     print("✓ Created IMAGE_OPTIMIZATION.md")
     print("\nNext steps:")
     print("1. Review IMAGE_OPTIMIZATION.md")
-    print("2. Use Squoosh.app to convert images to WebP")
-    print("3. Update HTML to use <picture> elements")
+    print("2. Update HTML to use <picture> elements")
+
+    if failures:
+        if Image is None:
+            hint = '; install Pillow to build smaller variants'
+        else:
+            hint = '' if args.strict else '; run with --strict to recompress'
+        print(f"\n⚠ {failures} image(s) over budget{hint}")
+        sys.exit(1)
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Source map (v3) support used by minify.py
+Builds maps from the (generated offset, source offset, name) mappings that
+js_minify and css_minify record, moves mappings when fingerprinting
+rewrites a reference in the generated file, and checks that every mapping
+points back at the same token in the source.
+
+Columns count Python characters, which match the UTF-16 columns browsers
+use for the ASCII and BMP text these files contain.
+
+    python source_map.py dist/app.min.js    # check dist/app.min.js.map
+"""
+
+import bisect
+import json
+import re
+import sys
+
+BASE64 = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/'
+BASE64_VALUES = {char: value for value, char in enumerate(BASE64)}
+
+# Encoded VLQ of each delta seen so far; most mappings reuse a few small ones
+_vlq_cache = {}
+
+# The start of a token, as compared by check()
+TOKEN_START = re.compile(r'[\w$@#.-]+|\S')
+
+def encode_vlq(value):
+    """Base64 VLQ encoding of one signed integer"""
+    value = (-value << 1) | 1 if value < 0 else value << 1
+    out = ''
+    while True:
+        digit = value & 31
+        value >>= 5
+        if value:
+            digit |= 32
+        out += BASE64[digit]
+        if not value:
+            return out
+
+def decode_vlq(text):
+    """The signed integers in a Base64 VLQ string"""
+    values = []
+    value = shift = 0
+    for char in text:
+        digit = BASE64_VALUES[char]
+        value += (digit & 31) << shift
+        if digit & 32:
+            shift += 5
+        else:
+            values.append(-(value >> 1) if value & 1 else value >> 1)
+            value = shift = 0
+    return values
+
+def line_starts(text):
+    """Offset of the first character of every line"""
+    starts = [0]
+    position = text.find('\n')
+    while position >= 0:
+        starts.append(position + 1)
+        position = text.find('\n', position + 1)
+    return starts
+
+def position(starts, offset):
+    """(line, column) of an offset, both zero-based"""
+    line = bisect.bisect_right(starts, offset) - 1
+    return line, offset - starts[line]
+
+def encode_mappings(lines):
+    """The `mappings` string for lists of absolute segments, one list per generated line
+
+    A segment is (column, source, source line, source column[, name]).
+    """
+    cache = _vlq_cache
+
+    def vlq(value):
+        text = cache.get(value)
+        if text is None:
+            text = cache[value] = encode_vlq(value)
+        return text
+
+    encoded = []
+    source = source_line = source_column = name = 0
+    for segments in lines:
+        column = 0
+        parts = []
+        for segment in segments:
+            part = (vlq(segment[0] - column) + vlq(segment[1] - source)
+                    + vlq(segment[2] - source_line) + vlq(segment[3] - source_column))
+            column, source, source_line, source_column = segment[:4]
+            if len(segment) == 5:
+                part += vlq(segment[4] - name)
+                name = segment[4]
+            parts.append(part)
+        encoded.append(','.join(parts))
+    return ';'.join(encoded)
+
+def decode_mappings(mappings):
+    """Absolute segments per generated line, the inverse of encode_mappings()"""
+    lines = []
+    source = source_line = source_column = name = 0
+    for encoded in mappings.split(';'):
+        column = 0
+        segments = []
+        for part in filter(None, encoded.split(',')):
+            values = decode_vlq(part)
+            column += values[0]
+            if len(values) == 1:
+                continue  # a segment without a source
+            source += values[1]
+            source_line += values[2]
+            source_column += values[3]
+            segment = (column, source, source_line, source_column)
+            if len(values) > 4:
+                name += values[4]
+                segment += (name,)
+            segments.append(segment)
+        lines.append(segments)
+    return lines
+
+def build(generated, file, sources, mappings):
+    """A v3 source map as a dict
+
+    `sources` is a list of (name, content) pairs; their content is embedded
+    because dist/ does not contain the sources. `mappings` holds
+    (generated offset, source index, source offset, original name or None)
+    in generated order.
+    """
+    generated_starts = line_starts(generated) + [len(generated) + 1]
+    source_starts = [line_starts(content) for _name, content in sources]
+    names = {}
+    lines = [[] for _start in generated_starts[1:]]
+    line = 0
+    for generated_offset, source, source_offset, name in mappings:
+        while generated_offset >= generated_starts[line + 1]:
+            line += 1
+        starts = source_starts[source]
+        source_line = bisect.bisect_right(starts, source_offset) - 1
+        segment = (generated_offset - generated_starts[line], source, source_line,
+                   source_offset - starts[source_line])
+        if name:
+            segment += (names.setdefault(name, len(names)),)
+        lines[line].append(segment)
+    return {
+        'version': 3,
+        'file': file,
+        'sources': [name for name, _content in sources],
+        'sourcesContent': [content for _name, content in sources],
+        'names': list(names),
+        'mappings': encode_mappings(lines),
+    }
+
+def shift_columns(source_map, generated, shifts):
+    """Move mappings after text in the generated file was replaced
+
+    `shifts` holds (offset in `generated`, change in length) for each
+    replacement, in order; replacements never span lines.
+    """
+    if not shifts:
+        return source_map
+    starts = line_starts(generated)
+    lines = decode_mappings(source_map['mappings'])
+    moves = {}
+    for offset, delta in shifts:
+        line, column = position(starts, offset)
+        moves.setdefault(line, []).append((column, delta))
+    for line, line_moves in moves.items():
+        lines[line] = [(segment[0] + sum(delta for column, delta in line_moves if column < segment[0]),)
+                       + segment[1:] for segment in lines[line]]
+    return dict(source_map, mappings=encode_mappings(lines))
+
+def check(generated, source_map):
+    """(segments checked, mismatches) for a map and the generated file it describes
+
+    Each segment must point from a generated token to the same token in
+    the source, or to the original of a renamed identifier.
+    """
+    generated_lines = generated.split('\n')
+    sources = [content.split('\n') for content in source_map['sourcesContent']]
+    checked = mismatches = 0
+    for line, segments in enumerate(decode_mappings(source_map['mappings'])):
+        for segment in segments:
+            checked += 1
+            text = generated_lines[line][segment[0]:]
+            original = sources[segment[1]][segment[2]][segment[3]:]
+            if len(segment) == 5:
+                expected = source_map['names'][segment[4]]
+                ok = original.startswith(expected) and TOKEN_START.match(text) is not None
+            else:
+                token = TOKEN_START.match(original)
+                ok = token is not None and text.startswith(token.group(0))
+            mismatches += not ok
+    return checked, mismatches
+
+def main():
+    """Main function"""
+    failures = 0
+    for path in sys.argv[1:]:
+        with open(path, 'r', encoding='utf-8') as f:
+            generated = f.read()
+        with open(path + '.map', 'r', encoding='utf-8') as f:
+            source_map = json.load(f)
+        checked, mismatches = check(generated, source_map)
+        failures += mismatches
+        mark = '✓' if not mismatches else '✗'
+        print(f"{mark} {path}.map: {checked:,} mappings, {mismatches} mismatch(es)")
+    sys.exit(1 if failures else 0)
+
+if __name__ == '__main__':
+    main()
@@ -57,12 +57,9 @@
     const button = document.getElementById('themeToggle');
     if (!button) return;
 
-    const icon = button.querySelector('i');
+    const icon = button.querySelector('use');
     if (icon) {
-      icon.setAttribute('data-feather', theme === THEMES.LIGHT ? 'moon' : 'sun');
-      if (typeof feather !== 'undefined') {
-        feather.replace();
-      }
+      icon.setAttribute('href', theme === THEMES.LIGHT ? 'icons.svg#moon' : 'icons.svg#sun');
     }
 
     button.setAttribute('aria-label', `Switch to ${theme === THEMES.LIGHT ? 'dark' : 'light'} mode`);
@@ -74,15 +71,11 @@
     button.id = 'themeToggle';
     button.className = 'fixed bottom-24 right-8 h-12 w-12 rounded-full bg-cyan-400/20 hover:bg-cyan-400/30 grid place-items-center transition z-40 no-print';
     button.setAttribute('aria-label', 'Toggle theme');
-    button.innerHTML = '<i data-feather="sun" class="text-cyan-400"></i>';
+    button.innerHTML = '<svg class="feather feather-sun text-cyan-400" width="24" height="24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"><use href="icons.svg#sun"/></svg>';
     
     button.addEventListener('click', toggleTheme);
     
     document.body.appendChild(button);
-    
-    if (typeof feather !== 'undefined') {
-      feather.replace();
-    }
   }
 
   // Listen for system theme changes